@@ -1,14 +1,70 @@
 """Player endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 
-from ....dependencies.services import get_player_service
-from ....schemas.player import GoalkeeperWallRankingResponse, NationPlayersResponse, TopUpsetPlayersResponse
+from ....dependencies.services import get_player_service, get_similarity_index
+from ....schemas.player import (
+    GoalkeeperWallRankingResponse,
+    LeaderboardResponse,
+    NationPlayersResponse,
+    SimilarPlayersResponse,
+    TopUpsetPlayersResponse,
+)
+from ....services.leaderboard import LeaderboardInputError
 from ....services.player_service import PlayerService
+from ....services.similarity import SimilarityInputError, SimilarPlayerIndex
 
 router = APIRouter()
 
 
+@router.get("/players/top-upsets", response_model=TopUpsetPlayersResponse)
+def top_upset_players(
+    limit: int = Query(20, ge=1, le=200),
+    service: PlayerService = Depends(get_player_service),
+) -> TopUpsetPlayersResponse:
+    return service.top_upset_players(limit=limit)
+
+
+@router.get("/players/leaderboard", response_model=LeaderboardResponse)
+def player_leaderboard(
+    metric: str = Query("overall_rating"),
+    limit: int = Query(20, ge=1, le=200),
+    nation: str | None = Query(None, min_length=2),
+    position_group: str | None = Query(None, description="GK, DEF, MID or FWD"),
+    service: PlayerService = Depends(get_player_service),
+) -> LeaderboardResponse:
+    try:
+        return service.leaderboard(metric, limit=limit, nation=nation, position_group=position_group)
+    except LeaderboardInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/goalkeepers/wall-ranking", response_model=GoalkeeperWallRankingResponse)
+def goalkeeper_wall_ranking(
+    limit: int = Query(20, ge=1, le=200),
+    service: PlayerService = Depends(get_player_service),
+) -> GoalkeeperWallRankingResponse:
+    return service.goalkeeper_wall_ranking(limit=limit)
+
+
+@router.get("/players/{name}/similar", response_model=SimilarPlayersResponse)
+def similar_players(
+    name: str = Path(..., min_length=2),
+    k: int = Query(10, ge=1, le=100),
+    nation: str | None = Query(None, min_length=2),
+    position_group: str | None = Query(None, description="GK, DEF, MID or FWD"),
+    index: SimilarPlayerIndex = Depends(get_similarity_index),
+) -> SimilarPlayersResponse:
+    try:
+        payload = index.similar(name, k=k, nation=nation, position_group=position_group)
+    except SimilarityInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Player '{name}' not found.")
+    return payload
+
+
+# Registered last so the fixed /players/* paths above are matched first.
 @router.get("/players/{nation}", response_model=NationPlayersResponse)
 def players_by_nation(
     nation: str = Path(..., min_length=2),
@@ -18,14 +74,3 @@ def players_by_nation(
     if payload is None:
         raise HTTPException(status_code=404, detail=f"Nation '{nation}' not found.")
     return payload
-
-
-@router.get("/players/top-upsets", response_model=TopUpsetPlayersResponse)
-def top_upset_players(service: PlayerService = Depends(get_player_service)) -> TopUpsetPlayersResponse:
-    return service.top_upset_players()
-
-
-@router.get("/goalkeepers/wall-ranking", response_model=GoalkeeperWallRankingResponse)
-def goalkeeper_wall_ranking(service: PlayerService = Depends(get_player_service)) -> GoalkeeperWallRankingResponse:
-    return service.goalkeeper_wall_ranking()
-
@@ -1,11 +1,22 @@
 """Prediction endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from ....dependencies.services import get_prediction_service
 from ....schemas.predict import (
+    MatchPredictionBatchItem,
+    MatchPredictionBatchRequest,
+    MatchPredictionBatchResponse,
     MatchPredictionRequest,
     MatchPredictionResponse,
+    MatchupMatrixResponse,
+    UpsetBatchItem,
+    UpsetBatchRequest,
+    UpsetBatchResponse,
+    UpsetGridRequest,
+    UpsetGridResponse,
     UpsetRequest,
     UpsetResponse,
 )
@@ -25,6 +36,20 @@ def predict_matchup(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@router.post("/predict-matchup/batch", response_model=MatchPredictionBatchResponse)
+def predict_matchup_batch(
+    payload: MatchPredictionBatchRequest,
+    service: PredictionService = Depends(get_prediction_service),
+) -> MatchPredictionBatchResponse:
+    results = [
+        MatchPredictionBatchItem(index=idx, error=str(item))
+        if isinstance(item, PredictionInputError)
+        else MatchPredictionBatchItem(index=idx, prediction=item)
+        for idx, item in enumerate(service.predict_matchups(payload.matchups))
+    ]
+    return MatchPredictionBatchResponse(results=results)
+
+
 @router.post("/predict", response_model=MatchPredictionResponse)
 def predict_legacy(
     payload: MatchPredictionRequest,
@@ -45,3 +70,51 @@ def predict_upset_score(
         return service.scoreline_upset(payload)
     except PredictionInputError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/upset/grid", response_model=UpsetGridResponse)
+def predict_upset_grid(
+    payload: UpsetGridRequest,
+    service: PredictionService = Depends(get_prediction_service),
+) -> UpsetGridResponse:
+    try:
+        return service.scoreline_upset_grid(payload)
+    except PredictionInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/upset/batch", response_model=UpsetBatchResponse)
+def predict_upset_score_batch(
+    payload: UpsetBatchRequest,
+    service: PredictionService = Depends(get_prediction_service),
+) -> UpsetBatchResponse:
+    results = [
+        UpsetBatchItem(index=idx, error=str(item))
+        if isinstance(item, PredictionInputError)
+        else UpsetBatchItem(index=idx, upset=item)
+        for idx, item in enumerate(service.scoreline_upsets(payload.scorelines))
+    ]
+    return UpsetBatchResponse(results=results)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/matchup-matrix", response_model=MatchupMatrixResponse)
+def matchup_matrix(
+    request: Request,
+    response: Response,
+    venue: Literal["neutral", "home"] = Query("neutral", description="home gives team_a (rows) home advantage"),
+    encoding: Literal["json", "base64"] = Query("json"),
+    service: PredictionService = Depends(get_prediction_service),
+) -> MatchupMatrixResponse | Response:
+    etag = f'"{service.dataset_version}-{venue}-{encoding}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return service.matchup_matrix(neutral_site=venue == "neutral", encoding=encoding)
@@ -0,0 +1,132 @@
+"""Tournament simulation endpoints."""
+
+import threading
+from collections.abc import AsyncIterator
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from ....dependencies.services import get_model_service, get_tournament_simulator
+from ....schemas.tournament import (
+    BracketRequest,
+    BracketResponse,
+    GroupStageOddsRequest,
+    GroupStageOddsResponse,
+    TournamentSimulationProgress,
+    TournamentSimulationRequest,
+    TournamentSimulationResponse,
+)
+from ....services.tournament import TournamentInputError, TournamentSimulator
+
+router = APIRouter()
+
+
+@router.post("/tournament/simulate", response_model=TournamentSimulationResponse)
+async def simulate_tournament(
+    payload: TournamentSimulationRequest,
+    request: Request,
+    simulator: TournamentSimulator = Depends(get_tournament_simulator),
+) -> TournamentSimulationResponse:
+    """Monte Carlo odds for every round.
+
+    Simulated group states are cached per seed, so the cache only helps a client
+    that re-sends a returned ``seed``: adding results then re-simulates just the
+    groups they change. The knockout stage is always re-simulated; runs without
+    a seed never hit the cache.
+    """
+    model_service = get_model_service(request) if payload.knockout_source == "darkscore" else None
+    try:
+        return await run_in_threadpool(
+            simulator.odds,
+            payload.simulations,
+            seed=payload.seed,
+            knockout_source=payload.knockout_source,
+            model_service=model_service,
+            results=payload.results,
+        )
+    except TournamentInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/tournament/simulate/stream", response_class=StreamingResponse)
+async def stream_tournament_simulation(
+    payload: TournamentSimulationRequest,
+    request: Request,
+    simulator: TournamentSimulator = Depends(get_tournament_simulator),
+) -> StreamingResponse:
+    """Server-Sent Events: a ``progress`` event per completed chunk, then ``complete``.
+
+    Each event carries the running odds with 95% intervals. The run stops once
+    the client disconnects. Group states are cached as for ``/tournament/simulate``.
+    """
+    model_service = get_model_service(request) if payload.knockout_source == "darkscore" else None
+    stop = threading.Event()
+    try:
+        progress = await run_in_threadpool(
+            simulator.odds_progress,
+            payload.simulations,
+            seed=payload.seed,
+            knockout_source=payload.knockout_source,
+            model_service=model_service,
+            results=payload.results,
+            stop=stop,
+        )
+    except TournamentInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # Held while a worker thread is inside the generator, so close() never races next().
+    busy = threading.Lock()
+
+    def advance() -> TournamentSimulationProgress | None:
+        with busy:
+            return next(progress, None)
+
+    def close() -> None:
+        with busy:
+            progress.close()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            while (estimate := await run_in_threadpool(advance)) is not None:
+                if await request.is_disconnected():
+                    break
+                event = "complete" if estimate.completed == estimate.simulations else "progress"
+                yield f"event: {event}\ndata: {estimate.model_dump_json()}\n\n"
+        finally:
+            # If the request was cancelled mid-chunk, the stop flag ends the run after that
+            # chunk; close() then waits for it and shuts the worker pool down.
+            stop.set()
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(close)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/tournament/groups", response_model=GroupStageOddsResponse)
+def group_stage_odds(
+    payload: GroupStageOddsRequest,
+    simulator: TournamentSimulator = Depends(get_tournament_simulator),
+) -> GroupStageOddsResponse:
+    try:
+        return simulator.group_odds(payload.results)
+    except TournamentInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/tournament/bracket", response_model=BracketResponse)
+def bracket_odds(
+    payload: BracketRequest,
+    request: Request,
+    simulator: TournamentSimulator = Depends(get_tournament_simulator),
+) -> BracketResponse:
+    model_service = get_model_service(request) if payload.knockout_source == "darkscore" else None
+    try:
+        return simulator.bracket_odds(payload.teams, payload.knockout_source, model_service)
+    except TournamentInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from .endpoints import darkscore, health, players, predict, teams
+from .endpoints import darkscore, health, players, predict, teams, tournament
 
 api_router = APIRouter()
 api_router.include_router(health.router, tags=["health"])
@@ -10,4 +10,5 @@ api_router.include_router(teams.router, tags=["teams"])
 api_router.include_router(predict.router, tags=["predict"])
 api_router.include_router(players.router, tags=["players"])
 api_router.include_router(darkscore.router, tags=["darkscore"])
+api_router.include_router(tournament.router, tags=["tournament"])
 
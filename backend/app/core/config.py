@@ -22,6 +22,10 @@ class Settings:
         "http://localhost:5173,http://127.0.0.1:5173,http://localhost:5174,http://127.0.0.1:5174",
     )
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    # Size of the process pool shared by all tournament simulations; 1 runs them in-process.
+    tournament_workers: int = int(os.getenv("TOURNAMENT_WORKERS", "1"))
+    # Cap on cached (group, chunk) simulation states, about 80 KB each; 0 disables the cache.
+    tournament_cache_entries: int = int(os.getenv("TOURNAMENT_CACHE_ENTRIES", "600"))
 
     @property
     def cors_origins(self) -> list[str]:
@@ -6,6 +6,8 @@ from fastapi import HTTPException, Request
 
 from ..services.player_service import PlayerService
 from ..services.predictor import PredictionService
+from ..services.similarity import SimilarPlayerIndex
+from ..services.tournament import TournamentSimulator
 
 
 def get_prediction_service(request: Request) -> PredictionService:
@@ -16,6 +18,17 @@ def get_player_service(request: Request) -> PlayerService:
     return request.app.state.player_service
 
 
+def get_similarity_index(request: Request) -> SimilarPlayerIndex:
+    return request.app.state.similarity_index
+
+
+def get_tournament_simulator(request: Request) -> TournamentSimulator:
+    simulator = getattr(request.app.state, "tournament_simulator", None)
+    if simulator is None:
+        raise HTTPException(status_code=503, detail="Tournament simulator unavailable — group assignments failed to load.")
+    return simulator
+
+
 def get_model_service(request: Request) -> Any:
     svc = getattr(request.app.state, "model_service", None)
     if svc is None:
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import pandas as pd
 from typing import Literal
+import logging
 import sys, os
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -16,48 +17,39 @@ from .core.config import settings
 from .core.logging import configure_logging
 from .services.data_loader import load_matchup_dataset, load_player_records
 from .services.model_service import load_model_service
+from .services.player_table import load_player_table
 from .services.player_service import PlayerService
 from .services.predictor import PredictionService
+from .services.similarity import SimilarPlayerIndex
+from .services.tournament import load_tournament_simulator
 
-# ── Load player data ─────────────────────────────────────
-players_df = pd.read_csv(
-    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "data/fc26_combined.csv")
-)
-players_df = players_df[players_df["name"].notna() & players_df["overall_rating"].notna()]
+logger = logging.getLogger(__name__)
 
-# Fill nulls with position-group medians so stat columns never return 0 for missing data
-_POS_GROUPS = {
-    "GK":  ["GK"],
-    "DEF": ["CB", "LB", "RB", "LWB", "RWB"],
-    "MID": ["CM", "CDM", "CAM", "LM", "RM"],
-    "FWD": ["ST", "CF", "LW", "RW"],
-}
-_pos_to_group = {pos: grp for grp, positions in _POS_GROUPS.items() for pos in positions}
-_stat_cols = [
-    "acceleration", "sprint_speed", "dribbling", "finishing",
-    "short_passing", "long_passing", "reactions", "heading_accuracy",
-    "ball_control", "agility", "balance", "shot_power", "jumping",
-    "total_goalkeeping", "total_defending", "total_power",
-    "total_mentality", "total_attacking", "total_skill", "total_movement",
-]
-_stat_cols = [c for c in _stat_cols if c in players_df.columns]
-players_df["_pos_group"] = players_df["best_position"].map(_pos_to_group).fillna("MID")
-for _col in _stat_cols:
-    _group_medians = players_df.groupby("_pos_group")[_col].transform("median")
-    players_df[_col] = players_df[_col].fillna(_group_medians).fillna(players_df[_col].median())
-players_df.drop(columns=["_pos_group"], inplace=True)
+# ── Load player data ─────────────────────────────────────
+# Position-group median imputation runs offline (services/player_table.py);
+# this only loads the artifact keyed by fc26_combined.csv, the imputation code and pandas.
+players_df = load_player_table()
 
 # ── Lifespan ─────────────────────────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
+    started = time.perf_counter()
     matchup_dataset = load_matchup_dataset()
     player_records = load_player_records()
     app.state.prediction_service = PredictionService(dataset=matchup_dataset)
+    app.state.tournament_simulator = load_tournament_simulator(
+        app.state.prediction_service,
+        workers=settings.tournament_workers,
+        cache_entries=settings.tournament_cache_entries,
+    )
     app.state.player_service = PlayerService(players=player_records)
+    app.state.similarity_index = SimilarPlayerIndex.from_frame(players_df)
     app.state.model_service = load_model_service()  # None if artifacts missing
+    logger.info("Startup data load finished in %.3fs", time.perf_counter() - started)
     yield
+    if app.state.tournament_simulator is not None:
+        app.state.tournament_simulator.close()
 
 # ── App ───────────────────────────────────────────────────
 app = FastAPI(
@@ -33,6 +33,38 @@ class TopUpsetPlayersResponse(BaseModel):
     players: list[TopUpsetPlayer]
 
 
+class LeaderboardRow(BaseModel):
+    name: str
+    nation: str
+    best_position: str
+    club: str
+    overall_rating: str
+    potential: str
+    value: float
+
+
+class LeaderboardResponse(BaseModel):
+    metric: str
+    nation: str | None = None
+    position_group: str | None = None
+    players: list[LeaderboardRow]
+
+
+class SimilarPlayerRow(BaseModel):
+    name: str
+    nation: str
+    best_position: str
+    overall_rating: float | None = None
+    similarity: float
+
+
+class SimilarPlayersResponse(BaseModel):
+    player: str
+    nation: str
+    best_position: str
+    players: list[SimilarPlayerRow]
+
+
 class GoalkeeperWallRow(BaseModel):
     name: str
     nation: str
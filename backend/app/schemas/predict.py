@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any, Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -25,6 +27,21 @@ class MatchPredictionResponse(BaseModel):
     model_source: str
 
 
+class MatchPredictionBatchRequest(BaseModel):
+    # Items are validated one by one as MatchPredictionRequest, so a bad item only fails itself.
+    matchups: list[Any] = Field(..., min_length=1, max_length=2000, description="MatchPredictionRequest objects.")
+
+
+class MatchPredictionBatchItem(BaseModel):
+    index: int
+    prediction: MatchPredictionResponse | None = None
+    error: str | None = None
+
+
+class MatchPredictionBatchResponse(BaseModel):
+    results: list[MatchPredictionBatchItem]
+
+
 class UpsetRequest(BaseModel):
     team_a: str = Field(..., min_length=2)
     team_b: str = Field(..., min_length=2)
@@ -42,3 +59,50 @@ class UpsetResponse(BaseModel):
     projected_result: str
     explanation: list[str]
 
+
+class UpsetGridRequest(BaseModel):
+    team_a: str = Field(..., min_length=2)
+    team_b: str = Field(..., min_length=2)
+    neutral_site: bool = True
+    max_goals: int = Field(5, ge=0, le=15)
+
+
+class UpsetGridResponse(BaseModel):
+    team_a: str
+    team_b: str
+    neutral_site: bool
+    predicted_winner: str
+    baseline_upset_score: int = Field(..., ge=0, le=100)
+    max_goals: int
+    upset_scores: list[list[int]] = Field(..., description="upset_scores[score_a][score_b]")
+
+
+class UpsetBatchRequest(BaseModel):
+    # Items are validated one by one as UpsetRequest, so a bad item only fails itself.
+    scorelines: list[Any] = Field(..., min_length=1, max_length=2000, description="UpsetRequest objects.")
+
+
+class UpsetBatchItem(BaseModel):
+    index: int
+    upset: UpsetResponse | None = None
+    error: str | None = None
+
+
+class UpsetBatchResponse(BaseModel):
+    results: list[UpsetBatchItem]
+
+
+class MatchupMatrixResponse(BaseModel):
+    """Outcome percentages for every ordered pair, rows are team_a and columns team_b.
+
+    With ``encoding="base64"`` each matrix is the row-major uint8 buffer of shape
+    ``(len(teams), len(teams))``, base64 encoded. The diagonal is always 0.
+    """
+
+    venue: Literal["neutral", "home"]
+    encoding: Literal["json", "base64"]
+    version: str
+    teams: list[str]
+    team_a_win: list[list[int]] | str
+    draw: list[list[int]] | str
+    team_b_win: list[list[int]] | str
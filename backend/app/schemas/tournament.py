@@ -0,0 +1,110 @@
+"""Tournament simulation schemas."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class FixedResult(BaseModel):
+    team_a: str = Field(..., min_length=2)
+    team_b: str = Field(..., min_length=2)
+    score_a: int = Field(..., ge=0)
+    score_b: int = Field(..., ge=0)
+    winner: str | None = Field(None, description="Knockout ties level after extra time: the team that won on penalties.")
+    stage: Literal["group", "knockout"] | None = Field(
+        None,
+        description="Defaults to the group fixture for group-mates, unless that is already fixed or winner is set.",
+    )
+
+
+class TournamentSimulationRequest(BaseModel):
+    simulations: int = Field(100_000, ge=1_000, le=2_000_000)
+    seed: int | None = Field(None, ge=0, description="Reuse a returned seed to reproduce a run exactly.")
+    knockout_source: Literal["prediction", "darkscore"] = "prediction"
+    results: list[FixedResult] = Field(
+        default_factory=list,
+        max_length=104,
+        description="Finished matches. Re-sending the same seed with more results only re-simulates affected groups.",
+    )
+
+
+class GroupStageOddsRequest(BaseModel):
+    results: list[FixedResult] = Field(default_factory=list, max_length=72)
+
+
+class GroupStageOdds(BaseModel):
+    team: str
+    group: str
+    placeholder: bool = False
+    prob_first: float
+    prob_top2: float
+
+
+class GroupStageOddsResponse(BaseModel):
+    fixed_results: int = 0
+    teams: list[GroupStageOdds]
+
+
+class TeamTournamentOdds(BaseModel):
+    team: str
+    group: str
+    placeholder: bool = False
+    prob_first: float
+    prob_top2: float
+    prob_round_of_32: float
+    prob_round_of_16: float
+    prob_quarterfinal: float
+    prob_semifinal: float
+    prob_final: float
+    prob_champion: float
+
+
+class TournamentSimulationResponse(BaseModel):
+    simulations: int
+    seed: int
+    knockout_source: str
+    fixed_results: int = 0
+    teams: list[TeamTournamentOdds]
+
+
+class TeamTournamentEstimate(TeamTournamentOdds):
+    ci95: dict[str, tuple[float, float]] = Field(..., description="95% Wilson interval for each prob_* field.")
+
+
+class TournamentSimulationProgress(BaseModel):
+    completed: int
+    simulations: int
+    seed: int
+    knockout_source: str
+    fixed_results: int = 0
+    teams: list[TeamTournamentEstimate]
+
+
+class BracketRequest(BaseModel):
+    teams: list[str] = Field(
+        ...,
+        min_length=2,
+        max_length=32,
+        description="Entrants in bracket order: slot 0 plays slot 1, their winner plays the winner of slots 2-3, and so on.",
+    )
+    knockout_source: Literal["prediction", "darkscore"] = "prediction"
+
+
+class BracketTeamOdds(BaseModel):
+    team: str
+    slot: int
+    placeholder: bool = False
+    prob_round_of_32: float | None = None
+    prob_round_of_16: float | None = None
+    prob_quarterfinal: float | None = None
+    prob_semifinal: float | None = None
+    prob_final: float
+    prob_champion: float
+
+
+class BracketResponse(BaseModel):
+    knockout_source: str
+    rounds: list[str]
+    teams: list[BracketTeamOdds]
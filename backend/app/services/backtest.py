@@ -0,0 +1,246 @@
+"""Rolling-origin backtest of the DarkScore upset model over World Cup cutoffs.
+
+``train_and_save`` scores one split: everything before 2022 against everything
+after it. The backtest repeats that split at the start of every World Cup from
+``--start-year`` on. Each fold trains on all matches played before the
+tournament's first match and tests on that tournament. The engineered dataset
+is built (or read from the cache) once and shared with every fold. Folds run
+in worker processes, one per core.
+
+As in ``train_and_save``, each fold picks its XGB candidate on the calibration
+slice, never on the test tournament. That keeps the test matches out of model
+selection, so fold metrics can be read as out-of-sample.
+
+    python -m backend.app.services.backtest --start-year 1990 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .model_predictor import (
+        ENGINEERED_CACHE_DIR,
+        GOALS_ALL_PATH,
+        MATCHES_ALL_PATH,
+        OUT_DIR,
+        TUNING_SAMPLES,
+        _feature_columns,
+        _fit_and_evaluate,
+        _save_json,
+        load_engineered_dataset,
+    )
+except ImportError:  # executed directly: python backend/app/services/backtest.py
+    from model_predictor import (
+        ENGINEERED_CACHE_DIR,
+        GOALS_ALL_PATH,
+        MATCHES_ALL_PATH,
+        OUT_DIR,
+        TUNING_SAMPLES,
+        _feature_columns,
+        _fit_and_evaluate,
+        _save_json,
+        load_engineered_dataset,
+    )
+
+REPORT_FILENAME = "backtest_report.json"
+BACKTEST_START_YEAR = 1990
+TARGET_COL = "y_upset_avoid_loss"
+METRIC_SETS = ("raw", "calibrated", "baseline_elo")
+METRIC_NAMES = ("auc", "brier", "logloss")
+
+# Engineered dataset shared with worker processes; set once per process by _init_fold_worker.
+_FOLD_DATA: pd.DataFrame | None = None
+
+
+def _init_fold_worker(data: pd.DataFrame) -> None:
+    global _FOLD_DATA
+    _FOLD_DATA = data
+
+
+def world_cup_folds(engineered: pd.DataFrame, start_year: int = BACKTEST_START_YEAR) -> list[dict[str, Any]]:
+    """One fold per World Cup starting in or after ``start_year``, cut at its first match."""
+    starts = (
+        engineered.groupby(["tournament_id", "tournament_name"], sort=False)["match_dt"]
+        .min()
+        .reset_index()
+        .sort_values(["match_dt", "tournament_id"])
+    )
+    starts = starts[starts["match_dt"].dt.year >= start_year]
+    return [
+        {"tournament_id": str(row.tournament_id), "tournament_name": str(row.tournament_name), "cutoff": row.match_dt}
+        for row in starts.itertuples(index=False)
+    ]
+
+
+def _run_fold(
+    fold: dict[str, Any],
+    feature_cols: list[str],
+    tuning_samples: int,
+    tuning_round_budget: int | None,
+    tuning_time_budget_s: float | None,
+) -> dict[str, Any]:
+    data = _FOLD_DATA
+    assert data is not None, "fold worker started without a dataset"
+    train_df = data[data["match_dt"] < fold["cutoff"]]
+    test_df = data[data["tournament_id"] == fold["tournament_id"]]
+    y_test = pd.to_numeric(test_df[TARGET_COL], errors="coerce").fillna(0).astype(int)
+    row: dict[str, Any] = {
+        "tournament_id": fold["tournament_id"],
+        "tournament_name": fold["tournament_name"],
+        "cutoff": fold["cutoff"].isoformat(),
+        "n_train": int(len(train_df)),
+        "n_test": int(len(test_df)),
+        "test_positives": int(y_test.sum()),
+    }
+    start = time.perf_counter()
+    try:
+        fitted = _fit_and_evaluate(
+            train_df,
+            test_df,
+            feature_cols,
+            TARGET_COL,
+            tuning_samples=tuning_samples,
+            tuning_round_budget=tuning_round_budget,
+            tuning_time_budget_s=tuning_time_budget_s,
+            workers=1,
+        )
+    except ValueError as exc:
+        row["error"] = str(exc)
+        return row
+    row["best_iteration"] = int(getattr(fitted["xgb"], "best_iteration", -1))
+    for name in METRIC_SETS:
+        metrics = fitted[f"metrics_{name}"] or {}
+        for metric in METRIC_NAMES:
+            row[f"{name}_{metric}"] = metrics.get(metric)
+    row["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def _summarize(rows: list[dict[str, Any]]) -> dict[str, dict[str, float | int | None]]:
+    """Mean/std of every fold metric over the folds where it is defined."""
+    summary: dict[str, dict[str, float | int | None]] = {}
+    for name in METRIC_SETS:
+        for metric in METRIC_NAMES:
+            key = f"{name}_{metric}"
+            values = np.array([r[key] for r in rows if r.get(key) is not None], dtype=float)
+            summary[key] = {
+                "mean": float(values.mean()) if len(values) else None,
+                "std": float(values.std(ddof=1)) if len(values) > 1 else None,
+                "n_folds": int(len(values)),
+            }
+    return summary
+
+
+def run_backtest(
+    matches_path: str = MATCHES_ALL_PATH,
+    goals_path: str = GOALS_ALL_PATH,
+    use_goals_features: bool = False,
+    start_year: int = BACKTEST_START_YEAR,
+    workers: int | None = None,
+    tuning_samples: int = TUNING_SAMPLES,
+    tuning_round_budget: int | None = None,
+    tuning_time_budget_s: float | None = None,
+    engineered_cache_dir: str | Path | None = ENGINEERED_CACHE_DIR,
+) -> dict[str, Any]:
+    start = time.perf_counter()
+    engineered = load_engineered_dataset(
+        matches_path=matches_path,
+        goals_path=goals_path,
+        use_goals_features=use_goals_features,
+        cache_dir=engineered_cache_dir,
+    )[0]
+    engineered = engineered.sort_values(["match_dt", "match_id"]).reset_index(drop=True)
+    feature_cols = _feature_columns(use_goals_features=use_goals_features)
+    folds = world_cup_folds(engineered, start_year)
+    if not folds:
+        raise ValueError(f"No World Cup starts on or after {start_year}.")
+
+    workers = max(1, min(len(folds), workers or os.cpu_count() or 1))
+    n = len(folds)
+    args = ([feature_cols] * n, [tuning_samples] * n, [tuning_round_budget] * n, [tuning_time_budget_s] * n)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_fold_worker, initargs=(engineered,)) as pool:
+            rows = list(pool.map(_run_fold, folds, *args))
+    else:
+        _init_fold_worker(engineered)
+        rows = [_run_fold(fold, *fold_args) for fold, *fold_args in zip(folds, *args)]
+
+    return {
+        "target": TARGET_COL,
+        "use_goals_features": bool(use_goals_features),
+        "start_year": int(start_year),
+        "selection": "calibration split (test tournament held out of model selection)",
+        "tuning_samples": int(tuning_samples),
+        "workers": workers,
+        "folds": rows,
+        "summary": _summarize(rows),
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.4f}"
+
+
+def print_backtest(report: dict[str, Any]) -> None:
+    print(
+        f"{'tournament':<30} {'n_train':>7} {'n_test':>6} {'pos':>4} "
+        + " ".join(f"{name[:4] + '_auc':>8} {name[:4] + '_brier':>10}" for name in METRIC_SETS)
+    )
+    for row in report["folds"]:
+        head = f"{row['tournament_name'][:30]:<30} {row['n_train']:>7} {row['n_test']:>6} {row['test_positives']:>4} "
+        if "error" in row:
+            print(head + f"skipped: {row['error']}")
+            continue
+        print(head + " ".join(f"{_fmt(row[f'{name}_auc']):>8} {_fmt(row[f'{name}_brier']):>10}" for name in METRIC_SETS))
+    summary = report["summary"]
+    print(
+        f"{'mean':<30} {'':>7} {'':>6} {'':>4} "
+        + " ".join(f"{_fmt(summary[f'{name}_auc']['mean']):>8} {_fmt(summary[f'{name}_brier']['mean']):>10}" for name in METRIC_SETS)
+    )
+    print(f"{len(report['folds'])} folds on {report['workers']} workers in {report['elapsed_s']}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the upset model over World Cup cutoffs.")
+    parser.add_argument("--matches-path", type=str, default=MATCHES_ALL_PATH)
+    parser.add_argument("--goals-path", type=str, default=GOALS_ALL_PATH)
+    parser.add_argument("--use-goals-features", action="store_true")
+    parser.add_argument("--start-year", type=int, default=BACKTEST_START_YEAR, help="First World Cup year to test on.")
+    parser.add_argument("--workers", type=int, default=None, help="Fold processes (default: one per core).")
+    parser.add_argument("--tuning-samples", type=int, default=TUNING_SAMPLES)
+    parser.add_argument("--tuning-round-budget", type=int, default=None)
+    parser.add_argument("--tuning-time-budget", type=float, default=None)
+    parser.add_argument("--no-engineered-cache", dest="engineered_cache", action="store_false")
+    parser.add_argument("--out-dir", type=Path, default=Path(OUT_DIR))
+    args = parser.parse_args()
+
+    report = run_backtest(
+        matches_path=args.matches_path,
+        goals_path=args.goals_path,
+        use_goals_features=args.use_goals_features,
+        start_year=args.start_year,
+        workers=args.workers,
+        tuning_samples=args.tuning_samples,
+        tuning_round_budget=args.tuning_round_budget,
+        tuning_time_budget_s=args.tuning_time_budget,
+        engineered_cache_dir=ENGINEERED_CACHE_DIR if args.engineered_cache else None,
+    )
+    print_backtest(report)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = args.out_dir / REPORT_FILENAME
+    _save_json(out_path, report)
+    print(out_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""Benchmarks for the training-pipeline hot spots.
+
+Each benchmark times the current implementation against the row-by-row version
+it replaced, on the real matches file and on a synthetic history tiled from it,
+and checks that both give identical output.
+
+    python -m backend.app.services.benchmark_pipeline elo --scale 1 10 100
+    python -m backend.app.services.benchmark_pipeline rolling --scale 1 10 100
+    python -m backend.app.services.benchmark_pipeline goals --scale 1 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .model_predictor import (
+        ELO_BASE,
+        ELO_K,
+        GOAL_PRIOR_CONCEDE_FIRST_RATE,
+        GOAL_PRIOR_LATE_CONCEDE_RATE_75P,
+        GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST,
+        MATCHES_ALL_PATH,
+        _add_optional_goal_features,
+        _build_team_match_table,
+        _find_column,
+        _prior_points_after_concede,
+        _prior_window,
+        _set_goal_feature_priors,
+        apply_slug,
+        compute_global_pre_match_elo,
+        load_matches,
+        update_global_elo,
+    )
+except ImportError:  # executed directly: python backend/app/services/benchmark_pipeline.py
+    from model_predictor import (
+        ELO_BASE,
+        ELO_K,
+        GOAL_PRIOR_CONCEDE_FIRST_RATE,
+        GOAL_PRIOR_LATE_CONCEDE_RATE_75P,
+        GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST,
+        MATCHES_ALL_PATH,
+        _add_optional_goal_features,
+        _build_team_match_table,
+        _find_column,
+        _prior_points_after_concede,
+        _prior_window,
+        _set_goal_feature_priors,
+        apply_slug,
+        compute_global_pre_match_elo,
+        load_matches,
+        update_global_elo,
+    )
+
+
+def synthetic_matches(matches: pd.DataFrame, scale: int) -> pd.DataFrame:
+    """Tile ``matches`` ``scale`` times as parallel histories over the same dates.
+
+    Each copy renames its teams and match ids, so the result has ``scale`` times
+    the rows and teams with the same per-team history length, sorted like
+    ``load_matches`` output.
+    """
+    if scale <= 1:
+        return matches.copy()
+    team_columns = [
+        col
+        for col in ("home_slug", "away_slug", "home_team_name", "away_team_name", "home_team_id", "away_team_id")
+        if col in matches.columns
+    ]
+    copies = []
+    for rep in range(scale):
+        part = matches.copy()
+        part["match_id"] = part["match_id"].astype(str) + f"-{rep}"
+        for col in team_columns:
+            part[col] = part[col].astype(str) + f"_{rep}"
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True).sort_values(["match_dt", "match_id"]).reset_index(drop=True)
+
+
+def synthetic_goals(matches: pd.DataFrame, seed: int = 0, text_minutes: bool = False) -> pd.DataFrame:
+    """One goal row per goal in ``matches`` with a random minute, in the goals-file schema.
+
+    ``text_minutes`` writes minutes the way match reports do (``"34'"``, ``"90+3'"``).
+    """
+    rng = np.random.default_rng(seed)
+    home_goals = matches["home_team_score"].fillna(0).astype(int).to_numpy()
+    away_goals = matches["away_team_score"].fillna(0).astype(int).to_numpy()
+    match_id = np.concatenate([np.repeat(matches["match_id"].to_numpy(), home_goals), np.repeat(matches["match_id"].to_numpy(), away_goals)])
+    team = np.concatenate(
+        [np.repeat(matches["home_team_name"].to_numpy(), home_goals), np.repeat(matches["away_team_name"].to_numpy(), away_goals)]
+    )
+    minute = rng.integers(1, 96, size=len(match_id))
+    if text_minutes:
+        regular = pd.Series(np.minimum(minute, 90)).astype(str)
+        minute = (regular + pd.Series(np.where(minute > 90, "+" + pd.Series(minute - 90).astype(str), "")) + "'").to_numpy()
+    return pd.DataFrame({"match_id": match_id, "team_name": team, "minute": minute})
+
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _legacy_pre_match_elo(matches: pd.DataFrame, base: float = ELO_BASE, k: float = ELO_K) -> tuple[pd.DataFrame, dict[str, float]]:
+    """The iterrows replay ``compute_global_pre_match_elo`` used before it moved to arrays."""
+    ratings: dict[str, float] = {}
+
+    elo_home_pre: list[float] = []
+    elo_away_pre: list[float] = []
+    exp_home_list: list[float] = []
+    exp_away_list: list[float] = []
+
+    for _, row in matches.iterrows():
+        h = row["home_slug"]
+        a = row["away_slug"]
+        rh = ratings.get(h, base)
+        ra = ratings.get(a, base)
+
+        elo_home_pre.append(float(rh))
+        elo_away_pre.append(float(ra))
+
+        exp_home = 1.0 / (1.0 + 10 ** ((ra - rh) / 400.0))
+        exp_away = 1.0 - exp_home
+        exp_home_list.append(float(exp_home))
+        exp_away_list.append(float(exp_away))
+
+        hs = float(row["home_team_score"])
+        as_ = float(row["away_team_score"])
+        if hs > as_:
+            act_home, act_away = 1.0, 0.0
+        elif hs < as_:
+            act_home, act_away = 0.0, 1.0
+        else:
+            act_home, act_away = 0.5, 0.5
+
+        ratings[h] = rh + k * (act_home - exp_home)
+        ratings[a] = ra + k * (act_away - exp_away)
+
+    out = matches.copy()
+    out["elo_home_pre"] = elo_home_pre
+    out["elo_away_pre"] = elo_away_pre
+    out["elo_diff_pre"] = out["elo_home_pre"] - out["elo_away_pre"]
+    out["elo_gap_pre"] = out["elo_diff_pre"].abs()
+    out["elo_home_exp"] = exp_home_list
+    out["elo_away_exp"] = exp_away_list
+
+    return out, {k_: float(v_) for k_, v_ in ratings.items()}
+
+
+def _same_elo_output(left: tuple[pd.DataFrame, dict[str, float]], right: tuple[pd.DataFrame, dict[str, float]]) -> bool:
+    frame_a, state_a = left
+    frame_b, state_b = right
+    if list(state_a.items()) != list(state_b.items()):
+        return False
+    try:
+        pd.testing.assert_frame_equal(frame_a, frame_b, check_exact=True)
+    except AssertionError:
+        return False
+    return True
+
+
+def benchmark_elo(matches: pd.DataFrame, scale: int, repeat: int, new_rows: int) -> dict[str, Any]:
+    data = synthetic_matches(matches, scale)
+    legacy_s, legacy = _best_time(lambda: _legacy_pre_match_elo(data), repeat)
+    current_s, current = _best_time(lambda: compute_global_pre_match_elo(data), repeat)
+
+    # Incremental: replay all but the last ``new_rows`` matches once, then time applying the rest.
+    head, tail = data.iloc[: len(data) - new_rows], data.iloc[len(data) - new_rows :]
+    _, saved_state = compute_global_pre_match_elo(head)
+    update_s, (tail_rows, state) = _best_time(lambda: update_global_elo(saved_state, tail), repeat)
+    incremental_ok = list(state.items()) == list(current[1].items()) and np.array_equal(
+        tail_rows["elo_home_pre"].to_numpy(), current[0]["elo_home_pre"].to_numpy()[len(head):]
+    )
+    return {
+        "rows": len(data),
+        "legacy_s": legacy_s,
+        "current_s": current_s,
+        "speedup": legacy_s / current_s if current_s > 0 else float("inf"),
+        "identical": _same_elo_output(legacy, current),
+        "update_rows": len(tail),
+        "update_s": update_s,
+        "incremental_identical": incremental_ok,
+    }
+
+
+def _legacy_prior_points_after_concede(points: pd.Series, conceded_first: pd.Series) -> np.ndarray:
+    out = np.full(len(points), np.nan, dtype=float)
+    total = 0.0
+    cnt = 0
+    for i, (p, c) in enumerate(zip(points.to_numpy(), conceded_first.to_numpy())):
+        out[i] = (total / cnt) if cnt > 0 else np.nan
+        if float(c) >= 0.5:
+            total += float(p)
+            cnt += 1
+    return out
+
+
+def _legacy_rolling_windows(team_rows: pd.DataFrame) -> pd.DataFrame:
+    """The per-team lambda transforms and loop the form and goal features used before ``_prior_window``."""
+    tm = team_rows
+    out = pd.DataFrame(index=tm.index)
+    out["points_last5"] = tm.groupby("team_slug")["points"].transform(lambda s: s.shift(1).rolling(5, min_periods=1).sum())
+    out["gd_last5"] = tm.groupby("team_slug")["goal_diff"].transform(lambda s: s.shift(1).rolling(5, min_periods=1).sum())
+    out["concede_first_rate"] = tm.groupby("team_slug")["conceded_first"].transform(
+        lambda s: s.shift(1).rolling(10, min_periods=1).mean()
+    )
+    out["late_concede_rate_75p"] = tm.groupby("team_slug")["late_concede_indicator"].transform(
+        lambda s: s.shift(1).rolling(10, min_periods=1).mean()
+    )
+    paf_list: list[pd.Series] = []
+    for _, g_team in tm.groupby("team_slug", sort=False):
+        paf = _legacy_prior_points_after_concede(g_team["points"], g_team["conceded_first"])
+        paf_list.append(pd.Series(paf, index=g_team.index))
+    out["points_after_concede_first"] = pd.concat(paf_list).sort_index()
+    return out
+
+
+def _rolling_windows(team_rows: pd.DataFrame) -> pd.DataFrame:
+    tm = team_rows
+    out = pd.DataFrame(index=tm.index)
+    out["points_last5"] = _prior_window(tm["points"], tm["team_slug"], 5)
+    out["gd_last5"] = _prior_window(tm["goal_diff"], tm["team_slug"], 5)
+    out["concede_first_rate"] = _prior_window(tm["conceded_first"], tm["team_slug"], 10, mean=True)
+    out["late_concede_rate_75p"] = _prior_window(tm["late_concede_indicator"], tm["team_slug"], 10, mean=True)
+    out["points_after_concede_first"] = _prior_points_after_concede(tm["points"], tm["conceded_first"], tm["team_slug"])
+    return out
+
+
+def benchmark_rolling(matches: pd.DataFrame, scale: int, repeat: int) -> dict[str, Any]:
+    data = synthetic_matches(matches, scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        goals_path = Path(tmp) / "goals.csv"
+        synthetic_goals(data).to_csv(goals_path, index=False)
+        team_rows, _ = _add_optional_goal_features(_build_team_match_table(data), data, goals_path, True)
+    # Goal features leave the rows sorted by team, which both versions rely on.
+    legacy_s, legacy = _best_time(lambda: _legacy_rolling_windows(team_rows), repeat)
+    current_s, current = _best_time(lambda: _rolling_windows(team_rows), repeat)
+    try:
+        pd.testing.assert_frame_equal(legacy, current, check_exact=True)
+        identical = True
+    except AssertionError:
+        identical = False
+    return {
+        "rows": len(team_rows),
+        "teams": int(team_rows["team_slug"].nunique()),
+        "legacy_s": legacy_s,
+        "current_s": current_s,
+        "speedup": legacy_s / current_s if current_s > 0 else float("inf"),
+        "identical": identical,
+    }
+
+
+def _legacy_parse_minute_regulation(x: Any) -> float:
+    if pd.isna(x):
+        return np.nan
+    if isinstance(x, (int, float, np.integer, np.floating)):
+        return float(x)
+    s = str(x).strip()
+    nums = re.findall(r"\d+", s)
+    if not nums:
+        return np.nan
+    if "+" in s and len(nums) >= 2:
+        return float(int(nums[0]) + int(nums[1]))
+    return float(int(nums[0]))
+
+
+def _legacy_goal_features(
+    team_rows: pd.DataFrame,
+    matches: pd.DataFrame,
+    goals_path: str | Path,
+) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """``_add_optional_goal_features`` (goals enabled) before minute parsing and goal attribution moved to arrays."""
+    report: dict[str, Any] = {"enabled": True, "loaded": False, "reason": None}
+
+    path = Path(goals_path)
+    if not path.exists():
+        report["reason"] = f"goals file missing: {path}"
+        return _set_goal_feature_priors(team_rows), report
+
+    try:
+        goals = pd.read_csv(path)
+    except Exception as e:  # noqa: BLE001
+        report["reason"] = f"goals file unreadable: {type(e).__name__}: {e}"
+        return _set_goal_feature_priors(team_rows), report
+
+    match_col = _find_column(goals, ["match_id", "matchid", "game_id", "fixture_id"])
+    team_col = _find_column(goals, ["team_name", "team", "scoring_team", "team_scored", "goal_team", "team_slug"])
+    minute_col = _find_column(goals, ["minute_regulation", "minute", "goal_minute", "time"])
+
+    if match_col is None or team_col is None or minute_col is None:
+        report["reason"] = (
+            "goals schema unsupported; required columns not found for "
+            "match_id/team/minute"
+        )
+        return _set_goal_feature_priors(team_rows), report
+
+    g = goals[[match_col, team_col, minute_col]].copy()
+    g.columns = ["match_id", "scoring_team_raw", "minute_raw"]
+
+    g["match_id"] = g["match_id"].astype(str)
+    g["scoring_slug"] = g["scoring_team_raw"].map(apply_slug)
+    g["minute_regulation"] = g["minute_raw"].map(_legacy_parse_minute_regulation)
+
+    g = g.dropna(subset=["match_id", "scoring_slug", "minute_regulation"]).copy()
+    if g.empty:
+        report["reason"] = "goals parsed but no valid rows"
+        return _set_goal_feature_priors(team_rows), report
+
+    valid_match_ids = set(matches["match_id"].astype(str).tolist())
+    g = g[g["match_id"].isin(valid_match_ids)].copy()
+    if g.empty:
+        report["reason"] = "goals file has no matching match_id values"
+        return _set_goal_feature_priors(team_rows), report
+
+    g = g.reset_index(drop=False).rename(columns={"index": "_row_order"})
+    g = g.sort_values(["match_id", "minute_regulation", "_row_order"]).reset_index(drop=True)
+
+    first_goal = g.groupby("match_id", as_index=False).first()[["match_id", "scoring_slug"]]
+    first_goal.columns = ["match_id", "first_goal_slug"]
+
+    match_side = matches[["match_id", "home_slug", "away_slug"]].copy()
+    g2 = g.merge(match_side, on="match_id", how="left")
+    g2["conceded_slug"] = np.where(
+        g2["scoring_slug"] == g2["home_slug"],
+        g2["away_slug"],
+        np.where(g2["scoring_slug"] == g2["away_slug"], g2["home_slug"], np.nan),
+    )
+
+    late = g2[g2["minute_regulation"] >= 75].copy()
+    late_counts = (
+        late.dropna(subset=["conceded_slug"])
+        .groupby(["match_id", "conceded_slug"], as_index=False)
+        .size()
+        .rename(columns={"conceded_slug": "team_slug", "size": "late_goals_conceded_75p"})
+    )
+
+    out = team_rows.copy()
+    out = out.merge(first_goal, on="match_id", how="left")
+    out["conceded_first"] = (
+        out["first_goal_slug"].notna() & (out["first_goal_slug"] != out["team_slug"])
+    ).astype(float)
+    out = out.merge(late_counts, on=["match_id", "team_slug"], how="left")
+    out["late_goals_conceded_75p"] = out["late_goals_conceded_75p"].fillna(0.0).astype(float)
+    out["late_concede_indicator"] = (out["late_goals_conceded_75p"] > 0).astype(float)
+
+    out = out.sort_values(["team_slug", "match_dt", "match_id"]).reset_index(drop=True)
+    out["concede_first_rate"] = _prior_window(out["conceded_first"], out["team_slug"], 10, mean=True)
+    out["late_concede_rate_75p"] = _prior_window(out["late_concede_indicator"], out["team_slug"], 10, mean=True)
+    out["points_after_concede_first"] = _prior_points_after_concede(out["points"], out["conceded_first"], out["team_slug"])
+
+    out["concede_first_rate"] = out["concede_first_rate"].fillna(GOAL_PRIOR_CONCEDE_FIRST_RATE)
+    out["points_after_concede_first"] = out["points_after_concede_first"].fillna(GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST)
+    out["late_concede_rate_75p"] = out["late_concede_rate_75p"].fillna(GOAL_PRIOR_LATE_CONCEDE_RATE_75P)
+
+    report["loaded"] = True
+    report["reason"] = f"goals features applied from {path}"
+    report["n_goals_rows_used"] = int(len(g))
+    return out, report
+
+
+def benchmark_goals(matches: pd.DataFrame, scale: int, repeat: int) -> dict[str, Any]:
+    data = synthetic_matches(matches, scale)
+    team_rows = _build_team_match_table(data)
+    with tempfile.TemporaryDirectory() as tmp:
+        goals_path = Path(tmp) / "goals.csv"
+        goals = synthetic_goals(data, text_minutes=True)
+        goals.to_csv(goals_path, index=False)
+        # Both versions read the same CSV, so the timings include parsing it.
+        legacy_s, legacy = _best_time(lambda: _legacy_goal_features(team_rows, data, goals_path), repeat)
+        current_s, current = _best_time(lambda: _add_optional_goal_features(team_rows, data, goals_path, True), repeat)
+    try:
+        pd.testing.assert_frame_equal(legacy[0], current[0], check_exact=True)
+        identical = legacy[1] == current[1]
+    except AssertionError:
+        identical = False
+    return {
+        "goals": len(goals),
+        "rows": len(team_rows),
+        "legacy_s": legacy_s,
+        "current_s": current_s,
+        "speedup": legacy_s / current_s if current_s > 0 else float("inf"),
+        "identical": identical,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark training-pipeline stages against their legacy versions.")
+    parser.add_argument("benchmark", choices=["elo", "rolling", "goals"], help="Stage to benchmark.")
+    parser.add_argument("--matches-path", type=Path, default=Path(MATCHES_ALL_PATH))
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100], help="Synthetic history sizes, as multiples of the real file.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing.")
+    parser.add_argument("--new-rows", type=int, default=10, help="Matches applied by the incremental Elo update.")
+    args = parser.parse_args()
+
+    matches = load_matches(args.matches_path)
+    if args.benchmark == "goals":
+        print(f"{'scale':>5} {'goals':>9} {'rows':>8} {'legacy_s':>9} {'current_s':>10} {'speedup':>8} {'identical':>9}")
+        for scale in args.scale:
+            result = benchmark_goals(matches, scale, args.repeat)
+            print(
+                f"{scale:>5} {result['goals']:>9} {result['rows']:>8} {result['legacy_s']:>9.3f} {result['current_s']:>10.4f} "
+                f"{result['speedup']:>7.1f}x {str(result['identical']):>9}"
+            )
+        return
+    if args.benchmark == "rolling":
+        print(f"{'scale':>5} {'rows':>8} {'teams':>6} {'legacy_s':>9} {'current_s':>10} {'speedup':>8} {'identical':>9}")
+        for scale in args.scale:
+            result = benchmark_rolling(matches, scale, args.repeat)
+            print(
+                f"{scale:>5} {result['rows']:>8} {result['teams']:>6} {result['legacy_s']:>9.3f} {result['current_s']:>10.4f} "
+                f"{result['speedup']:>7.1f}x {str(result['identical']):>9}"
+            )
+        return
+
+    print(f"{'scale':>5} {'rows':>8} {'legacy_s':>9} {'current_s':>10} {'speedup':>8} {'identical':>9} {'update_ms':>10} {'incr_ok':>7}")
+    for scale in args.scale:
+        result = benchmark_elo(matches, scale, args.repeat, args.new_rows)
+        print(
+            f"{scale:>5} {result['rows']:>8} {result['legacy_s']:>9.3f} {result['current_s']:>10.4f} "
+            f"{result['speedup']:>7.1f}x {str(result['identical']):>9} {result['update_s'] * 1000:>10.2f} "
+            f"{str(result['incremental_identical']):>7}"
+        )
+
+if __name__ == "__main__":
+    main()
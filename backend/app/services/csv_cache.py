@@ -0,0 +1,201 @@
+"""Content-hashed binary cache for the CSV data sources.
+
+Each CSV is converted once into a directory of ``.npy`` files named after the
+source's SHA-256 digest: numeric columns are packed into one 2-D array per dtype
+and string columns into a single UTF-8 buffer with per-row offsets. Later loads
+skip CSV parsing entirely: numeric columns stay memory-mapped (copy-on-write, so
+in-place edits never reach the file) and only the requested string columns are
+decoded. Editing a source changes its digest, so the next read falls back to the
+CSV, writes a fresh entry and removes the old one.
+
+This module only depends on numpy/pandas so ``model_predictor.py`` can import it
+when executed as a script.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 3
+CSV_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "csv"
+
+
+def file_digest(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _entry_prefix(path: Path, text: bool) -> str:
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", path.stem).strip("_") or "source"
+    return f"{stem}.{'text' if text else 'typed'}"
+
+
+def _numeric_file(dtype_str: str) -> str:
+    return f"numeric.{dtype_str.replace('<', 'le').replace('>', 'be').replace('|', '')}.npy"
+
+
+def _read_source(path: Path, text: bool) -> pd.DataFrame:
+    if text:
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    return pd.read_csv(path)
+
+
+def _write_entry(entry: Path, df: pd.DataFrame, source: Path) -> None:
+    tmp_dir = entry.with_name(entry.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    columns: list[dict[str, object]] = []
+    numeric: dict[str, list[np.ndarray]] = {}
+    chunks: list[bytes] = []
+    offsets: list[np.ndarray] = []
+    missing: list[np.ndarray] = []
+    byte_bounds = [0]
+
+    for name in df.columns:
+        series = df[name]
+        if series.dtype.kind in "biufcmM":
+            values = series.to_numpy()
+            slots = numeric.setdefault(values.dtype.str, [])
+            columns.append({"name": str(name), "kind": "numeric", "dtype": values.dtype.str, "slot": len(slots)})
+            slots.append(values)
+            continue
+
+        is_missing = series.isna().to_numpy()
+        values = ["" if miss else str(value) for value, miss in zip(series.tolist(), is_missing)]
+        col_offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in values], out=col_offsets[1:])
+        encoded = "".join(values).encode("utf-8")
+        columns.append({"name": str(name), "kind": "string", "slot": len(offsets)})
+        chunks.append(encoded)
+        offsets.append(col_offsets)
+        missing.append(is_missing)
+        byte_bounds.append(byte_bounds[-1] + len(encoded))
+
+    for dtype_str, slots in numeric.items():
+        np.save(tmp_dir / _numeric_file(dtype_str), np.stack(slots))
+    if offsets:
+        np.save(tmp_dir / "strings.npy", np.frombuffer(b"".join(chunks), dtype=np.uint8))
+        np.save(tmp_dir / "string_offsets.npy", np.stack(offsets))
+        np.save(tmp_dir / "string_missing.npy", np.stack(missing))
+
+    meta = {
+        "version": CACHE_FORMAT_VERSION,
+        "source": source.name,
+        "source_path": str(source.resolve()),
+        "rows": int(len(df)),
+        "columns": columns,
+        "string_byte_bounds": byte_bounds,
+    }
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    shutil.rmtree(entry, ignore_errors=True)
+    tmp_dir.rename(entry)
+
+
+def _load_entry(entry: Path, columns: Iterable[str] | None) -> pd.DataFrame:
+    meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+    if meta.get("version") != CACHE_FORMAT_VERSION:
+        raise ValueError(f"cache format {meta.get('version')} != {CACHE_FORMAT_VERSION}")
+
+    specs = meta["columns"]
+    if columns is not None:
+        wanted = {name.lower() for name in columns}
+        specs = [spec for spec in specs if spec["name"].lower() in wanted]
+
+    numeric: dict[str, np.ndarray] = {}
+    strings = offsets = missing = None
+    bounds = meta["string_byte_bounds"]
+    data: dict[str, np.ndarray] = {}
+    for spec in specs:
+        if spec["kind"] == "numeric":
+            dtype_str = spec["dtype"]
+            if dtype_str not in numeric:
+                numeric[dtype_str] = np.load(entry / _numeric_file(dtype_str), mmap_mode="c")
+            data[spec["name"]] = numeric[dtype_str][spec["slot"]]
+            continue
+
+        if strings is None:
+            strings = np.load(entry / "strings.npy", mmap_mode="r")
+            offsets = np.load(entry / "string_offsets.npy", mmap_mode="r")
+            missing = np.load(entry / "string_missing.npy", mmap_mode="r")
+        slot = spec["slot"]
+        text = strings[bounds[slot]:bounds[slot + 1]].tobytes().decode("utf-8")
+        col_offsets = offsets[slot].tolist()
+        col_missing = missing[slot].tolist()
+        values = np.empty(len(col_missing), dtype=object)
+        values[:] = [np.nan if miss else text[start:stop] for start, stop, miss in zip(col_offsets, col_offsets[1:], col_missing)]
+        data[spec["name"]] = values
+
+    # copy=False keeps each numeric column a view of its mapped array instead of consolidating them.
+    return pd.DataFrame(data, index=pd.RangeIndex(meta["rows"]), copy=False)
+
+
+def _is_stale(candidate: Path, entry: Path, source_path: str) -> bool:
+    """An older entry for the same source file, or one in an outdated format.
+
+    Sources that share a file name share the entry prefix, so ownership comes
+    from the resolved path recorded in the entry's metadata.
+    """
+    if candidate == entry or not candidate.is_dir() or candidate.name.endswith(".tmp"):
+        return False
+    try:
+        meta = json.loads((candidate / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return meta.get("version") != CACHE_FORMAT_VERSION or meta.get("source_path") == source_path
+
+
+def read_csv_cached(
+    path: str | Path,
+    *,
+    text: bool = False,
+    columns: Iterable[str] | None = None,
+    cache_dir: str | Path = CSV_CACHE_DIR,
+) -> pd.DataFrame:
+    """Read ``path`` like ``pd.read_csv``, served from the binary cache when its hash matches.
+
+    With ``text=True`` every cell is kept as the raw CSV string (empty string for
+    blanks), matching what ``csv.DictReader`` would yield. ``columns`` limits the
+    result to the named columns, matched case-insensitively; unknown names are
+    ignored.
+    """
+    source = Path(path)
+    prefix = _entry_prefix(source, text)
+    cache_root = Path(cache_dir)
+    entry = cache_root / f"{prefix}.{file_digest(source)}"
+
+    if (entry / "meta.json").exists():
+        try:
+            return _load_entry(entry, columns)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Discarding unreadable CSV cache %s: %s", entry.name, exc)
+
+    df = _read_source(source, text)
+    try:
+        cache_root.mkdir(parents=True, exist_ok=True)
+        _write_entry(entry, df, source)
+        source_path = str(source.resolve())
+        for stale in cache_root.glob(f"{prefix}.*"):
+            if _is_stale(stale, entry, source_path):
+                shutil.rmtree(stale, ignore_errors=True)
+        logger.info("Cached CSV source: source=%s entry=%s", source.name, entry.name)
+    except OSError as exc:
+        logger.warning("Could not write CSV cache for %s: %s", source.name, exc)
+    if columns is not None:
+        wanted = {name.lower() for name in columns}
+        df = df[[name for name in df.columns if str(name).lower() in wanted]]
+    return df
@@ -2,61 +2,35 @@
 
 from __future__ import annotations
 
-import csv
 import logging
+import math
 import unicodedata
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
+from .csv_cache import read_csv_cached
+from .team_registry import CODE_TO_TEAM, TEAM_TO_CODE, TeamRegistry, team_registry
+
 logger = logging.getLogger(__name__)
 
-TEAM_TO_CODE = {
-    "Algeria": "ALG",
-    "Argentina": "ARG",
-    "Australia": "AUS",
-    "Austria": "AUT",
-    "Belgium": "BEL",
-    "Brazil": "BRA",
-    "Canada": "CAN",
-    "Cape Verde": "CPV",
-    "Colombia": "COL",
-    "Croatia": "CRO",
-    "Curaçao": "CUW",
-    "Ecuador": "ECU",
-    "Egypt": "EGY",
-    "England": "ENG",
-    "France": "FRA",
-    "Germany": "GER",
-    "Ghana": "GHA",
-    "Haiti": "HAI",
-    "Iran": "IRN",
-    "Ivory Coast": "CIV",
-    "Japan": "JPN",
-    "Jordan": "JOR",
-    "Mexico": "MEX",
-    "Morocco": "MAR",
-    "Netherlands": "NED",
-    "New Zealand": "NZL",
-    "Norway": "NOR",
-    "Panama": "PAN",
-    "Paraguay": "PAR",
-    "Portugal": "POR",
-    "Qatar": "QAT",
-    "Saudi Arabia": "KSA",
-    "Scotland": "SCO",
-    "Senegal": "SEN",
-    "South Africa": "RSA",
-    "South Korea": "KOR",
-    "Spain": "ESP",
-    "Switzerland": "SUI",
-    "Tunisia": "TUN",
-    "United States": "USA",
-    "Uruguay": "URU",
-    "Uzbekistan": "UZB",
+POSITION_GROUPS = {
+    "GK": ["GK"],
+    "DEF": ["CB", "LB", "RB", "LWB", "RWB"],
+    "MID": ["CM", "CDM", "CAM", "LM", "RM"],
+    "FWD": ["ST", "CF", "LW", "RW"],
 }
+POSITION_TO_GROUP = {pos: grp for grp, positions in POSITION_GROUPS.items() for pos in positions}
 
-CODE_TO_TEAM = {value: key for key, value in TEAM_TO_CODE.items()}
+STAT_COLUMNS = [
+    "acceleration", "sprint_speed", "dribbling", "finishing",
+    "short_passing", "long_passing", "reactions", "heading_accuracy",
+    "ball_control", "agility", "balance", "shot_power", "jumping",
+    "total_goalkeeping", "total_defending", "total_power",
+    "total_mentality", "total_attacking", "total_skill", "total_movement",
+]
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 BACKEND_ROOT = REPO_ROOT / "backend"
@@ -66,12 +40,40 @@ SERVICE_DATA_ROOT = Path(__file__).resolve().parent / "Cleaned_Data"
 
 @dataclass(frozen=True)
 class MatchupDataset:
+    """Matchup priors keyed by team name, mirrored as arrays indexed by registry id.
+
+    ``elo`` and ``strength`` have one slot per team (NaN where Elo is missing);
+    ``pair_probabilities[a, b]`` holds the calibrated (P(a wins), P(b wins)) for
+    the pair, filled from the reversed row when only that direction exists.
+    """
+
     teams: list[str]
     probabilities: dict[tuple[str, str], tuple[float, float]]
     team_strength: dict[str, float]
     team_elo: dict[str, float]
     source_file: str
     fallback_source_file: str
+    registry: TeamRegistry = field(default_factory=team_registry, compare=False)
+    elo: np.ndarray = field(init=False, repr=False, compare=False)
+    strength: np.ndarray = field(init=False, repr=False, compare=False)
+    pair_probabilities: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        names = self.registry.names
+        size = len(names)
+        elo = np.array([self.team_elo.get(team, np.nan) for team in names], dtype=float)
+        strength = np.array([self.team_strength.get(team, 70.0) for team in names], dtype=float)
+        pairs = np.full((size, size, 2), np.nan)
+        ids = self.registry.id_of
+        for (team_a, team_b), (prob_a, prob_b) in self.probabilities.items():
+            pairs[ids(team_a), ids(team_b)] = (prob_a, prob_b)
+        for (team_a, team_b), (prob_a, prob_b) in self.probabilities.items():
+            id_a, id_b = ids(team_a), ids(team_b)
+            if np.isnan(pairs[id_b, id_a, 0]):
+                pairs[id_b, id_a] = (prob_b, prob_a)
+        object.__setattr__(self, "elo", elo)
+        object.__setattr__(self, "strength", strength)
+        object.__setattr__(self, "pair_probabilities", pairs)
 
 
 @dataclass(frozen=True)
@@ -83,6 +85,12 @@ class PlayerRecord:
     overall_rating: str
     potential: str
     age: str
+    stats: dict[str, float] = field(default_factory=dict, compare=False)
+
+
+def position_group(position: str) -> str:
+    """Map a best_position code to GK/DEF/MID/FWD, defaulting to MID."""
+    return POSITION_TO_GROUP.get(str(position or "").strip().upper(), "MID")
 
 
 def normalize_text(value: str) -> str:
@@ -126,63 +134,53 @@ def _to_float(raw: str, fallback: float) -> float:
         return fallback
 
 
-def _normalize_team_key(value: str) -> str:
-    text = str(value or "").replace("_", " ").replace("-", " ")
-    return normalize_text(text)
-
-
-def _team_lookup() -> dict[str, str]:
-    team_by_key = {_normalize_team_key(team): team for team in TEAM_TO_CODE}
-    team_by_key.update(
-        {
-            _normalize_team_key("Côte d’Ivoire"): "Ivory Coast",
-            _normalize_team_key("Cote d'Ivoire"): "Ivory Coast",
-            _normalize_team_key("Cote dIvoire"): "Ivory Coast",
-            _normalize_team_key("Ivory_Coast"): "Ivory Coast",
-            _normalize_team_key("Cape_Verde"): "Cape Verde",
-            _normalize_team_key("Curacao"): "Curaçao",
-            _normalize_team_key("Korea Republic"): "South Korea",
-            _normalize_team_key("USA"): "United States",
-        }
-    )
-    return team_by_key
+def to_int(raw: str, fallback: int = 0) -> int:
+    try:
+        return int(float(raw))
+    except (TypeError, ValueError):
+        return fallback
+
+
+def _read_rows(csv_path: Path, columns: list[str]) -> list[dict[str, str]]:
+    """Yield raw string rows like csv.DictReader, restricted to ``columns``."""
+    frame = read_csv_cached(csv_path, text=True, columns=columns)
+    names = list(frame.columns)
+    return [dict(zip(names, values)) for values in zip(*(frame[name].tolist() for name in names))]
 
 
 def _load_teams_elo() -> tuple[dict[str, float], str]:
     csv_path = _resolve_elo_file()
-    team_by_key = _team_lookup()
+    registry = team_registry()
 
     latest_by_team: dict[str, tuple[datetime | None, float]] = {}
-    with csv_path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            team_raw = row.get("team", "")
-            canonical_team = team_by_key.get(_normalize_team_key(team_raw))
-            if not canonical_team:
-                continue
-
-            elo = _to_float(row.get("elo"), fallback=-1)
-            if elo <= 0:
-                continue
-
-            date_raw = str(row.get("date", "")).strip()
-            parsed_date = None
-            if date_raw:
-                try:
-                    parsed_date = datetime.fromisoformat(date_raw)
-                except ValueError:
-                    parsed_date = None
-
-            previous = latest_by_team.get(canonical_team)
-            if previous is None:
-                latest_by_team[canonical_team] = (parsed_date, elo)
-                continue
-
-            prev_date, _ = previous
-            if parsed_date is None:
-                continue
-            if prev_date is None or parsed_date >= prev_date:
-                latest_by_team[canonical_team] = (parsed_date, elo)
+    for row in _read_rows(csv_path, ["team", "elo", "date"]):
+        team_raw = row.get("team", "")
+        canonical_team = registry.resolve(team_raw)
+        if not canonical_team:
+            continue
+
+        elo = _to_float(row.get("elo"), fallback=-1)
+        if elo <= 0:
+            continue
+
+        date_raw = str(row.get("date", "")).strip()
+        parsed_date = None
+        if date_raw:
+            try:
+                parsed_date = datetime.fromisoformat(date_raw)
+            except ValueError:
+                parsed_date = None
+
+        previous = latest_by_team.get(canonical_team)
+        if previous is None:
+            latest_by_team[canonical_team] = (parsed_date, elo)
+            continue
+
+        prev_date, _ = previous
+        if parsed_date is None:
+            continue
+        if prev_date is None or parsed_date >= prev_date:
+            latest_by_team[canonical_team] = (parsed_date, elo)
 
     team_elo = {team: value for team, (_, value) in latest_by_team.items()}
     logger.info("Loaded external Elo table: teams=%s source=%s", len(team_elo), csv_path.name)
@@ -192,19 +190,16 @@ def _load_teams_elo() -> tuple[dict[str, float], str]:
 def _load_team_strength_from_fc26() -> dict[str, float]:
     csv_path = _resolve_data_file("fc26_combined.csv")
     by_team: dict[str, list[float]] = {team: [] for team in TEAM_TO_CODE}
-    team_by_key = _team_lookup()
-
-    with csv_path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            nation_key = _normalize_team_key(row.get("nation", ""))
-            matched_team = team_by_key.get(nation_key)
-            if not matched_team:
-                continue
-            overall = _to_float(row.get("overall_rating"), fallback=-1)
-            if overall < 0:
-                continue
-            by_team[matched_team].append(overall)
+    registry = team_registry()
+
+    for row in _read_rows(csv_path, ["nation", "overall_rating"]):
+        matched_team = registry.resolve(row.get("nation", ""))
+        if not matched_team:
+            continue
+        overall = _to_float(row.get("overall_rating"), fallback=-1)
+        if overall < 0:
+            continue
+        by_team[matched_team].append(overall)
 
     strength: dict[str, float] = {}
     fallback_pool = []
@@ -230,29 +225,28 @@ def load_matchup_dataset() -> MatchupDataset:
     team_strength = _load_team_strength_from_fc26()
     team_elo, elo_source = _load_teams_elo()
 
-    with csv_path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            code_a = str(row.get("team_A", "")).strip().upper()
-            code_b = str(row.get("team_B", "")).strip().upper()
-            team_a = CODE_TO_TEAM.get(code_a)
-            team_b = CODE_TO_TEAM.get(code_b)
-            if not team_a or not team_b:
-                continue
-
-            prob_a = _to_float(row.get("P_team_A_wins"), 0.5)
-            prob_b = _to_float(row.get("P_team_B_wins"), 0.5)
-            total = prob_a + prob_b
-            if total <= 0:
-                prob_a, prob_b = 0.5, 0.5
-            else:
-                prob_a, prob_b = prob_a / total, prob_b / total
-
-            probabilities[(team_a, team_b)] = (prob_a, prob_b)
+    for row in _read_rows(csv_path, ["team_A", "team_B", "P_team_A_wins", "P_team_B_wins"]):
+        code_a = str(row.get("team_A", "")).strip().upper()
+        code_b = str(row.get("team_B", "")).strip().upper()
+        team_a = CODE_TO_TEAM.get(code_a)
+        team_b = CODE_TO_TEAM.get(code_b)
+        if not team_a or not team_b:
+            continue
+
+        prob_a = _to_float(row.get("P_team_A_wins"), 0.5)
+        prob_b = _to_float(row.get("P_team_B_wins"), 0.5)
+        total = prob_a + prob_b
+        if total <= 0:
+            prob_a, prob_b = 0.5, 0.5
+        else:
+            prob_a, prob_b = prob_a / total, prob_b / total
+
+        probabilities[(team_a, team_b)] = (prob_a, prob_b)
     if not probabilities:
         raise RuntimeError(f"No matchup probabilities loaded from {csv_path}")
 
-    sorted_teams = sorted(TEAM_TO_CODE.keys())
+    registry = team_registry()
+    sorted_teams = list(registry.names)
     logger.info(
         "Loaded matchup matrix: supported_teams=%s matrix_pairs=%s source=%s",
         len(sorted_teams),
@@ -266,34 +260,34 @@ def load_matchup_dataset() -> MatchupDataset:
         team_elo=team_elo,
         source_file=elo_source,
         fallback_source_file=csv_path.name,
+        registry=registry,
     )
 
 
 def load_player_records() -> list[PlayerRecord]:
     csv_path = _resolve_data_file("fc26_combined.csv")
     players: list[PlayerRecord] = []
-
-    with csv_path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            nation_raw = str(row.get("nation", "")).strip()
-            normalized_nation = normalize_text(nation_raw)
-            canonical_nation = next(
-                (team for team in TEAM_TO_CODE if normalize_text(team) == normalized_nation),
-                nation_raw.title() if nation_raw else "Unknown",
-            )
-
-            players.append(
-                PlayerRecord(
-                    name=str(row.get("name", "")).strip() or "Data missing",
-                    nation=canonical_nation,
-                    best_position=str(row.get("best_position", "")).strip() or "Data missing",
-                    club=str(row.get("team_contract", "")).strip() or "Data missing",
-                    overall_rating=str(row.get("overall_rating", "")).strip() or "Data missing",
-                    potential=str(row.get("potential", "")).strip() or "Data missing",
-                    age=str(row.get("age", "")).strip() or "Data missing",
-                )
+    registry = team_registry()
+
+    columns = ["nation", "name", "best_position", "team_contract", "overall_rating", "potential", "age"]
+    for row in _read_rows(csv_path, columns + STAT_COLUMNS):
+        nation_raw = str(row.get("nation", "")).strip()
+        canonical_nation = registry.resolve(nation_raw) or (
+            nation_raw.title() if nation_raw else "Unknown"
+        )
+
+        players.append(
+            PlayerRecord(
+                name=str(row.get("name", "")).strip() or "Data missing",
+                nation=canonical_nation,
+                best_position=str(row.get("best_position", "")).strip() or "Data missing",
+                club=str(row.get("team_contract", "")).strip() or "Data missing",
+                overall_rating=str(row.get("overall_rating", "")).strip() or "Data missing",
+                potential=str(row.get("potential", "")).strip() or "Data missing",
+                age=str(row.get("age", "")).strip() or "Data missing",
+                stats={col: _to_float(row.get(col), fallback=math.nan) for col in STAT_COLUMNS},
             )
+        )
 
     logger.info("Loaded player records: count=%s source=%s", len(players), csv_path.name)
     return players
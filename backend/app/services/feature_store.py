@@ -0,0 +1,305 @@
+"""Incrementally updated per-team form state for DarkScore serving.
+
+``build_engineered_dataset`` recomputes every team's form from the full match
+history. The store keeps just what ``last_team_state`` is derived from: ring
+buffers for the last-5 points/goal-difference and last-10 goal-event windows,
+running points-after-conceding-first totals, the last match date and the Elo
+table. Recording a finished match touches two teams and costs O(1); the result
+is written back into ``feature_list.json`` without retraining.
+
+    python -m backend.app.services.feature_store build
+    python -m backend.app.services.feature_store apply new_matches.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .model_predictor import (
+        ELO_BASE,
+        ELO_K,
+        GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST,
+        GOALS_ALL_PATH,
+        MATCHES_ALL_PATH,
+        OUT_DIR,
+        _convert_state_for_json,
+        _parse_match_datetime,
+        _replay_elo,
+        _save_json,
+        _team_state_default,
+        apply_slug,
+        load_engineered_dataset,
+    )
+except ImportError:  # executed directly: python backend/app/services/feature_store.py
+    from model_predictor import (
+        ELO_BASE,
+        ELO_K,
+        GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST,
+        GOALS_ALL_PATH,
+        MATCHES_ALL_PATH,
+        OUT_DIR,
+        _convert_state_for_json,
+        _parse_match_datetime,
+        _replay_elo,
+        _save_json,
+        _team_state_default,
+        apply_slug,
+        load_engineered_dataset,
+    )
+
+logger = logging.getLogger(__name__)
+
+FORM_WINDOW = 5
+GOAL_EVENT_WINDOW = 10
+STORE_FILENAME = "feature_store.json"
+STORE_VERSION = 1
+
+
+@dataclass
+class TeamFormState:
+    points: deque[float] = field(default_factory=lambda: deque(maxlen=FORM_WINDOW))
+    goal_diff: deque[float] = field(default_factory=lambda: deque(maxlen=FORM_WINDOW))
+    conceded_first: deque[float] = field(default_factory=lambda: deque(maxlen=GOAL_EVENT_WINDOW))
+    late_concede: deque[float] = field(default_factory=lambda: deque(maxlen=GOAL_EVENT_WINDOW))
+    points_after_concede_total: float = 0.0
+    conceded_first_count: int = 0
+    last_match_date: str | None = None
+
+    def record(self, points: float, goal_diff: float, conceded_first: float, late_concede: float, match_date: str | None) -> None:
+        self.points.append(points)
+        self.goal_diff.append(goal_diff)
+        self.conceded_first.append(conceded_first)
+        self.late_concede.append(late_concede)
+        if conceded_first >= 0.5:
+            self.points_after_concede_total += points
+            self.conceded_first_count += 1
+        if match_date is not None:
+            self.last_match_date = match_date
+
+    def features(self, elo: float) -> dict[str, float]:
+        """The ``last_team_state`` entry, computed as ``_build_last_team_state`` does."""
+        concede_first_rate = sum(self.conceded_first) / len(self.conceded_first)
+        late_concede_rate = sum(self.late_concede) / len(self.late_concede)
+        return {
+            "points_last5": float(sum(self.points)),
+            "gd_last5": float(sum(self.goal_diff)),
+            "concede_first_rate": float(min(max(concede_first_rate, 0.0), 1.0)),
+            "points_after_concede_first": (
+                self.points_after_concede_total / self.conceded_first_count
+                if self.conceded_first_count > 0
+                else GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST
+            ),
+            "late_concede_rate_75p": float(min(max(late_concede_rate, 0.0), 1.0)),
+            "elo_last": float(elo),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "points": list(self.points),
+            "goal_diff": list(self.goal_diff),
+            "conceded_first": list(self.conceded_first),
+            "late_concede": list(self.late_concede),
+            "points_after_concede_total": self.points_after_concede_total,
+            "conceded_first_count": self.conceded_first_count,
+            "last_match_date": self.last_match_date,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> TeamFormState:
+        state = cls(
+            points_after_concede_total=float(raw.get("points_after_concede_total", 0.0)),
+            conceded_first_count=int(raw.get("conceded_first_count", 0)),
+            last_match_date=raw.get("last_match_date"),
+        )
+        state.points.extend(float(v) for v in raw.get("points", []))
+        state.goal_diff.extend(float(v) for v in raw.get("goal_diff", []))
+        state.conceded_first.extend(float(v) for v in raw.get("conceded_first", []))
+        state.late_concede.extend(float(v) for v in raw.get("late_concede", []))
+        return state
+
+
+@dataclass
+class FeatureStore:
+    teams: dict[str, TeamFormState]
+    elo: dict[str, float]
+    k: float = ELO_K
+    base: float = ELO_BASE
+
+    @classmethod
+    def from_team_rows(cls, team_rows: pd.DataFrame, last_elo_end: dict[str, float]) -> FeatureStore:
+        """Seed the store from ``build_engineered_dataset`` team rows and Elo table."""
+        tm = team_rows.sort_values(["team_slug", "match_dt", "match_id"])
+        conceded = tm[tm["conceded_first"] >= 0.5].groupby("team_slug")["points"].agg(["sum", "count"])
+        last_dates = tm.groupby("team_slug", sort=False)["match_dt"].last()
+        teams: dict[str, TeamFormState] = {}
+        for team_slug, g in tm.groupby("team_slug", sort=False).tail(GOAL_EVENT_WINDOW).groupby("team_slug", sort=False):
+            state = TeamFormState(last_match_date=_date_text(last_dates[team_slug]))
+            state.points.extend(g["points"].astype(float).tolist())
+            state.goal_diff.extend(g["goal_diff"].astype(float).tolist())
+            state.conceded_first.extend(g["conceded_first"].astype(float).tolist())
+            state.late_concede.extend(g["late_concede_indicator"].astype(float).tolist())
+            if team_slug in conceded.index:
+                state.points_after_concede_total = float(conceded.at[team_slug, "sum"])
+                state.conceded_first_count = int(conceded.at[team_slug, "count"])
+            teams[team_slug] = state
+        return cls(teams=teams, elo={slug: float(value) for slug, value in last_elo_end.items()})
+
+    @classmethod
+    def from_history(
+        cls,
+        matches_path: str | Path = MATCHES_ALL_PATH,
+        goals_path: str | Path = GOALS_ALL_PATH,
+        use_goals_features: bool = False,
+    ) -> FeatureStore:
+        _, team_rows, last_elo_end, _, _ = load_engineered_dataset(
+            matches_path=matches_path,
+            goals_path=goals_path,
+            use_goals_features=use_goals_features,
+        )
+        return cls.from_team_rows(team_rows, last_elo_end)
+
+    def record_match(
+        self,
+        home_team: str,
+        away_team: str,
+        home_score: float,
+        away_score: float,
+        match_date: Any = None,
+        first_goal_team: str | None = None,
+        home_late_conceded: int = 0,
+        away_late_conceded: int = 0,
+    ) -> None:
+        """Apply one finished match; matches must be recorded in chronological order.
+
+        Without goal detail (``first_goal_team`` None) neither side counts as
+        having conceded first, which is how the training pipeline fills rows
+        when goal features are disabled.
+        """
+        home, away = apply_slug(home_team), apply_slug(away_team)
+        first_goal = apply_slug(first_goal_team) if first_goal_team else None
+        home_score, away_score = float(home_score), float(away_score)
+        actual_home = 1.0 if home_score > away_score else 0.0 if home_score < away_score else 0.5
+        date_text = _date_text(match_date)
+
+        for team, goals_for, goals_against, late_conceded in (
+            (home, home_score, away_score, home_late_conceded),
+            (away, away_score, home_score, away_late_conceded),
+        ):
+            points = 3.0 if goals_for > goals_against else 1.0 if goals_for == goals_against else 0.0
+            conceded_first = 1.0 if first_goal is not None and first_goal != team else 0.0
+            self.teams.setdefault(team, TeamFormState()).record(
+                points, goals_for - goals_against, conceded_first, 1.0 if late_conceded > 0 else 0.0, date_text
+            )
+
+        ratings = [self.elo.get(home, self.base), self.elo.get(away, self.base)]
+        _replay_elo(np.array([0]), np.array([1]), np.array([actual_home]), ratings, self.k)
+        self.elo[home], self.elo[away] = ratings
+
+    def record_matches(self, matches: pd.DataFrame) -> int:
+        """Record rows with home/away team names and scores (optionally ``match_date``, ``first_goal_team``)."""
+        frame = matches.copy()
+        if "match_date" in frame.columns:
+            frame["_match_dt"] = _parse_match_datetime(frame)
+            frame = frame.sort_values("_match_dt", kind="stable")
+        for row in frame.to_dict("records"):
+            self.record_match(
+                row["home_team_name"],
+                row["away_team_name"],
+                row["home_team_score"],
+                row["away_team_score"],
+                match_date=row.get("_match_dt"),
+                first_goal_team=row.get("first_goal_team") if pd.notna(row.get("first_goal_team")) else None,
+                home_late_conceded=int(row.get("home_late_goals_conceded_75p") or 0),
+                away_late_conceded=int(row.get("away_late_goals_conceded_75p") or 0),
+            )
+        return len(frame)
+
+    def last_team_state(self) -> dict[str, dict[str, float]]:
+        """Per-team state in the ``feature_list.json`` format and key order."""
+        states = {slug: self.teams[slug].features(self.elo.get(slug, self.base)) for slug in sorted(self.teams)}
+        for slug, elo in self.elo.items():
+            if slug not in states:
+                states[slug] = _team_state_default(elo)
+        return states
+
+    def update_feature_info(self, feature_info: dict[str, Any]) -> dict[str, Any]:
+        """Copy of ``feature_info`` with ``last_elo_end`` and ``last_team_state`` refreshed."""
+        updated = dict(feature_info)
+        updated["last_elo_end"] = {slug: float(value) for slug, value in self.elo.items()}
+        updated["last_team_state"] = _convert_state_for_json(self.last_team_state())
+        return updated
+
+    def save(self, path: str | Path) -> Path:
+        out = Path(path)
+        payload = {
+            "version": STORE_VERSION,
+            "k": self.k,
+            "base": self.base,
+            "elo": self.elo,
+            "teams": {slug: state.to_dict() for slug, state in self.teams.items()},
+        }
+        out.write_text(json.dumps(payload), encoding="utf-8")
+        return out
+
+    @classmethod
+    def load(cls, path: str | Path) -> FeatureStore:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        if raw.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported feature store version in {path}: {raw.get('version')}")
+        return cls(
+            teams={slug: TeamFormState.from_dict(state) for slug, state in raw.get("teams", {}).items()},
+            elo={slug: float(value) for slug, value in raw.get("elo", {}).items()},
+            k=float(raw.get("k", ELO_K)),
+            base=float(raw.get("base", ELO_BASE)),
+        )
+
+
+def _date_text(value: Any) -> str | None:
+    if value is None or pd.isna(value):
+        return None
+    return pd.Timestamp(value).isoformat()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or update the incremental DarkScore feature store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Seed the store from the full match history.")
+    build.add_argument("--matches-path", type=Path, default=Path(MATCHES_ALL_PATH))
+    build.add_argument("--goals-path", type=Path, default=Path(GOALS_ALL_PATH))
+    apply = sub.add_parser("apply", help="Record new matches and refresh feature_list.json.")
+    apply.add_argument("new_matches", type=Path, help="CSV with home/away team names, scores and match_date.")
+    for command in (build, apply):
+        command.add_argument("--artifact-dir", type=Path, default=Path(OUT_DIR))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    store_path = args.artifact_dir / STORE_FILENAME
+    feature_list_path = args.artifact_dir / "feature_list.json"
+    feature_info = json.loads(feature_list_path.read_text(encoding="utf-8"))
+    use_goals = bool(feature_info.get("use_goals_features", False))
+
+    if args.command == "build":
+        store = FeatureStore.from_history(args.matches_path, args.goals_path, use_goals)
+        print(store.save(store_path))
+        return
+
+    store = FeatureStore.load(store_path) if store_path.exists() else FeatureStore.from_history(use_goals_features=use_goals)
+    applied = store.record_matches(pd.read_csv(args.new_matches))
+    store.save(store_path)
+    _save_json(feature_list_path, store.update_feature_info(feature_info))
+    logger.info("Recorded matches: count=%s teams=%s source=%s", applied, len(store.teams), args.new_matches.name)
+    print(feature_list_path)
+
+
+if __name__ == "__main__":
+    main()
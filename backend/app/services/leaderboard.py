@@ -0,0 +1,133 @@
+"""Top-K player leaderboards over precomputed metric arrays."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .data_loader import POSITION_GROUPS, STAT_COLUMNS, PlayerRecord, normalize_text, position_group, to_int
+
+DEVELOPMENT_GAP = "development_gap"
+RATING_METRICS = ["overall_rating", "potential", DEVELOPMENT_GAP]
+LEADERBOARD_METRICS = RATING_METRICS + STAT_COLUMNS
+
+
+class LeaderboardInputError(ValueError):
+    """Raised when a leaderboard query names an unknown metric or filter."""
+
+
+@dataclass
+class PlayerLeaderboard:
+    """Ranks players by any supported metric, ties broken by potential then load order.
+
+    Metric columns are built once as float arrays (missing stats are NaN and never
+    ranked). Each query partitions the filtered candidates around the K-th value
+    and only sorts the rows that survive, so the cost per uncached query is
+    O(n + K log K) rather than a full sort.
+    """
+
+    players: list[PlayerRecord]
+    cache_size: int = 512
+    _metrics: dict[str, np.ndarray] = field(init=False, repr=False)
+    _tiebreak: np.ndarray = field(init=False, repr=False)
+    _nation_keys: np.ndarray = field(init=False, repr=False)
+    _groups: np.ndarray = field(init=False, repr=False)
+    _masks: dict[tuple[str | None, str | None], np.ndarray] = field(init=False, repr=False)
+    _cache: OrderedDict[tuple[str, int, str | None, str | None], list[int]] = field(init=False, repr=False)
+    _cache_lock: threading.Lock = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        overall = np.array([to_int(p.overall_rating) for p in self.players], dtype=float)
+        potential = np.array([to_int(p.potential) for p in self.players], dtype=float)
+        self._metrics = {
+            "overall_rating": overall,
+            "potential": potential,
+            DEVELOPMENT_GAP: potential - overall,
+        }
+        for col in STAT_COLUMNS:
+            self._metrics[col] = np.array([p.stats.get(col, np.nan) for p in self.players], dtype=float)
+        self._tiebreak = potential
+        self._nation_keys = np.array([normalize_text(p.nation) for p in self.players], dtype=object)
+        self._groups = np.array([position_group(p.best_position) for p in self.players], dtype=object)
+        self._masks = {}
+        self._cache = OrderedDict()
+        # Sync endpoints query from FastAPI's threadpool; guards the LRU (mutated on every read) and _masks.
+        self._cache_lock = threading.Lock()
+
+    def metric_value(self, metric: str, index: int) -> float:
+        return float(self._metrics[metric][index])
+
+    def top(
+        self,
+        metric: str,
+        limit: int,
+        nation: str | None = None,
+        position_group: str | None = None,
+    ) -> list[PlayerRecord]:
+        """Return up to ``limit`` players ranked by ``metric`` (descending)."""
+        return [self.players[idx] for idx in self.top_indices(metric, limit, nation, position_group)]
+
+    def top_indices(
+        self,
+        metric: str,
+        limit: int,
+        nation: str | None = None,
+        position_group: str | None = None,
+    ) -> list[int]:
+        if metric not in self._metrics:
+            raise LeaderboardInputError(f"Unsupported metric: {metric}")
+        group_key = position_group.strip().upper() if position_group else None
+        if group_key is not None and group_key not in POSITION_GROUPS:
+            raise LeaderboardInputError(f"Unsupported position group: {position_group}")
+        nation_key = normalize_text(nation) if nation else None
+        limit = max(0, int(limit))
+
+        cache_key = (metric, limit, nation_key, group_key)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
+
+        ranked = self._select(self._metrics[metric], limit, self._candidates(nation_key, group_key))
+        with self._cache_lock:
+            self._cache[cache_key] = ranked
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return ranked
+
+    def _candidates(self, nation_key: str | None, group_key: str | None) -> np.ndarray:
+        key = (nation_key, group_key)
+        with self._cache_lock:
+            idx = self._masks.get(key)
+        if idx is None:
+            mask = np.ones(len(self.players), dtype=bool)
+            if nation_key is not None:
+                mask &= self._nation_keys == nation_key
+            if group_key is not None:
+                mask &= self._groups == group_key
+            idx = np.flatnonzero(mask)
+            if idx.size:
+                with self._cache_lock:
+                    self._masks[key] = idx
+        return idx
+
+    def _select(self, values: np.ndarray, limit: int, candidates: np.ndarray) -> list[int]:
+        candidates = candidates[~np.isnan(values[candidates])]
+        if limit == 0 or candidates.size == 0:
+            return []
+
+        primary = values[candidates]
+        if candidates.size > limit:
+            # Keep every row tied with the K-th value so tie-breaks stay exact.
+            kth = np.partition(primary, candidates.size - limit)[candidates.size - limit]
+            keep = primary >= kth
+            candidates = candidates[keep]
+            primary = primary[keep]
+
+        order = np.lexsort((candidates, -self._tiebreak[candidates], -primary))
+        return candidates[order[:limit]].tolist()
@@ -2,21 +2,34 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import math
+import os
 import re
+import time
 import unicodedata
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import joblib
 import numpy as np
 import pandas as pd
+import xgboost
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import brier_score_loss, confusion_matrix, log_loss, roc_auc_score
 from xgboost import XGBClassifier
 
+try:
+    from .csv_cache import file_digest, read_csv_cached
+    from .stage_profiler import StageProfiler, format_profile
+except ImportError:  # executed directly: python backend/app/services/model_predictor.py
+    from csv_cache import file_digest, read_csv_cached
+    from stage_profiler import StageProfiler, format_profile
+
 # =========================
 # CONFIG (defaults)
 # =========================
@@ -30,6 +43,14 @@ TEAMS_ELO_PATH = str(_DATA / "teams_elo.csv")
 
 OUT_DIR = str(_HERE / "artifacts")
 
+# build_engineered_dataset results, keyed by input hashes + feature flags
+ENGINEERED_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "engineered"
+ENGINEERED_CACHE_VERSION = 1
+
+# training_dataset artifact: csv, npz (typed, compressed column bundle) or both
+TRAINING_DATASET_FORMATS = ("csv", "npz", "both")
+TRAINING_NPZ_VERSION = 1
+
 ALERT_THRESHOLD = 0.60
 
 W_PLAYER = 1.2
@@ -51,6 +72,14 @@ ELO_K = 20.0
 # Split config
 VALID_START_DATE = pd.Timestamp("2022-01-01")
 
+# Hyperparameter search (successive halving)
+TUNING_SAMPLES = 120  # random configs tried alongside the hand-picked candidates
+TUNING_ETA = 3  # keep the best 1/eta at each rung
+TUNING_MIN_ROUNDS = 5  # boosting rounds at the first rung; multiplied by eta per rung
+# Rung rounds are scaled by TUNING_REFERENCE_LR / learning_rate (the top of the sampled range),
+# so slow learners are not cut after a handful of trees.
+TUNING_REFERENCE_LR = 0.16
+
 # Optional fixed constants for schema stability
 GOAL_PRIOR_CONCEDE_FIRST_RATE = 0.50
 GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST = 1.0
@@ -79,6 +108,11 @@ ALIAS_MAP: dict[str, str] = {
 }
 
 
+def _profile_stage(profiler: StageProfiler | None, name: str, **info: Any):
+    """``profiler.stage(name)``, or a no-op context yielding a throwaway row."""
+    return profiler.stage(name, **info) if profiler is not None else nullcontext({})
+
+
 def slugify(s: Any) -> str:
     if pd.isna(s):
         return ""
@@ -139,6 +173,25 @@ def _safe_logloss(y_true: np.ndarray, p: np.ndarray) -> float | None:
     return float(log_loss(y_true, p, labels=[0, 1]))
 
 
+def _rank_auc(y_true: np.ndarray, p: np.ndarray) -> float | None:
+    """ROC AUC from average ranks (Mann-Whitney U), skipping sklearn's input validation."""
+    positive = np.asarray(y_true) == 1
+    n_pos = int(positive.sum())
+    n_neg = len(positive) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return None
+    _, inverse, counts = np.unique(p, return_inverse=True, return_counts=True)
+    avg_rank = (np.cumsum(counts) - (counts - 1) / 2.0)[inverse]
+    return float((avg_rank[positive].sum() - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg))
+
+
+def _binary_logloss(y_true: np.ndarray, p: np.ndarray) -> float | None:
+    if len(y_true) == 0:
+        return None
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    return float(-np.mean(np.where(np.asarray(y_true) == 1, np.log(p), np.log1p(-p))))
+
+
 def _metrics_dict(y_true: np.ndarray, p: np.ndarray) -> dict[str, float | None]:
     return {
         "auc": _safe_auc(y_true, p),
@@ -191,7 +244,7 @@ def load_matches(matches_path: str | Path) -> pd.DataFrame:
     path = Path(matches_path)
     if not path.exists():
         raise FileNotFoundError(f"Matches file not found: {path}")
-    df = pd.read_csv(path)
+    df = read_csv_cached(path)
 
     required = [
         "match_id",
@@ -235,50 +288,105 @@ def load_matches(matches_path: str | Path) -> pd.DataFrame:
     return df
 
 
-def compute_global_pre_match_elo(matches: pd.DataFrame, base: float = ELO_BASE, k: float = ELO_K) -> tuple[pd.DataFrame, dict[str, float]]:
-    ratings: dict[str, float] = {}
-
-    elo_home_pre: list[float] = []
-    elo_away_pre: list[float] = []
-    exp_home_list: list[float] = []
-    exp_away_list: list[float] = []
-
-    for _, row in matches.iterrows():
-        h = row["home_slug"]
-        a = row["away_slug"]
-        rh = ratings.get(h, base)
-        ra = ratings.get(a, base)
+def _replay_elo(
+    home_ids: np.ndarray,
+    away_ids: np.ndarray,
+    actual_home: np.ndarray,
+    ratings: list[float],
+    k: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Walk matches in order, updating ``ratings`` (indexed by team id) in place.
+
+    Each expected score depends on ratings moved by earlier matches, so the walk
+    is inherently sequential; it runs over plain ints and floats rather than
+    pandas rows. Returns pre-match home/away ratings and the home expected score.
+    Negative ids (``pd.factorize``'s code for a missing slug) are rejected, since
+    ``ratings[-1]`` would silently read and move the last team's rating.
+    """
+    size = len(home_ids)
+    if size and min(int(home_ids.min()), int(away_ids.min())) < 0:
+        bad = np.flatnonzero((home_ids < 0) | (away_ids < 0))
+        raise ValueError(f"{len(bad)} matches have no home/away team slug (first at position {int(bad[0])}).")
+    pre_home = [0.0] * size
+    pre_away = [0.0] * size
+    exp_home_all = [0.0] * size
+    for i, (h, a, act_home) in enumerate(zip(home_ids.tolist(), away_ids.tolist(), actual_home.tolist())):
+        rh = ratings[h]
+        ra = ratings[a]
+        exp_home = 1.0 / (1.0 + 10 ** ((ra - rh) / 400.0))
+        pre_home[i] = rh
+        pre_away[i] = ra
+        exp_home_all[i] = exp_home
+        ratings[h] = rh + k * (act_home - exp_home)
+        ratings[a] = ra + k * ((1.0 - act_home) - (1.0 - exp_home))
+    return np.array(pre_home), np.array(pre_away), np.array(exp_home_all)
 
-        elo_home_pre.append(float(rh))
-        elo_away_pre.append(float(ra))
 
-        exp_home = 1.0 / (1.0 + 10 ** ((ra - rh) / 400.0))
-        exp_away = 1.0 - exp_home
-        exp_home_list.append(float(exp_home))
-        exp_away_list.append(float(exp_away))
-
-        hs = float(row["home_team_score"])
-        as_ = float(row["away_team_score"])
-        if hs > as_:
-            act_home, act_away = 1.0, 0.0
-        elif hs < as_:
-            act_home, act_away = 0.0, 1.0
-        else:
-            act_home, act_away = 0.5, 0.5
+def _pre_match_elo(
+    matches: pd.DataFrame, initial: dict[str, float], base: float, k: float
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    # Team ids follow the state's order, then first appearance (home before away),
+    # so the returned dict keeps the insertion order of a dict-based replay.
+    slugs = np.column_stack([matches["home_slug"].to_numpy(dtype=object), matches["away_slug"].to_numpy(dtype=object)])
+    codes, teams = pd.factorize(np.concatenate([np.array(list(initial), dtype=object), slugs.ravel()]))
+    ids = codes[len(initial):].reshape(-1, 2)
+    ratings = [float(initial.get(team, base)) for team in teams]
 
-        ratings[h] = rh + k * (act_home - exp_home)
-        ratings[a] = ra + k * (act_away - exp_away)
+    home_score = matches["home_team_score"].to_numpy(dtype=float)
+    away_score = matches["away_team_score"].to_numpy(dtype=float)
+    actual_home = np.where(home_score > away_score, 1.0, np.where(home_score < away_score, 0.0, 0.5))
+    pre_home, pre_away, exp_home = _replay_elo(ids[:, 0], ids[:, 1], actual_home, ratings, k)
 
     out = matches.copy()
-    out["elo_home_pre"] = elo_home_pre
-    out["elo_away_pre"] = elo_away_pre
+    out["elo_home_pre"] = pre_home
+    out["elo_away_pre"] = pre_away
     out["elo_diff_pre"] = out["elo_home_pre"] - out["elo_away_pre"]
     out["elo_gap_pre"] = out["elo_diff_pre"].abs()
-    out["elo_home_exp"] = exp_home_list
-    out["elo_away_exp"] = exp_away_list
+    out["elo_home_exp"] = exp_home
+    out["elo_away_exp"] = 1.0 - exp_home
 
-    last_elo_end = {k_: float(v_) for k_, v_ in ratings.items()}
-    return out, last_elo_end
+    return out, dict(zip(teams.tolist(), ratings))
+
+
+def compute_global_pre_match_elo(matches: pd.DataFrame, base: float = ELO_BASE, k: float = ELO_K) -> tuple[pd.DataFrame, dict[str, float]]:
+    return _pre_match_elo(matches, {}, base, k)
+
+
+def update_global_elo(
+    last_elo_end: dict[str, float],
+    new_matches: pd.DataFrame,
+    base: float = ELO_BASE,
+    k: float = ELO_K,
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    """Apply matches played after a saved ``last_elo_end`` state.
+
+    ``new_matches`` needs home/away slugs and scores, in chronological order.
+    Only these rows are replayed; teams without a rating start at ``base``.
+    Returns the rows with pre-match Elo columns and the updated state, equal to
+    what a full replay of the extended history would give.
+    """
+    return _pre_match_elo(new_matches, last_elo_end, base, k)
+
+
+def _prior_window(values: pd.Series, teams: pd.Series, window: int, mean: bool = False) -> np.ndarray:
+    """Sum (or mean) of each team's previous ``window`` values, excluding the current row.
+
+    Equivalent to ``groupby(teams).transform(lambda s: s.shift(1).rolling(window,
+    min_periods=1).sum())`` for rows already sorted by team, computed as a
+    difference of running sums instead of one Python call per team. Rows with
+    no earlier match are NaN. Values are whole numbers or 0/1 flags, so the
+    running sums are exact.
+    """
+    x = values.to_numpy(dtype=float)
+    idx = np.arange(len(x))
+    team = teams.to_numpy()
+    first_row = np.concatenate([[True], team[1:] != team[:-1]])[: len(x)]
+    group_start = np.maximum.accumulate(np.where(first_row, idx, 0))
+    running = np.concatenate([[0.0], np.cumsum(x)])
+    prior = np.minimum(idx - group_start, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = np.where(prior > 0, running[idx] - running[idx - prior], np.nan)
+        return total / prior if mean else total
 
 
 def _build_team_match_table(matches: pd.DataFrame) -> pd.DataFrame:
@@ -329,8 +437,8 @@ def _build_team_match_table(matches: pd.DataFrame) -> pd.DataFrame:
     tm["goal_diff"] = tm["goals_for"] - tm["goals_against"]
 
     tm = tm.sort_values(["team_slug", "match_dt", "match_id"]).reset_index(drop=True)
-    tm["points_last5"] = tm.groupby("team_slug")["points"].transform(lambda s: s.shift(1).rolling(5, min_periods=1).sum())
-    tm["gd_last5"] = tm.groupby("team_slug")["goal_diff"].transform(lambda s: s.shift(1).rolling(5, min_periods=1).sum())
+    tm["points_last5"] = _prior_window(tm["points"], tm["team_slug"], 5)
+    tm["gd_last5"] = _prior_window(tm["goal_diff"], tm["team_slug"], 5)
     tm["rest_days"] = tm.groupby("team_slug")["match_dt"].diff().dt.days.astype(float).fillna(-1.0)
     return tm
 
@@ -346,30 +454,70 @@ def _set_goal_feature_priors(team_rows: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def _parse_minute_regulation(x: Any) -> float:
-    if pd.isna(x):
-        return np.nan
-    if isinstance(x, (int, float, np.integer, np.floating)):
-        return float(x)
-    s = str(x).strip()
-    nums = re.findall(r"\d+", s)
-    if not nums:
-        return np.nan
-    if "+" in s and len(nums) >= 2:
-        return float(int(nums[0]) + int(nums[1]))
-    return float(int(nums[0]))
-
-
-def _prior_points_after_concede(points: pd.Series, conceded_first: pd.Series) -> np.ndarray:
-    out = np.full(len(points), np.nan, dtype=float)
-    total = 0.0
-    cnt = 0
-    for i, (p, c) in enumerate(zip(points.to_numpy(), conceded_first.to_numpy())):
-        out[i] = (total / cnt) if cnt > 0 else np.nan
-        if float(c) >= 0.5:
-            total += float(p)
-            cnt += 1
-    return out
+def _parse_minute_regulation(minutes: pd.Series) -> np.ndarray:
+    """Goal minutes as floats: numbers as-is, text as its first integer plus the
+    second when it contains "+" (``"45+2"`` -> 47.0), NaN when there is no digit.
+
+    Text is parsed once per distinct value, so millions of goals cost one factorize.
+    """
+    if pd.api.types.is_numeric_dtype(minutes):
+        return minutes.to_numpy(dtype=float, na_value=np.nan)
+    codes, uniques = pd.factorize(minutes)
+    values = pd.Series(uniques, dtype=object)
+    try:
+        text = values.str.strip()
+    except AttributeError:  # no text values at all
+        text = pd.Series(np.nan, index=values.index, dtype=object)
+    parts = text.str.extract(r"(\d+)(?:\D+(\d+))?").astype(float)
+    added = text.str.contains("+", regex=False, na=False) & parts[1].notna()
+    parsed = parts[0].where(~added, parts[0] + parts[1])
+    is_text = text.notna()
+    parsed[~is_text] = pd.to_numeric(values[~is_text], errors="coerce")
+    out = np.append(parsed.to_numpy(dtype=float), np.nan)
+    return out[codes]
+
+
+def _slug_values(names: pd.Series) -> np.ndarray:
+    """``apply_slug`` per row, computed once per distinct name."""
+    codes, uniques = pd.factorize(names)
+    slugs = np.array([apply_slug(name) for name in uniques] + [apply_slug(np.nan)], dtype=object)
+    return slugs[codes]
+
+
+def _prior_points_after_concede(points: pd.Series, conceded_first: pd.Series, teams: pd.Series) -> np.ndarray:
+    """Mean points in each team's earlier matches where it conceded first (NaN if none).
+
+    Rows must be sorted by team; running totals restart at each team's first row.
+    """
+    conceded = conceded_first.to_numpy(dtype=float) >= 0.5
+    scored = np.where(conceded, points.to_numpy(dtype=float), 0.0)
+    total = _prior_window(pd.Series(scored), teams, len(scored))
+    count = _prior_window(pd.Series(conceded.astype(float)), teams, len(scored))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _sort_team_rows(team_rows: pd.DataFrame) -> pd.DataFrame:
+    """Rows ordered by team, kickoff and match id, with a fresh index.
+
+    ``_build_team_match_table`` already returns that order, so an adjacent-row
+    check usually replaces the multi-key string sort.
+    """
+    team = team_rows["team_slug"].to_numpy()
+    kickoff = team_rows["match_dt"].to_numpy()
+    match_id = team_rows["match_id"].to_numpy()
+    try:
+        same_team = team[:-1] == team[1:]
+        same_kickoff = same_team & (kickoff[:-1] == kickoff[1:])
+        # Match ids only break ties between a team's rows at the same kickoff.
+        ties = np.flatnonzero(same_kickoff)
+        in_order = (team[:-1] < team[1:]) | (same_team & (kickoff[:-1] < kickoff[1:]))
+        in_order[ties] = match_id[ties] <= match_id[ties + 1]
+        if in_order.all():
+            return team_rows.set_axis(pd.RangeIndex(len(team_rows)), copy=False)
+    except TypeError:  # mixed key types; let pandas order them
+        pass
+    return team_rows.sort_values(["team_slug", "match_dt", "match_id"]).reset_index(drop=True)
 
 
 def _add_optional_goal_features(
@@ -390,14 +538,14 @@ def _add_optional_goal_features(
         return _set_goal_feature_priors(team_rows), report
 
     try:
-        goals = pd.read_csv(path)
+        header = pd.read_csv(path, nrows=0)
     except Exception as e:  # noqa: BLE001
         report["reason"] = f"goals file unreadable: {type(e).__name__}: {e}"
         return _set_goal_feature_priors(team_rows), report
 
-    match_col = _find_column(goals, ["match_id", "matchid", "game_id", "fixture_id"])
-    team_col = _find_column(goals, ["team_name", "team", "scoring_team", "team_scored", "goal_team", "team_slug"])
-    minute_col = _find_column(goals, ["minute_regulation", "minute", "goal_minute", "time"])
+    match_col = _find_column(header, ["match_id", "matchid", "game_id", "fixture_id"])
+    team_col = _find_column(header, ["team_name", "team", "scoring_team", "team_scored", "goal_team", "team_slug"])
+    minute_col = _find_column(header, ["minute_regulation", "minute", "goal_minute", "time"])
 
     if match_col is None or team_col is None or minute_col is None:
         report["reason"] = (
@@ -406,68 +554,71 @@ def _add_optional_goal_features(
         )
         return _set_goal_feature_priors(team_rows), report
 
-    g = goals[[match_col, team_col, minute_col]].copy()
-    g.columns = ["match_id", "scoring_team_raw", "minute_raw"]
-
-    g["match_id"] = g["match_id"].astype(str)
-    g["scoring_slug"] = g["scoring_team_raw"].map(apply_slug)
-    g["minute_regulation"] = g["minute_raw"].map(_parse_minute_regulation)
+    try:
+        goals = pd.read_csv(path, usecols=[match_col, team_col, minute_col])
+    except Exception as e:  # noqa: BLE001
+        report["reason"] = f"goals file unreadable: {type(e).__name__}: {e}"
+        return _set_goal_feature_priors(team_rows), report
 
-    g = g.dropna(subset=["match_id", "scoring_slug", "minute_regulation"]).copy()
-    if g.empty:
+    minute = _parse_minute_regulation(goals[minute_col])
+    valid = ~np.isnan(minute)
+    if not valid.any():
         report["reason"] = "goals parsed but no valid rows"
         return _set_goal_feature_priors(team_rows), report
 
-    valid_match_ids = set(matches["match_id"].astype(str).tolist())
-    g = g[g["match_id"].isin(valid_match_ids)].copy()
-    if g.empty:
+    # Goals are attributed through match positions rather than merges on match_id.
+    match_index = pd.Index(matches["match_id"].astype(str))
+    match_side = matches[["home_slug", "away_slug"]]
+    if not match_index.is_unique:
+        keep = ~match_index.duplicated()
+        match_index, match_side = match_index[keep], match_side[keep]
+    goal_match = match_index.get_indexer(goals[match_col].astype(str))
+    valid &= goal_match >= 0
+    if not valid.any():
         report["reason"] = "goals file has no matching match_id values"
         return _set_goal_feature_priors(team_rows), report
 
-    g = g.reset_index(drop=False).rename(columns={"index": "_row_order"})
-    g = g.sort_values(["match_id", "minute_regulation", "_row_order"]).reset_index(drop=True)
-
-    first_goal = g.groupby("match_id", as_index=False).first()[["match_id", "scoring_slug"]]
-    first_goal.columns = ["match_id", "first_goal_slug"]
-
-    match_side = matches[["match_id", "home_slug", "away_slug"]].copy()
-    g2 = g.merge(match_side, on="match_id", how="left")
-    g2["conceded_slug"] = np.where(
-        g2["scoring_slug"] == g2["home_slug"],
-        g2["away_slug"],
-        np.where(g2["scoring_slug"] == g2["away_slug"], g2["home_slug"], np.nan),
-    )
-
-    late = g2[g2["minute_regulation"] >= 75].copy()
-    late_counts = (
-        late.dropna(subset=["conceded_slug"])
-        .groupby(["match_id", "conceded_slug"], as_index=False)
-        .size()
-        .rename(columns={"conceded_slug": "team_slug", "size": "late_goals_conceded_75p"})
-    )
+    row_order = np.flatnonzero(valid)
+    goal_match = goal_match[row_order]
+    minute = minute[row_order]
+    scoring = _slug_values(goals[team_col].iloc[row_order])
+    home_slug = match_side["home_slug"].to_numpy(dtype=object)
+    away_slug = match_side["away_slug"].to_numpy(dtype=object)
+    n_matches = len(match_index)
+
+    # First goal per match: earliest minute, ties in file order.
+    earliest = np.full(n_matches, np.inf)
+    np.minimum.at(earliest, goal_match, minute)
+    candidates = np.flatnonzero(minute == earliest[goal_match])
+    first = np.full(n_matches, len(minute))
+    np.minimum.at(first, goal_match[candidates], candidates)
+    scored_first = first < len(minute)
+    first_goal_slug = np.full(n_matches, np.nan, dtype=object)
+    first_goal_slug[scored_first] = scoring[first[scored_first]]
+
+    # Late (75'+) goals conceded by each side; goals by neither side are dropped.
+    late = minute >= 75
+    home_scored = scoring == home_slug[goal_match]
+    away_scored = ~home_scored & (scoring == away_slug[goal_match])
+    away_late = np.bincount(goal_match[late & home_scored], minlength=n_matches)
+    home_late = np.bincount(goal_match[late & away_scored], minlength=n_matches)
 
     out = team_rows.copy()
-    out = out.merge(first_goal, on="match_id", how="left")
-    out["conceded_first"] = (
-        out["first_goal_slug"].notna() & (out["first_goal_slug"] != out["team_slug"])
+    team_match = match_index.get_indexer(out["match_id"].astype(str))
+    team_slug = out["team_slug"].to_numpy(dtype=object)
+    team_first = first_goal_slug[team_match]
+    out["first_goal_slug"] = team_first
+    out["conceded_first"] = (scored_first[team_match] & (team_first != team_slug)).astype(float)
+    out["late_goals_conceded_75p"] = (
+        np.where(team_slug == home_slug[team_match], home_late[team_match], 0)
+        + np.where(team_slug == away_slug[team_match], away_late[team_match], 0)
     ).astype(float)
-    out = out.merge(late_counts, on=["match_id", "team_slug"], how="left")
-    out["late_goals_conceded_75p"] = out["late_goals_conceded_75p"].fillna(0.0).astype(float)
     out["late_concede_indicator"] = (out["late_goals_conceded_75p"] > 0).astype(float)
 
-    out = out.sort_values(["team_slug", "match_dt", "match_id"]).reset_index(drop=True)
-    out["concede_first_rate"] = out.groupby("team_slug")["conceded_first"].transform(
-        lambda s: s.shift(1).rolling(10, min_periods=1).mean()
-    )
-    out["late_concede_rate_75p"] = out.groupby("team_slug")["late_concede_indicator"].transform(
-        lambda s: s.shift(1).rolling(10, min_periods=1).mean()
-    )
-
-    paf_list: list[pd.Series] = []
-    for _, g_team in out.groupby("team_slug", sort=False):
-        paf = _prior_points_after_concede(g_team["points"], g_team["conceded_first"])
-        paf_list.append(pd.Series(paf, index=g_team.index))
-    out["points_after_concede_first"] = pd.concat(paf_list).sort_index()
+    out = _sort_team_rows(out)
+    out["concede_first_rate"] = _prior_window(out["conceded_first"], out["team_slug"], 10, mean=True)
+    out["late_concede_rate_75p"] = _prior_window(out["late_concede_indicator"], out["team_slug"], 10, mean=True)
+    out["points_after_concede_first"] = _prior_points_after_concede(out["points"], out["conceded_first"], out["team_slug"])
 
     out["concede_first_rate"] = out["concede_first_rate"].fillna(GOAL_PRIOR_CONCEDE_FIRST_RATE)
     out["points_after_concede_first"] = out["points_after_concede_first"].fillna(GOAL_PRIOR_POINTS_AFTER_CONCEDE_FIRST)
@@ -475,7 +626,7 @@ def _add_optional_goal_features(
 
     report["loaded"] = True
     report["reason"] = f"goals features applied from {path}"
-    report["n_goals_rows_used"] = int(len(g))
+    report["n_goals_rows_used"] = int(len(row_order))
     return out, report
 
 
@@ -633,19 +784,94 @@ def build_engineered_dataset(
     matches_path: str | Path,
     goals_path: str | Path,
     use_goals_features: bool,
+    profiler: StageProfiler | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, float], dict[str, dict[str, float]], dict[str, Any]]:
-    matches = load_matches(matches_path)
-    matches, last_elo_end = compute_global_pre_match_elo(matches, base=ELO_BASE, k=ELO_K)
-    team_rows = _build_team_match_table(matches)
-    team_rows, goals_report = _add_optional_goal_features(team_rows, matches, goals_path, use_goals_features)
-    engineered = _merge_match_features(matches, team_rows)
-    engineered = _add_upset_target(engineered)
+    with _profile_stage(profiler, "load_matches") as row:
+        matches = load_matches(matches_path)
+        row["rows"] = int(len(matches))
+    with _profile_stage(profiler, "elo_replay"):
+        matches, last_elo_end = compute_global_pre_match_elo(matches, base=ELO_BASE, k=ELO_K)
+    with _profile_stage(profiler, "team_table") as row:
+        team_rows = _build_team_match_table(matches)
+        row["rows"] = int(len(team_rows))
+    with _profile_stage(profiler, "goal_features"):
+        team_rows, goals_report = _add_optional_goal_features(team_rows, matches, goals_path, use_goals_features)
+    with _profile_stage(profiler, "merge"):
+        engineered = _merge_match_features(matches, team_rows)
+    with _profile_stage(profiler, "target"):
+        engineered = _add_upset_target(engineered)
+
+        # Keep required canonical column name mentioned in prompt.
+        engineered["y_upset"] = engineered["y_upset_avoid_loss"]
+
+    with _profile_stage(profiler, "team_state"):
+        last_team_state = _build_last_team_state(team_rows, last_elo_end)
+    return engineered, team_rows, last_elo_end, last_team_state, goals_report
 
-    # Keep required canonical column name mentioned in prompt.
-    engineered["y_upset"] = engineered["y_upset_avoid_loss"]
 
-    last_team_state = _build_last_team_state(team_rows, last_elo_end)
-    return engineered, team_rows, last_elo_end, last_team_state, goals_report
+def _engineered_cache_path(
+    matches_path: str | Path,
+    goals_path: str | Path,
+    use_goals_features: bool,
+    cache_dir: str | Path = ENGINEERED_CACHE_DIR,
+) -> Path:
+    goals = Path(goals_path)
+    key = {
+        "version": ENGINEERED_CACHE_VERSION,
+        # Any edit to this module may change the features, so it is part of the key too.
+        "code": file_digest(__file__),
+        "matches": file_digest(matches_path),
+        "use_goals_features": bool(use_goals_features),
+        # The goals report names the path, so it is keyed alongside the content.
+        "goals_path": str(goals_path) if use_goals_features else None,
+        "goals": file_digest(goals) if use_goals_features and goals.is_file() else None,
+        "elo": [ELO_BASE, ELO_K],
+    }
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"{_engineered_cache_prefix(use_goals_features)}.{digest}.pkl"
+
+
+def _engineered_cache_prefix(use_goals_features: bool) -> str:
+    return f"engineered.{'goals' if use_goals_features else 'base'}"
+
+
+def load_engineered_dataset(
+    matches_path: str | Path,
+    goals_path: str | Path,
+    use_goals_features: bool,
+    cache_dir: str | Path | None = ENGINEERED_CACHE_DIR,
+    profiler: StageProfiler | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, float], dict[str, dict[str, float]], dict[str, Any]]:
+    """``build_engineered_dataset``, reusing the on-disk result while its inputs are unchanged.
+
+    The entry is keyed by the matches/goals content hashes, the goal-feature
+    flag and this module's source; any change rebuilds it and replaces the old
+    entry for the same flag. ``cache_dir=None`` always rebuilds without touching the cache.
+    With a ``profiler`` the build stages are only profiled on a cache miss.
+    """
+    if cache_dir is None:
+        return build_engineered_dataset(matches_path, goals_path, use_goals_features, profiler)
+
+    target = _engineered_cache_path(matches_path, goals_path, use_goals_features, cache_dir)
+    if target.exists():
+        try:
+            with _profile_stage(profiler, "engineered_cache_read"):
+                return pd.read_pickle(target)
+        except Exception as e:  # noqa: BLE001
+            warnings.warn(f"Discarding unreadable engineered cache {target.name}: {type(e).__name__}: {e}")
+
+    result = build_engineered_dataset(matches_path, goals_path, use_goals_features, profiler)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(".tmp")
+        pd.to_pickle(result, tmp_path)
+        tmp_path.replace(target)
+        for stale in target.parent.glob(f"{_engineered_cache_prefix(use_goals_features)}.*.pkl"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        warnings.warn(f"Could not write engineered cache {target}: {e}")
+    return result
 
 
 def _feature_columns(use_goals_features: bool) -> list[str]:
@@ -720,19 +946,106 @@ def _assert_booster_valid(xgb: XGBClassifier, x_fit_raw: pd.DataFrame) -> None:
     )
 
 
+def _native_xgb_params(params: dict[str, Any]) -> dict[str, Any]:
+    native = {k: v for k, v in params.items() if k not in ("n_estimators", "early_stopping_rounds")}
+    # Reseed row/column sampling from (seed, round) instead of the per-thread RNG, so a
+    # booster grown in steps interleaved with others matches one grown in a single run.
+    native["seed_per_iteration"] = True
+    return native
+
+
+def _new_xgb_candidate(params: dict[str, Any], d_fit: xgboost.DMatrix, d_cal: xgboost.DMatrix) -> dict[str, Any]:
+    return {
+        "booster": xgboost.Booster(_native_xgb_params(params), [d_fit, d_cal]),
+        "patience": int(params["early_stopping_rounds"]),
+        "best_score": np.inf,
+        "best_iteration": -1,
+        "stale": 0,
+        "stopped": False,
+    }
+
+
+def _boost_xgb_candidate(candidate: dict[str, Any], d_fit: xgboost.DMatrix, d_cal: xgboost.DMatrix, rounds: int) -> int:
+    """Boost ``candidate`` up to ``rounds`` trees; returns the rounds trained.
+
+    Round by round this is ``xgb.train(..., evals=[(d_cal, "validation_0")],
+    early_stopping_rounds=...)``, so a candidate boosted in several steps ends up
+    with the same trees, best_iteration and best_score as one uninterrupted fit.
+    """
+    booster = candidate["booster"]
+    start = booster.num_boosted_rounds()
+    for i in range(start, rounds):
+        if candidate["stopped"]:
+            return i - start
+        booster.update(d_fit, i)
+        score = float(booster.eval_set([(d_cal, "validation_0")], i).split(":")[-1])
+        if score < candidate["best_score"]:
+            booster.set_attr(best_score=str(score), best_iteration=str(i))
+            candidate.update(best_score=score, best_iteration=i, stale=0)
+        else:
+            candidate["stale"] += 1
+            candidate["stopped"] = candidate["stale"] >= candidate["patience"]
+    return max(rounds - start, 0)
+
+
+def _sample_xgb_params(rng: np.random.Generator, n: int) -> list[dict[str, Any]]:
+    """Draw ``n`` parameter sets with the same keys as the hand-picked candidates."""
+    return [
+        {
+            "learning_rate": round(float(10 ** rng.uniform(-2.0, -0.8)), 4),
+            "max_depth": int(rng.integers(2, 8)),
+            "subsample": round(float(rng.uniform(0.6, 1.0)), 2),
+            "colsample_bytree": round(float(rng.uniform(0.6, 1.0)), 2),
+            "reg_lambda": round(float(10 ** rng.uniform(-1.0, 1.0)), 3),
+            "reg_alpha": round(float(rng.uniform(0.0, 2.0)), 2),
+            "min_child_weight": int(rng.integers(1, 9)),
+            "gamma": round(float(rng.uniform(0.0, 2.0)), 2),
+        }
+        for _ in range(n)
+    ]
+
+
+def _candidate_metrics(y_cal: np.ndarray, p_cal: np.ndarray, fast: bool = False) -> tuple[float, dict[str, float | None]]:
+    """Selection score (cal AUC, else -cal logloss) and the metrics behind it.
+
+    ``fast`` uses the closed-form AUC/logloss, which agree with sklearn to rounding;
+    halving rungs score hundreds of candidates and only need their order.
+    """
+    auc, logloss = (_rank_auc, _binary_logloss) if fast else (_safe_auc, _safe_logloss)
+    metrics = {
+        "cal_auc": auc(y_cal, p_cal),
+        "cal_logloss": logloss(y_cal, p_cal),
+    }
+    if len(np.unique(y_cal)) >= 2 and metrics["cal_auc"] is not None:
+        score = metrics["cal_auc"]
+    else:
+        score = -(metrics["cal_logloss"] or np.inf)
+    return float(score), metrics
+
+
 def _fit_best_xgb_candidate(
     x_fit: pd.DataFrame,
     y_fit: np.ndarray,
     x_cal: pd.DataFrame,
     y_cal: np.ndarray,
-    x_val: pd.DataFrame,
-    y_val: np.ndarray,
-) -> tuple[XGBClassifier, dict[str, Any], list[dict[str, Any]]]:
+    n_samples: int = TUNING_SAMPLES,
+    round_budget: int | None = None,
+    time_budget_s: float | None = None,
+    workers: int | None = None,
+) -> tuple[XGBClassifier, dict[str, Any], list[dict[str, Any]], dict[str, Any]]:
     """
-    Lightweight hyperparameter search on fit/cal split.
-    Chooses the candidate with highest validation AUC
-    (hackathon optimization target).
-    Falls back to calibration AUC/logloss when validation has one class.
+    Successive-halving hyperparameter search on fit/cal split.
+    The hand-picked candidates plus ``n_samples`` random ones train for
+    TUNING_MIN_ROUNDS rounds, scaled up by TUNING_REFERENCE_LR / learning_rate;
+    the best 1/TUNING_ETA continue for eta times as many, until the survivors
+    train in full with early stopping on cal.
+    Chooses the finalist with highest calibration AUC (lower cal logloss breaks
+    ties, and is the score when cal has one class). The validation matches are
+    never seen here, so metrics reported on them are out-of-sample.
+    ``round_budget`` caps boosting rounds spent in the halving rungs and
+    ``time_budget_s`` their wall-clock time; when either runs out the current
+    leaders go straight to the final rung. ``workers`` sizes the training
+    thread pool (default: one per core).
     """
     base = {
         "objective": "binary:logistic",
@@ -828,45 +1141,112 @@ def _fit_best_xgb_candidate(
         },
     ]
 
-    has_cal_two_classes = len(np.unique(y_cal)) >= 2
-    has_val_two_classes = len(np.unique(y_val)) >= 2
-    best_model: XGBClassifier | None = None
-    best_params: dict[str, Any] | None = None
-    best_score = -np.inf
-    best_logloss = np.inf
-    tuning_rows: list[dict[str, Any]] = []
-
-    for idx, params in enumerate(candidates, start=1):
-        model = XGBClassifier(**{**base, **params})
-        model.fit(
-            x_fit,
-            y_fit,
-            eval_set=[(x_cal, y_cal)],
-            verbose=False,
-        )
-        p_cal = model.predict_proba(x_cal)[:, 1]
-        p_val = model.predict_proba(x_val)[:, 1]
-        cal_ll = _safe_logloss(y_cal, p_cal)
-        cal_auc = _safe_auc(y_cal, p_cal)
-        val_auc = _safe_auc(y_val, p_val)
-        val_ll = _safe_logloss(y_val, p_val)
-        if has_val_two_classes and val_auc is not None:
-            score = val_auc
-        elif has_cal_two_classes and cal_auc is not None:
-            score = cal_auc
-        else:
-            score = -(cal_ll or np.inf)
+    n_hand_picked = len(candidates)
+    candidates = candidates + _sample_xgb_params(np.random.default_rng(int(base["random_state"])), n_samples)
+    max_rounds = int(base["n_estimators"])
 
-        row = {
+    def rung_rounds(params: dict[str, Any], rounds: int) -> int:
+        scale = max(1.0, TUNING_REFERENCE_LR / float(params["learning_rate"]))
+        return min(max_rounds, math.ceil(rounds * scale))
+
+    if round_budget is not None:
+        # Every candidate needs at least the first rung.
+        first_rung = np.cumsum([rung_rounds(params, TUNING_MIN_ROUNDS) for params in candidates])
+        candidates = candidates[: max(n_hand_picked, int(np.searchsorted(first_rung, round_budget, side="right")))]
+
+    tuning_rows: list[dict[str, Any]] = [
+        {
             "candidate_id": idx,
-            "cal_auc": cal_auc,
-            "cal_logloss": cal_ll,
-            "val_auc": val_auc,
-            "val_logloss": val_ll,
-            "best_iteration": int(getattr(model, "best_iteration", -1)),
+            "source": "hand_picked" if idx <= n_hand_picked else "sampled",
+            "rung": 0,
+            "rounds": 0,
+            "rung_scores": [],
+            "best_iteration": None,
+            "finalist": False,
+            "selected": False,
+            "fit_s": 0.0,
             "params": params,
         }
-        tuning_rows.append(row)
+        for idx, params in enumerate(candidates, start=1)
+    ]
+
+    # One set of DMatrix objects shared by every candidate; Booster.update releases the GIL,
+    # so single-threaded boosters on a thread pool train concurrently.
+    d_fit = xgboost.DMatrix(x_fit, label=y_fit)
+    d_cal = xgboost.DMatrix(x_cal, label=y_cal)
+    workers = max(1, min(len(candidates), workers or os.cpu_count() or 1))
+    states = [_new_xgb_candidate({**base, **params}, d_fit, d_cal) for params in candidates]
+
+    # Rung rounds grow by eta while the field shrinks by eta; the survivors then
+    # boost to n_estimators with early stopping.
+    schedule: list[tuple[int, int]] = []
+    size, rounds = len(candidates), TUNING_MIN_ROUNDS
+    while rounds < max_rounds and size > TUNING_ETA:
+        schedule.append((size, rounds))
+        size, rounds = math.ceil(size / TUNING_ETA), rounds * TUNING_ETA
+    schedule.append((size, max_rounds))
+
+    def boost(i: int, rounds: int) -> int:
+        start = time.perf_counter()
+        trained = _boost_xgb_candidate(states[i], d_fit, d_cal, rung_rounds(candidates[i], rounds))
+        tuning_rows[i]["fit_s"] += time.perf_counter() - start
+        return trained
+
+    def evaluate(i: int, rung: int, final: bool) -> float:
+        iteration_range = (0, states[i]["best_iteration"] + 1)
+        booster = states[i]["booster"]
+        p_cal = booster.predict(d_cal, iteration_range=iteration_range)
+        score, metrics = _candidate_metrics(y_cal, p_cal, fast=not final)
+        tuning_rows[i].update(metrics, rounds=int(booster.num_boosted_rounds()), best_iteration=states[i]["best_iteration"])
+        tuning_rows[i]["rung_scores"].append({"rung": rung, "rounds": tuning_rows[i]["rounds"], "score": score})
+        return score
+
+    started = time.perf_counter()
+    rounds_used = 0
+    survivors = list(range(len(candidates)))
+    # Rank by score at each candidate's best iteration, then lower cal logloss, then candidate order.
+    ranking: dict[int, tuple[float, float, int]] = {}
+    rungs_run: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rung, (size, rounds) in enumerate(schedule):
+            final = rung == len(schedule) - 1
+            survivors = sorted(survivors, key=lambda i: ranking.get(i, (0.0, 0.0, i)))[:size]
+            if not final and rung > 0:
+                cost = sum(
+                    rung_rounds(candidates[i], rounds) - tuning_rows[i]["rounds"]
+                    for i in survivors
+                    if not states[i]["stopped"]
+                )
+                over_rounds = round_budget is not None and rounds_used + cost > round_budget
+                over_time = time_budget_s is not None and time.perf_counter() - started > time_budget_s
+                if over_rounds or over_time:
+                    # Out of budget: the current leaders go straight to the final rung.
+                    survivors, rounds, final = survivors[: schedule[-1][0]], max_rounds, True
+
+            survivors.sort()
+            rounds_used += sum(pool.map(lambda i: boost(i, rounds), survivors))
+            for i in survivors:
+                score = evaluate(i, rung, final)
+                tuning_rows[i]["rung"] = rung
+                cal_ll = tuning_rows[i]["cal_logloss"]
+                ranking[i] = (-score, cal_ll if cal_ll is not None else np.inf, i)
+            rungs_run.append({"rung": rung, "candidates": len(survivors), "rounds": rounds})
+            if final:
+                break
+    for row in tuning_rows:
+        row["fit_s"] = round(row["fit_s"], 4)
+
+    best_state: dict[str, Any] | None = None
+    best_row: dict[str, Any] | None = None
+    best_score = -np.inf
+    best_logloss = np.inf
+
+    # Scored in candidate order, so the pick does not depend on which thread finished first.
+    for i in survivors:
+        row = tuning_rows[i]
+        row["finalist"] = True
+        score = row["rung_scores"][-1]["score"]
+        cal_ll = row["cal_logloss"]
 
         is_better = False
         if score > best_score:
@@ -876,19 +1256,40 @@ def _fit_best_xgb_candidate(
             if cal_ll is not None and cal_ll < best_logloss:
                 is_better = True
         if is_better:
-            best_model = model
-            best_params = {**base, **params}
+            best_state = states[i]
+            best_row = row
             best_score = score
             best_logloss = cal_ll if cal_ll is not None else np.inf
 
-    if best_model is None or best_params is None:
+    if best_state is None or best_row is None:
         raise RuntimeError("Hyperparameter search failed to produce a valid model.")
-    return best_model, best_params, tuning_rows
+    best_row["selected"] = True
+    best_params = {**base, **best_row["params"]}
+    best_model = XGBClassifier(**best_params)
+    best_model.load_model(best_state["booster"].save_raw(raw_format="json"))
+
+    summary = {
+        "method": "successive_halving",
+        "eta": TUNING_ETA,
+        "n_candidates": len(candidates),
+        "n_hand_picked": n_hand_picked,
+        "n_finalists": len(survivors),
+        "rungs": rungs_run,
+        "round_budget": round_budget,
+        "time_budget_s": time_budget_s,
+        "budget_exhausted": len(rungs_run) < len(schedule),
+        "boosting_rounds": int(rounds_used),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "selected_candidate_id": best_row["candidate_id"],
+    }
+    return best_model, best_params, tuning_rows, summary
 
 
 def _jsonify_float(x: Any) -> Any:
     if x is None:
         return None
+    if isinstance(x, (bool, np.bool_)):
+        return bool(x)
     if isinstance(x, (float, np.floating)):
         if np.isnan(x) or np.isinf(x):
             return None
@@ -909,11 +1310,81 @@ def _save_json(path: Path, obj: Any) -> None:
     path.write_text(json.dumps(_convert(obj), indent=2), encoding="utf-8")
 
 
+def save_training_dataset(df: pd.DataFrame, out_dir: str | Path, dataset_format: str = "csv") -> list[Path]:
+    """Write ``training_dataset.csv`` and/or ``training_dataset.npz``; returns the written paths."""
+    if dataset_format not in TRAINING_DATASET_FORMATS:
+        raise ValueError(f"dataset_format must be one of {TRAINING_DATASET_FORMATS}, got {dataset_format!r}")
+    outp = Path(out_dir)
+    written: list[Path] = []
+    if dataset_format in ("csv", "both"):
+        written.append(outp / "training_dataset.csv")
+        df.to_csv(written[-1], index=False)
+    if dataset_format in ("npz", "both"):
+        written.append(outp / "training_dataset.npz")
+        _write_training_npz(df, written[-1])
+    return written
+
+
+def _write_training_npz(df: pd.DataFrame, path: Path) -> None:
+    # One zip member per column: numeric/bool/datetime columns keep their dtype, text
+    # columns become fixed-width unicode arrays plus a missing mask (no pickled objects).
+    arrays: dict[str, np.ndarray] = {}
+    columns: list[dict[str, str]] = []
+    for idx, name in enumerate(df.columns):
+        series = df[name]
+        key = f"c{idx}"
+        if series.dtype.kind in "biufcmM":
+            values = series.to_numpy()
+            # Plain dtype: pandas datetime arrays can carry dtype metadata that np.save drops with a warning.
+            arrays[key] = values.view(np.dtype(values.dtype.str))
+            columns.append({"name": str(name), "key": key, "kind": "numeric"})
+            continue
+        missing = series.isna().to_numpy()
+        arrays[key] = np.array(["" if miss else str(value) for value, miss in zip(series.tolist(), missing)], dtype=str)
+        arrays[f"{key}_missing"] = missing
+        columns.append({"name": str(name), "key": key, "kind": "text"})
+    arrays["meta"] = np.array(json.dumps({"version": TRAINING_NPZ_VERSION, "rows": int(len(df)), "columns": columns}))
+
+    tmp_path = path.with_name(path.stem + ".tmp.npz")
+    np.savez_compressed(tmp_path, **arrays)
+    tmp_path.replace(path)
+
+
+def load_training_dataset(path: str | Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """Load a ``training_dataset`` artifact (``.npz`` or ``.csv``), optionally only some columns.
+
+    The ``.npz`` bundle restores the saved dtypes (``match_dt`` stays datetime64)
+    and reads only the requested columns. Unknown column names are ignored.
+    """
+    source = Path(path)
+    wanted = None if columns is None else set(columns)
+    if source.suffix != ".npz":
+        df = pd.read_csv(source, usecols=None if wanted is None else (lambda name: name in wanted))
+        if "match_dt" in df.columns:
+            df["match_dt"] = pd.to_datetime(df["match_dt"], errors="coerce")
+        return df
+
+    with np.load(source, allow_pickle=False) as bundle:
+        meta = json.loads(str(bundle["meta"]))
+        if meta.get("version") != TRAINING_NPZ_VERSION:
+            raise ValueError(f"Unsupported training dataset version in {source}: {meta.get('version')}")
+        data: dict[str, np.ndarray] = {}
+        for spec in meta["columns"]:
+            if wanted is not None and spec["name"] not in wanted:
+                continue
+            values = bundle[spec["key"]]
+            if spec["kind"] == "text":
+                values = values.astype(object)
+                values[bundle[f"{spec['key']}_missing"]] = np.nan
+            data[spec["name"]] = values
+    return pd.DataFrame(data, index=pd.RangeIndex(meta["rows"]))
+
+
 def load_fc_team_table(top10_fc_path: str | Path) -> pd.DataFrame:
     path = Path(top10_fc_path)
     if not path.exists():
         raise FileNotFoundError(f"TOP10 FC file not found: {path}")
-    raw = pd.read_csv(path)
+    raw = read_csv_cached(path)
 
     slug_col = _find_column(raw, ["team_slug", "nation_slug", "country_slug", "team_slug_raw", "nation", "team", "country"])
     if slug_col is None:
@@ -978,7 +1449,7 @@ def load_external_elo(teams_elo_path: str | Path) -> dict[str, float]:
     if not path.exists():
         return {}
     try:
-        df = pd.read_csv(path)
+        df = read_csv_cached(path)
     except Exception:
         return {}
 
@@ -1117,14 +1588,15 @@ def build_hypothetical_pre_match_features(
     return row
 
 
-def predict_upset_probability(
-    feature_row: dict[str, Any],
+def predict_upset_probabilities(
+    feature_rows: list[dict[str, Any]],
     xgb_model: XGBClassifier,
     calibrator: CalibratedClassifierCV | None,
     feature_cols: list[str],
     fit_medians: pd.Series,
-) -> tuple[float, float]:
-    x = pd.DataFrame([feature_row])
+) -> tuple[np.ndarray, np.ndarray]:
+    """Batched (p_model, p_raw) for many hypothetical fixtures in one model call."""
+    x = pd.DataFrame(feature_rows)
     for c in feature_cols:
         if c not in x.columns:
             x[c] = np.nan
@@ -1133,14 +1605,25 @@ def predict_upset_probability(
         x[c] = pd.to_numeric(x[c], errors="coerce")
     x = x.fillna(fit_medians).fillna(0.0)
 
-    p_raw = float(xgb_model.predict_proba(x)[:, 1][0])
+    p_raw = xgb_model.predict_proba(x)[:, 1].astype(float)
     if calibrator is not None:
-        p_model = float(calibrator.predict_proba(x)[:, 1][0])
+        p_model = calibrator.predict_proba(x)[:, 1].astype(float)
     else:
         p_model = p_raw
     return p_model, p_raw
 
 
+def predict_upset_probability(
+    feature_row: dict[str, Any],
+    xgb_model: XGBClassifier,
+    calibrator: CalibratedClassifierCV | None,
+    feature_cols: list[str],
+    fit_medians: pd.Series,
+) -> tuple[float, float]:
+    p_model, p_raw = predict_upset_probabilities([feature_row], xgb_model, calibrator, feature_cols, fit_medians)
+    return float(p_model[0]), float(p_raw[0])
+
+
 def apply_fc_adjustment(
     p_model: float,
     favorite_slug: str,
@@ -1250,6 +1733,93 @@ def _convert_state_for_json(state: dict[str, dict[str, float]]) -> dict[str, dic
     return out
 
 
+def _fit_and_evaluate(
+    train_df: pd.DataFrame,
+    val_df: pd.DataFrame,
+    feature_cols: list[str],
+    target_col: str,
+    tuning_samples: int = TUNING_SAMPLES,
+    tuning_round_budget: int | None = None,
+    tuning_time_budget_s: float | None = None,
+    workers: int | None = None,
+    profiler: StageProfiler | None = None,
+) -> dict[str, Any]:
+    """
+    Split train_df 80/20 into fit/cal, tune and fit XGB, calibrate on cal and
+    score raw, calibrated and Elo-baseline probabilities on val_df.
+    Model selection only sees fit/cal, so val_df metrics are out-of-sample.
+    """
+    with _profile_stage(profiler, "prepare"):
+        split_idx = int(round(len(train_df) * 0.8))
+        split_idx = max(1, min(split_idx, len(train_df) - 1))
+        fit_df = train_df.iloc[:split_idx].copy()
+        cal_df = train_df.iloc[split_idx:].copy()
+
+        x_fit_raw = _to_numeric_X(fit_df, feature_cols)
+        x_cal_raw = _to_numeric_X(cal_df, feature_cols)
+        x_val_raw = _to_numeric_X(val_df, feature_cols)
+
+        x_fit, [x_cal, x_val], fit_medians = _impute_from_fit(x_fit_raw, x_cal_raw, x_val_raw)
+
+        y_fit = pd.to_numeric(fit_df[target_col], errors="coerce").fillna(0).astype(int).to_numpy()
+        y_cal = pd.to_numeric(cal_df[target_col], errors="coerce").fillna(0).astype(int).to_numpy()
+        y_val = pd.to_numeric(val_df[target_col], errors="coerce").fillna(0).astype(int).to_numpy()
+
+    if len(np.unique(y_fit)) < 2:
+        raise ValueError("fit_df contains only one class; cannot train binary classifier.")
+
+    # Hyperparameter search on fit/cal split to improve AUC.
+    with _profile_stage(profiler, "xgb_search"):
+        xgb, chosen_xgb_params, tuning_table, tuning_summary = _fit_best_xgb_candidate(
+            x_fit=x_fit,
+            y_fit=y_fit,
+            x_cal=x_cal,
+            y_cal=y_cal,
+            n_samples=tuning_samples,
+            round_budget=tuning_round_budget,
+            time_budget_s=tuning_time_budget_s,
+            workers=workers,
+        )
+        if profiler is not None:
+            # Candidates boost concurrently on threads, so each gets its summed boosting time only.
+            for row in tuning_table:
+                profiler.record(f"candidate:{row['candidate_id']}", row["fit_s"], rounds=row["rounds"], rung=row["rung"])
+
+    _assert_booster_valid(xgb, x_fit_raw)
+
+    p_raw_val = xgb.predict_proba(x_val)[:, 1]
+    raw_metrics = _metrics_dict(y_val, p_raw_val)
+
+    calibrator: CalibratedClassifierCV | None = None
+    calibrated_metrics: dict[str, float | None] | None = None
+    p_cal_val: np.ndarray | None = None
+
+    if len(cal_df) >= 50 and len(np.unique(y_cal)) >= 2:
+        with _profile_stage(profiler, "calibration"), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            calibrator = CalibratedClassifierCV(xgb, method="sigmoid", cv="prefit")
+            calibrator.fit(x_cal, y_cal)
+        p_cal_val = calibrator.predict_proba(x_val)[:, 1]
+        calibrated_metrics = _metrics_dict(y_val, p_cal_val)
+
+    p_base = _baseline_elo_probability(val_df["elo_diff"].to_numpy(dtype=float))
+    return {
+        "fit_df": fit_df,
+        "cal_df": cal_df,
+        "fit_medians": fit_medians,
+        "xgb": xgb,
+        "calibrator": calibrator,
+        "chosen_xgb_params": chosen_xgb_params,
+        "tuning_table": tuning_table,
+        "tuning_summary": tuning_summary,
+        "y_val": y_val,
+        "p_used": p_cal_val if p_cal_val is not None else p_raw_val,
+        "metrics_raw": raw_metrics,
+        "metrics_calibrated": calibrated_metrics,
+        "metrics_baseline_elo": _metrics_dict(y_val, p_base),
+    }
+
+
 def train_and_save(
     matches_path: str,
     goals_path: str,
@@ -1258,19 +1828,29 @@ def train_and_save(
     out_dir: str,
     use_goals_features: bool,
     alert_threshold: float,
+    tuning_samples: int = TUNING_SAMPLES,
+    tuning_round_budget: int | None = None,
+    tuning_time_budget_s: float | None = None,
+    engineered_cache_dir: str | Path | None = ENGINEERED_CACHE_DIR,
+    dataset_format: str = "csv",
+    profiler: StageProfiler | None = None,
 ) -> dict[str, Any]:
     outp = Path(out_dir)
     outp.mkdir(parents=True, exist_ok=True)
+    # Stage timings (and traced memory peaks, if the profiler traces them) go into eval_report.json["profile"].
+    profiler = profiler if profiler is not None else StageProfiler(trace_memory=False)
 
-    engineered, team_rows, last_elo_end, last_team_state, goals_report = build_engineered_dataset(
+    engineered, team_rows, last_elo_end, last_team_state, goals_report = load_engineered_dataset(
         matches_path=matches_path,
         goals_path=goals_path,
         use_goals_features=use_goals_features,
+        cache_dir=engineered_cache_dir,
+        profiler=profiler,
     )
 
     # Save engineered dataset artifact
-    training_dataset_path = outp / "training_dataset.csv"
-    engineered.to_csv(training_dataset_path, index=False)
+    with _profile_stage(profiler, "save_dataset"):
+        training_dataset_paths = save_training_dataset(engineered, outp, dataset_format)
 
     feature_cols = _feature_columns(use_goals_features=use_goals_features)
     target_col = "y_upset_avoid_loss"
@@ -1284,59 +1864,28 @@ def train_and_save(
     if len(val_df) < 5:
         raise ValueError(f"Not enough validation rows on/after 2022-01-01. Found {len(val_df)}")
 
-    split_idx = int(round(len(train_df) * 0.8))
-    split_idx = max(1, min(split_idx, len(train_df) - 1))
-    fit_df = train_df.iloc[:split_idx].copy()
-    cal_df = train_df.iloc[split_idx:].copy()
-
-    x_fit_raw = _to_numeric_X(fit_df, feature_cols)
-    x_cal_raw = _to_numeric_X(cal_df, feature_cols)
-    x_val_raw = _to_numeric_X(val_df, feature_cols)
-
-    x_fit, [x_cal, x_val], fit_medians = _impute_from_fit(x_fit_raw, x_cal_raw, x_val_raw)
-
-    y_fit = pd.to_numeric(fit_df[target_col], errors="coerce").fillna(0).astype(int).to_numpy()
-    y_cal = pd.to_numeric(cal_df[target_col], errors="coerce").fillna(0).astype(int).to_numpy()
-    y_val = pd.to_numeric(val_df[target_col], errors="coerce").fillna(0).astype(int).to_numpy()
-
-    if len(np.unique(y_fit)) < 2:
-        raise ValueError("fit_df contains only one class; cannot train binary classifier.")
-
-    # Hyperparameter search on fit/cal split to improve AUC.
-    xgb, chosen_xgb_params, tuning_table = _fit_best_xgb_candidate(
-        x_fit=x_fit,
-        y_fit=y_fit,
-        x_cal=x_cal,
-        y_cal=y_cal,
-        x_val=x_val,
-        y_val=y_val,
+    fitted = _fit_and_evaluate(
+        train_df,
+        val_df,
+        feature_cols,
+        target_col,
+        tuning_samples=tuning_samples,
+        tuning_round_budget=tuning_round_budget,
+        tuning_time_budget_s=tuning_time_budget_s,
+        profiler=profiler,
     )
-
-    _assert_booster_valid(xgb, x_fit_raw)
-
-    p_raw_val = xgb.predict_proba(x_val)[:, 1]
-    raw_metrics = _metrics_dict(y_val, p_raw_val)
-
-    calibrator: CalibratedClassifierCV | None = None
-    calibrated_metrics: dict[str, float | None] | None = None
-    p_cal_val: np.ndarray | None = None
-
-    if len(cal_df) >= 50 and len(np.unique(y_cal)) >= 2:
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            calibrator = CalibratedClassifierCV(xgb, method="sigmoid", cv="prefit")
-            calibrator.fit(x_cal, y_cal)
-        p_cal_val = calibrator.predict_proba(x_val)[:, 1]
-        calibrated_metrics = _metrics_dict(y_val, p_cal_val)
-
-    p_used = p_cal_val if p_cal_val is not None else p_raw_val
+    fit_df, cal_df, fit_medians = fitted["fit_df"], fitted["cal_df"], fitted["fit_medians"]
+    xgb, calibrator = fitted["xgb"], fitted["calibrator"]
+    chosen_xgb_params = fitted["chosen_xgb_params"]
+    tuning_table, tuning_summary = fitted["tuning_table"], fitted["tuning_summary"]
+    y_val, p_used = fitted["y_val"], fitted["p_used"]
+    raw_metrics = fitted["metrics_raw"]
+    calibrated_metrics = fitted["metrics_calibrated"]
+    baseline_metrics = fitted["metrics_baseline_elo"]
 
     cal_table = _calibration_table(y_val, p_used, bins=10)
     alert_cm = _extract_confusion(y_val, p_used, threshold=alert_threshold)
 
-    p_base = _baseline_elo_probability(val_df["elo_diff"].to_numpy(dtype=float))
-    baseline_metrics = _metrics_dict(y_val, p_base)
-
     booster = xgb.get_booster()
     best_iter = int(getattr(xgb, "best_iteration", -1))
     estimator_cap = int(chosen_xgb_params.get("n_estimators", 0))
@@ -1345,6 +1894,10 @@ def train_and_save(
 
     # Reporting
     print("\n=== Validation Metrics ===")
+    print(
+        f"Tuning: {tuning_summary['n_candidates']} candidates, {len(tuning_summary['rungs'])} rungs, "
+        f"{tuning_summary['n_finalists']} finalists in {tuning_summary['elapsed_s']}s"
+    )
     print(f"Chosen XGB params: {chosen_xgb_params}")
     print(f"Best iteration: {best_iter} / cap={estimator_cap} (utilization={None if used_ratio is None else round(used_ratio, 3)})")
     if used_ratio is not None and used_ratio < 0.1:
@@ -1382,6 +1935,7 @@ def train_and_save(
         "num_boosted_rounds": int(booster.num_boosted_rounds()),
         "chosen_xgb_params": chosen_xgb_params,
         "xgb_tuning_table": tuning_table,
+        "xgb_tuning_summary": tuning_summary,
         "xgb_best_iteration": best_iter,
         "xgb_estimator_cap": estimator_cap,
         "xgb_utilization_ratio": used_ratio,
@@ -1393,9 +1947,6 @@ def train_and_save(
     feature_list_path = outp / "feature_list.json"
     eval_report_path = outp / "eval_report.json"
 
-    xgb.save_model(str(xgb_model_path))
-    joblib.dump(calibrator, calibrator_path)
-
     feature_info = {
         "feature_columns": feature_cols,
         "fit_medians": {k: float(v) for k, v in fit_medians.to_dict().items()},
@@ -1411,28 +1962,37 @@ def train_and_save(
         "last_team_state": _convert_state_for_json(last_team_state),
         "valid_start_date": "2022-01-01",
     }
-    _save_json(feature_list_path, feature_info)
-    _save_json(eval_report_path, eval_report)
+    with _profile_stage(profiler, "save_artifacts"):
+        xgb.save_model(str(xgb_model_path))
+        joblib.dump(calibrator, calibrator_path)
+        _save_json(feature_list_path, feature_info)
 
     # Step 6 + Step 9: demo predictions artifact
-    fc_team = load_fc_team_table(top10_fc_path)
-    elo_external = load_external_elo(teams_elo_path)
-    demo_path = outp / "demo_predictions_top10.csv"
-    demo_df = generate_demo_predictions(
-        xgb_model=xgb,
-        calibrator=calibrator,
-        feature_info=feature_info,
-        fc_team=fc_team,
-        external_elo_map=elo_external,
-        out_csv_path=demo_path,
-        alert_threshold=alert_threshold,
-    )
+    with _profile_stage(profiler, "demo") as row:
+        fc_team = load_fc_team_table(top10_fc_path)
+        elo_external = load_external_elo(teams_elo_path)
+        demo_path = outp / "demo_predictions_top10.csv"
+        demo_df = generate_demo_predictions(
+            xgb_model=xgb,
+            calibrator=calibrator,
+            feature_info=feature_info,
+            fc_team=fc_team,
+            external_elo_map=elo_external,
+            out_csv_path=demo_path,
+            alert_threshold=alert_threshold,
+        )
+        row["rows"] = int(len(demo_df))
+
+    # Written last so the profile covers every stage above.
+    eval_report["profile"] = profiler.report()
+    _save_json(eval_report_path, eval_report)
 
     print("\nSaved artifacts:")
     print(f"  {xgb_model_path}")
     print(f"  {calibrator_path}")
     print(f"  {feature_list_path}")
-    print(f"  {training_dataset_path}")
+    for path in training_dataset_paths:
+        print(f"  {path}")
     print(f"  {eval_report_path}")
     print(f"  {demo_path}")
     print(f"Demo rows: {len(demo_df)}")
@@ -1443,6 +2003,7 @@ def train_and_save(
         "feature_info": feature_info,
         "fc_team": fc_team,
         "external_elo_map": elo_external,
+        "profile": eval_report["profile"],
     }
 
 
@@ -1582,6 +2143,27 @@ def parse_args() -> argparse.Namespace:
         default=USE_GOALS_FEATURES,
         help="Enable optional goal-event fragility features (default False).",
     )
+    parser.add_argument("--tuning-samples", type=int, default=TUNING_SAMPLES, help="Random XGB configs added to the hand-picked ones.")
+    parser.add_argument("--tuning-round-budget", type=int, default=None, help="Cap on boosting rounds across the halving rungs.")
+    parser.add_argument("--tuning-time-budget", type=float, default=None, help="Wall-clock seconds for the halving rungs.")
+    parser.add_argument(
+        "--engineered-cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=f"Reuse the engineered dataset cached under {ENGINEERED_CACHE_DIR} while inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--dataset-format",
+        choices=TRAINING_DATASET_FORMATS,
+        default="csv",
+        help="training_dataset artifact: csv, npz (typed, compressed, column-selectable) or both.",
+    )
+    parser.add_argument("--profile", action="store_true", help="Print the per-stage time/memory profile after training.")
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record per-stage peak traced memory with tracemalloc (slows training about 3x).",
+    )
     return parser.parse_args()
 
 
@@ -1605,7 +2187,16 @@ def main() -> None:
             out_dir=args.out_dir,
             use_goals_features=bool(args.use_goals_features),
             alert_threshold=float(args.alert_threshold),
+            tuning_samples=int(args.tuning_samples),
+            tuning_round_budget=args.tuning_round_budget,
+            tuning_time_budget_s=args.tuning_time_budget,
+            engineered_cache_dir=ENGINEERED_CACHE_DIR if args.engineered_cache else None,
+            dataset_format=args.dataset_format,
+            profiler=StageProfiler(trace_memory=args.trace_memory),
         )
+        if args.profile:
+            print("\n=== Stage Profile ===")
+            print(format_profile(model_bundle["profile"]))
 
     if do_demo:
         if model_bundle is None:
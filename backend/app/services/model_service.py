@@ -7,8 +7,12 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from .csv_cache import read_csv_cached
+from .team_registry import team_registry
+
 logger = logging.getLogger(__name__)
 
 _MODEL_IMPORT_ERROR: Exception | None = None
@@ -18,13 +22,14 @@ try:
         OUT_DIR,
         TEAMS_ELO_PATH,
         TOP10_FC_PATH,
-        apply_slug,
+        apply_fc_adjustment,
         build_hypothetical_pre_match_features,
         compare_external_elo,
         dark_score_payload,
         load_artifacts_for_inference,
         load_external_elo,
         load_fc_team_table,
+        predict_upset_probabilities,
         predict_upset_probability,
     )
 except Exception as exc:  # optional DarkScore dependency gate
@@ -32,13 +37,14 @@ except Exception as exc:  # optional DarkScore dependency gate
     OUT_DIR = ""
     TEAMS_ELO_PATH = ""
     TOP10_FC_PATH = ""
-    apply_slug = None
+    apply_fc_adjustment = None
     build_hypothetical_pre_match_features = None
     compare_external_elo = None
     dark_score_payload = None
     load_artifacts_for_inference = None
     load_external_elo = None
     load_fc_team_table = None
+    predict_upset_probabilities = None
     predict_upset_probability = None
 
 _FC26_PLAYERS_PATH = Path(__file__).parent / "Cleaned_Data" / "fc26_players_clean.csv"
@@ -49,15 +55,6 @@ NEW_SCORE_MAX = 90.0
 NEW_SCORE_MEAN = (NEW_SCORE_MIN + NEW_SCORE_MAX) / 2.0
 
 
-def _slug_key(value: str) -> str:
-    raw = str(value or "").strip()
-    if not raw:
-        return ""
-    if callable(apply_slug):
-        return apply_slug(raw)
-    return raw.lower().replace(" ", "_")
-
-
 def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
     lower_map = {c.lower(): c for c in df.columns}
     for candidate in candidates:
@@ -67,28 +64,38 @@ def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
     return None
 
 
-def _load_ranked_players_by_team(csv_path: Path, max_players_per_team: int = 5) -> dict[str, list[dict[str, Any]]]:
+def _load_ranked_players_by_team(csv_path: Path, max_players_per_team: int = 5) -> dict[int, list[dict[str, Any]]]:
+    """Top players per registry team id, best skill score first."""
     if not csv_path.exists():
         logger.warning("Dark Knight player source missing: %s", csv_path)
         return {}
 
+    team_candidates = ["nation_slug", "nation", "team_slug", "country", "team"]
+    name_candidates = ["name", "player_name", "short_name"]
+    pos_candidates = ["best_position", "position", "club_position"]
+    skill_candidates = ["overall_rating", "best_overall", "overall", "potential"]
     try:
-        players = pd.read_csv(csv_path)
+        # Only the candidate columns are materialized from the binary cache.
+        players = read_csv_cached(
+            csv_path,
+            columns=team_candidates + name_candidates + pos_candidates + skill_candidates,
+        )
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to read Dark Knight player source: %s", exc)
         return {}
 
-    team_col = _find_column(players, ["nation_slug", "nation", "team_slug", "country", "team"])
-    name_col = _find_column(players, ["name", "player_name", "short_name"])
-    pos_col = _find_column(players, ["best_position", "position", "club_position"])
-    skill_col = _find_column(players, ["overall_rating", "best_overall", "overall", "potential"])
+    team_col = _find_column(players, team_candidates)
+    name_col = _find_column(players, name_candidates)
+    pos_col = _find_column(players, pos_candidates)
+    skill_col = _find_column(players, skill_candidates)
 
     if team_col is None or name_col is None:
         logger.warning("Dark Knight player source missing required columns: team/name")
         return {}
 
     df = players.copy()
-    df["_team_key"] = df[team_col].astype(str).map(_slug_key)
+    registry = team_registry()
+    df["_team_id"] = df[team_col].astype(str).map(registry.id_of)
     df["_name"] = df[name_col].fillna("Data missing").astype(str).str.strip()
     if pos_col is None:
         df["_position"] = "Data missing"
@@ -99,15 +106,16 @@ def _load_ranked_players_by_team(csv_path: Path, max_players_per_team: int = 5)
     else:
         df["_skill_score"] = pd.to_numeric(df[skill_col], errors="coerce").fillna(0.0)
 
-    df = df[df["_team_key"] != ""].copy()
+    df = df[df["_team_id"].notna()].copy()
     if df.empty:
-        logger.warning("Dark Knight player source parsed but team keys were empty.")
+        logger.warning("Dark Knight player source parsed but no rows matched a supported team.")
         return {}
+    df["_team_id"] = df["_team_id"].astype(int)
 
-    df = df.sort_values(["_team_key", "_skill_score", "_name"], ascending=[True, False, True]).reset_index(drop=True)
+    df = df.sort_values(["_team_id", "_skill_score", "_name"], ascending=[True, False, True]).reset_index(drop=True)
 
-    by_team: dict[str, list[dict[str, Any]]] = {}
-    for team_key, group in df.groupby("_team_key", sort=False):
+    by_team: dict[int, list[dict[str, Any]]] = {}
+    for team_id, group in df.groupby("_team_id", sort=False):
         players: list[dict[str, Any]] = []
         for _, row in group.head(max_players_per_team).iterrows():
             try:
@@ -119,7 +127,7 @@ def _load_ranked_players_by_team(csv_path: Path, max_players_per_team: int = 5)
                 "position": str(row["_position"]) or "Data missing",
                 "skill_score": int(max(0, min(100, round(score)))),
             })
-        by_team[str(team_key)] = players
+        by_team[int(team_id)] = players
 
     logger.info("Loaded Dark Knight player rankings: teams=%s source=%s", len(by_team), csv_path.name)
     return by_team
@@ -148,12 +156,61 @@ class ModelService:
     feature_info: dict
     fc_team: pd.DataFrame
     external_elo_map: dict[str, float]
-    ranked_players_by_team: dict[str, list[dict[str, Any]]]
+    ranked_players_by_team: dict[int, list[dict[str, Any]]]
     alert_threshold: float = 0.60
     _demo_csv: Path = field(init=False)
+    _knockout_matrices: dict[tuple[tuple[str, ...], str], np.ndarray] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         self._demo_csv = Path(OUT_DIR) / "demo_predictions_top10.csv"
+        self._knockout_matrices = {}
+
+    def knockout_win_matrix(self, teams: list[str], stage_name: str = "round of 32") -> np.ndarray:
+        """P(row team beats column team) in a knockout tie, from FC-adjusted DarkScore upset odds.
+
+        Every unordered pair is scored once (first-listed team as home) in a single
+        batched model call; the matrix is cached per team list.
+        """
+        if _MODEL_IMPORT_ERROR is not None:
+            raise RuntimeError("DarkScore model dependencies are unavailable on this server.")
+        key = (tuple(teams), stage_name)
+        cached = self._knockout_matrices.get(key)
+        if cached is not None:
+            return cached
+
+        last_team_state = dict(self.feature_info.get("last_team_state", {}))
+        last_elo_end = {k: float(v) for k, v in self.feature_info.get("last_elo_end", {}).items()}
+        use_goals = bool(self.feature_info.get("use_goals_features", False))
+        pairs = [(i, j) for i in range(len(teams)) for j in range(i + 1, len(teams))]
+        rows = [
+            build_hypothetical_pre_match_features(
+                home_team_name=teams[i],
+                away_team_name=teams[j],
+                last_team_state=last_team_state,
+                last_elo_end=last_elo_end,
+                use_goals_features=use_goals,
+                stage_name=stage_name,
+            )
+            for i, j in pairs
+        ]
+        matrix = np.full((len(teams), len(teams)), 0.5)
+        if not rows:
+            return matrix
+        p_model, _ = predict_upset_probabilities(
+            rows,
+            xgb_model=self.xgb_model,
+            calibrator=self.calibrator,
+            feature_cols=list(self.feature_info["feature_columns"]),
+            fit_medians=pd.Series(self.feature_info["fit_medians"], dtype=float),
+        )
+        for (i, j), row, p in zip(pairs, rows, p_model):
+            home_favored = float(row["elo_diff"]) >= 0
+            favorite, underdog = (row["home_slug"], row["away_slug"]) if home_favored else (row["away_slug"], row["home_slug"])
+            p_upset, _ = apply_fc_adjustment(float(p), favorite, underdog, self.fc_team)
+            matrix[i, j] = 1.0 - p_upset if home_favored else p_upset
+            matrix[j, i] = 1.0 - matrix[i, j]
+        self._knockout_matrices[key] = matrix
+        return matrix
 
     def predict_dark_score(self, home_team: str, away_team: str, stage_name: str = "group stage") -> dict:
         if _MODEL_IMPORT_ERROR is not None:
@@ -314,7 +371,8 @@ class ModelService:
         }
 
     def _top_players(self, team: str, limit: int) -> list[dict[str, Any]]:
-        players = self.ranked_players_by_team.get(_slug_key(team), [])
+        team_id = team_registry().id_of(team)
+        players = self.ranked_players_by_team.get(team_id, []) if team_id is not None else []
         return list(players[:limit])
 
     def _resolve_dark_knights(
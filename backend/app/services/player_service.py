@@ -2,56 +2,80 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ..schemas.player import (
     GoalkeeperWallRankingResponse,
     GoalkeeperWallRow,
+    LeaderboardResponse,
+    LeaderboardRow,
     NationPlayersResponse,
     PlayerRow,
     TopUpsetPlayer,
     TopUpsetPlayersResponse,
 )
-from .data_loader import PlayerRecord, normalize_text
+from .data_loader import PlayerRecord, normalize_text, to_int
+from .leaderboard import DEVELOPMENT_GAP, PlayerLeaderboard
 
 
-def _to_int(raw: str, fallback: int = 0) -> int:
-    try:
-        return int(float(raw))
-    except (TypeError, ValueError):
-        return fallback
+def _rating_key(player: PlayerRecord) -> tuple[int, int]:
+    return to_int(player.overall_rating), to_int(player.potential)
 
 
 @dataclass
 class PlayerService:
     players: list[PlayerRecord]
+    _nation_responses: dict[str, NationPlayersResponse] = field(init=False, repr=False)
+    _leaderboard: PlayerLeaderboard = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._leaderboard = PlayerLeaderboard(players=self.players)
+        buckets: dict[str, list[PlayerRecord]] = {}
+        for player in self.players:
+            buckets.setdefault(normalize_text(player.nation), []).append(player)
+
+        self._nation_responses = {}
+        for nation_key, matched in buckets.items():
+            rows = [
+                PlayerRow(
+                    name=player.name,
+                    nation=player.nation,
+                    best_position=player.best_position,
+                    club=player.club,
+                    overall_rating=player.overall_rating,
+                    potential=player.potential,
+                    age=player.age,
+                )
+                for player in sorted(matched, key=_rating_key, reverse=True)
+            ]
+            self._nation_responses[nation_key] = NationPlayersResponse(nation=rows[0].nation, count=len(rows), players=rows)
 
     def players_for_nation(self, nation: str) -> NationPlayersResponse | None:
-        nation_key = normalize_text(nation)
-        matched = [player for player in self.players if normalize_text(player.nation) == nation_key]
-        if not matched:
-            return None
+        return self._nation_responses.get(normalize_text(nation))
 
-        rows = [
-            PlayerRow(
-                name=player.name,
-                nation=player.nation,
-                best_position=player.best_position,
-                club=player.club,
-                overall_rating=player.overall_rating,
-                potential=player.potential,
-                age=player.age,
+    def leaderboard(
+        self,
+        metric: str,
+        limit: int = 20,
+        nation: str | None = None,
+        position_group: str | None = None,
+    ) -> LeaderboardResponse:
+        indices = self._leaderboard.top_indices(metric, limit, nation=nation, position_group=position_group)
+        payload = [
+            LeaderboardRow(
+                name=self.players[idx].name,
+                nation=self.players[idx].nation,
+                best_position=self.players[idx].best_position,
+                club=self.players[idx].club,
+                overall_rating=self.players[idx].overall_rating,
+                potential=self.players[idx].potential,
+                value=self._leaderboard.metric_value(metric, idx),
             )
-            for player in sorted(matched, key=lambda item: (_to_int(item.overall_rating), _to_int(item.potential)), reverse=True)
+            for idx in indices
         ]
-        return NationPlayersResponse(nation=rows[0].nation, count=len(rows), players=rows)
+        return LeaderboardResponse(metric=metric, nation=nation, position_group=position_group, players=payload)
 
     def top_upset_players(self, limit: int = 20) -> TopUpsetPlayersResponse:
-        ranked = sorted(
-            self.players,
-            key=lambda player: (_to_int(player.potential) - _to_int(player.overall_rating), _to_int(player.potential)),
-            reverse=True,
-        )[:limit]
         payload = [
             TopUpsetPlayer(
                 name=player.name,
@@ -60,19 +84,13 @@ class PlayerService:
                 club=player.club,
                 overall_rating=player.overall_rating,
                 potential=player.potential,
-                development_gap=max(0, _to_int(player.potential) - _to_int(player.overall_rating)),
+                development_gap=max(0, to_int(player.potential) - to_int(player.overall_rating)),
             )
-            for player in ranked
+            for player in self._leaderboard.top(DEVELOPMENT_GAP, limit)
         ]
         return TopUpsetPlayersResponse(players=payload)
 
     def goalkeeper_wall_ranking(self, limit: int = 20) -> GoalkeeperWallRankingResponse:
-        keepers = [
-            player
-            for player in self.players
-            if normalize_text(player.best_position) == "gk"
-        ]
-        keepers = sorted(keepers, key=lambda player: (_to_int(player.overall_rating), _to_int(player.potential)), reverse=True)[:limit]
         payload = [
             GoalkeeperWallRow(
                 name=player.name,
@@ -81,7 +99,6 @@ class PlayerService:
                 overall_rating=player.overall_rating,
                 potential=player.potential,
             )
-            for player in keepers
+            for player in self._leaderboard.top("overall_rating", limit, position_group="GK")
         ]
         return GoalkeeperWallRankingResponse(goalkeepers=payload)
-
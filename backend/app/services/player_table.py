@@ -0,0 +1,102 @@
+"""Offline preprocessing for the imputed FC26 player table.
+
+Usage:
+    python -m backend.app.services.player_table [--source PATH] [--out-dir PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from .csv_cache import file_digest, read_csv_cached
+from .data_loader import DATA_ROOT, POSITION_TO_GROUP, STAT_COLUMNS, _resolve_data_file
+
+logger = logging.getLogger(__name__)
+
+PLAYER_TABLE_DIR = DATA_ROOT / "cache"
+# Bump when the artifact layout changes; edits to this module change the key on their own.
+PLAYER_TABLE_VERSION = 1
+
+
+def impute_player_stats(players: pd.DataFrame) -> pd.DataFrame:
+    """Drop unnamed/unrated rows and fill stat nulls with position-group medians."""
+    df = players[players["name"].notna() & players["overall_rating"].notna()].copy()
+    stat_cols = [c for c in STAT_COLUMNS if c in df.columns]
+    if not stat_cols:
+        return df
+
+    groups = df["best_position"].map(POSITION_TO_GROUP).fillna("MID")
+    group_medians = df[stat_cols].groupby(groups).transform("median")
+    df[stat_cols] = df[stat_cols].fillna(group_medians).fillna(df[stat_cols].median())
+    return df
+
+
+def player_table_path(source: Path, out_dir: Path = PLAYER_TABLE_DIR) -> Path:
+    key = {
+        "version": PLAYER_TABLE_VERSION,
+        # The imputation rules live here and in the data_loader tables below.
+        "code": file_digest(__file__),
+        "stat_columns": STAT_COLUMNS,
+        "position_groups": POSITION_TO_GROUP,
+        "source": file_digest(source),
+        # Pickles are only guaranteed to load under the pandas version that wrote them.
+        "pandas": pd.__version__,
+    }
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return Path(out_dir) / f"{Path(source).stem}.imputed.{digest}.pkl"
+
+
+def build_player_table(source: Path, out_dir: Path = PLAYER_TABLE_DIR) -> Path:
+    source = Path(source)
+    target = player_table_path(source, out_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    table = impute_player_stats(read_csv_cached(source))
+    tmp_path = target.with_suffix(".tmp")
+    table.to_pickle(tmp_path)
+    tmp_path.replace(target)
+
+    for stale in target.parent.glob(f"{source.stem}.imputed.*.pkl"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+
+    logger.info("Built imputed player table: rows=%s source=%s artifact=%s", len(table), source.name, target.name)
+    return target
+
+
+def load_player_table(source: Path | None = None, out_dir: Path = PLAYER_TABLE_DIR) -> pd.DataFrame:
+    """Load the imputed table for ``source``, building it first if no artifact matches its key."""
+    source = Path(source) if source is not None else _resolve_data_file("fc26_combined.csv")
+    target = player_table_path(source, out_dir)
+    if not target.exists():
+        try:
+            target = build_player_table(source, out_dir)
+        except OSError as exc:
+            logger.warning("Could not write imputed player table (%s); imputing in memory.", exc)
+            return impute_player_stats(read_csv_cached(source))
+    return pd.read_pickle(target)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the imputed FC26 player table artifact.")
+    parser.add_argument("--source", type=Path, default=None, help="Player CSV (default: fc26_combined.csv).")
+    parser.add_argument("--out-dir", type=Path, default=PLAYER_TABLE_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    source = args.source if args.source is not None else _resolve_data_file("fc26_combined.csv")
+    if not source.exists():
+        print(f"Player source not found: {source}", file=sys.stderr)
+        sys.exit(1)
+    print(build_player_table(source, args.out_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,90 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import base64
+import hashlib
 import math
+from typing import Any
 
-from ..schemas.predict import MatchPredictionRequest, MatchPredictionResponse, UpsetRequest, UpsetResponse
-from .data_loader import MatchupDataset, normalize_text
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from ..schemas.predict import (
+    MatchPredictionRequest,
+    MatchPredictionResponse,
+    MatchupMatrixResponse,
+    UpsetGridRequest,
+    UpsetGridResponse,
+    UpsetRequest,
+    UpsetResponse,
+)
+from .data_loader import MatchupDataset
+
+
+CONFIDENCE_LABELS = ("Low", "Medium", "High")
+STRENGTH_FALLBACK_SOURCE = "fc26_combined.csv team-strength fallback"
+_OUTCOME_FIELDS = ("team_a_pct", "draw_pct", "team_b_pct", "confidence", "upset_score", "source")
+
+
+def elo_win_probability(elo_a, elo_b):
+    """Elo logistic P(a beats b) on the 400-point scale; works on floats and arrays."""
+    return 1.0 / (1.0 + 10 ** ((elo_b - elo_a) / 400.0))
 
 
 class PredictionInputError(ValueError):
     """Raised when the prediction request input is invalid."""
 
 
+_MATCHUP_ITEM = TypeAdapter(MatchPredictionRequest)
+_UPSET_ITEM = TypeAdapter(UpsetRequest)
+
+
+def _validate_batch(adapter: TypeAdapter, items: list[Any]) -> tuple[list[Any], dict[int, PredictionInputError]]:
+    """Validate raw batch items against the single-call schema; invalid items are None plus an error."""
+    payloads: list[Any] = []
+    errors: dict[int, PredictionInputError] = {}
+    for idx, item in enumerate(items):
+        try:
+            payloads.append(adapter.validate_python(item))
+        except ValidationError as exc:
+            payloads.append(None)
+            details = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}" for error in exc.errors()
+            )
+            errors[idx] = PredictionInputError(details)
+    return payloads, errors
+
+
+@dataclass(frozen=True)
+class MatchupTable:
+    """Every ordered pair for one venue, indexed ``[id_a, id_b]`` by registry id.
+
+    ``confidence`` indexes ``CONFIDENCE_LABELS`` and ``source`` indexes
+    ``sources``. The diagonal is unused (a team never plays itself).
+    """
+
+    team_a_pct: np.ndarray
+    draw_pct: np.ndarray
+    team_b_pct: np.ndarray
+    confidence: np.ndarray
+    upset_score: np.ndarray
+    source: np.ndarray
+    sources: tuple[str, ...]
+
+
 @dataclass
 class PredictionService:
     dataset: MatchupDataset
     home_advantage: float = 0.04
+    _tables: dict[bool, MatchupTable] = field(init=False, repr=False)
+    _version: str = field(init=False, repr=False)
+    _matrices: dict[tuple[bool, str], MatchupMatrixResponse] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._tables = self._build_tables()
+        self._version = self._table_version()
+        self._matrices = {}
 
     @property
     def is_ready(self) -> bool:
@@ -29,31 +98,154 @@ class PredictionService:
     def list_teams(self) -> list[str]:
         return self.dataset.teams
 
+    @property
+    def dataset_version(self) -> str:
+        """Content hash of the precomputed tables; changes whenever any output would."""
+        return self._version
+
+    def matchup_table(self, neutral_site: bool) -> MatchupTable:
+        return self._tables[bool(neutral_site)]
+
+    def matchup_matrix(self, neutral_site: bool, encoding: str = "json") -> MatchupMatrixResponse:
+        key = (bool(neutral_site), encoding)
+        cached = self._matrices.get(key)
+        if cached is not None:
+            return cached
+
+        table = self.matchup_table(neutral_site)
+        matrices = [table.team_a_pct, table.draw_pct, table.team_b_pct]
+        if encoding == "base64":
+            encoded = [base64.b64encode(np.ascontiguousarray(m, dtype=np.uint8).tobytes()).decode("ascii") for m in matrices]
+        else:
+            encoded = [m.astype(np.uint8).tolist() for m in matrices]
+        payload = MatchupMatrixResponse(
+            venue="neutral" if neutral_site else "home",
+            encoding=encoding,
+            version=self._version,
+            teams=list(self.dataset.teams),
+            team_a_win=encoded[0],
+            draw=encoded[1],
+            team_b_win=encoded[2],
+        )
+        self._matrices[key] = payload
+        return payload
+
     def predict_matchup(self, payload: MatchPredictionRequest) -> MatchPredictionResponse:
-        team_a = self._resolve_team_name(payload.team_a)
-        team_b = self._resolve_team_name(payload.team_b)
-        if team_a == team_b:
+        id_a = self._resolve_team_id(payload.team_a)
+        id_b = self._resolve_team_id(payload.team_b)
+        if id_a == id_b:
             raise PredictionInputError("team_a and team_b must be different.")
+        table = self.matchup_table(payload.neutral_site)
+        outcomes = (int(getattr(table, name)[id_a, id_b]) for name in _OUTCOME_FIELDS)
+        return self._prediction_response(id_a, id_b, payload.neutral_site, *outcomes)
+
+    def predict_matchups(self, items: list[Any]) -> list[MatchPredictionResponse | PredictionInputError]:
+        """Predict many fixtures in input order; invalid items come back as errors instead of raising.
+
+        Items are validated one by one as ``MatchPredictionRequest``.
+        """
+        payloads, errors = _validate_batch(_MATCHUP_ITEM, items)
+        ids_a, ids_b, resolve_errors = self._resolve_pairs([None if p is None else (p.team_a, p.team_b) for p in payloads])
+        errors.update(resolve_errors)
+        neutral = np.array([p is None or p.neutral_site for p in payloads], dtype=bool)
+        outcomes = self._gather_outcomes(ids_a, ids_b, neutral)
+        return [
+            errors[idx] if idx in errors else self._prediction_response(
+                int(ids_a[idx]), int(ids_b[idx]), bool(neutral[idx]), *(int(values[idx]) for values in outcomes)
+            )
+            for idx in range(len(payloads))
+        ]
 
-        raw_a, raw_b, probability_source = self._lookup_pair_probabilities(team_a, team_b)
-        adj_a, adj_b = self._apply_home_adjustment(raw_a, raw_b, payload.neutral_site)
+    def scoreline_upset(self, payload: UpsetRequest) -> UpsetResponse:
+        prediction = self.predict_matchup(
+            MatchPredictionRequest(
+                team_a=payload.team_a,
+                team_b=payload.team_b,
+                neutral_site=payload.neutral_site,
+            )
+        )
+        adjusted = self._adjusted_upset_scores(
+            np.array(prediction.upset_score),
+            np.array(payload.score_a),
+            np.array(payload.score_b),
+            np.array(prediction.predicted_winner == prediction.team_a),
+        )
+        return self._upset_response(
+            prediction.team_a, prediction.team_b, payload.score_a, payload.score_b, prediction.upset_score, int(adjusted)
+        )
 
-        draw_prob = self._derive_draw_probability(adj_a, adj_b, payload.neutral_site)
-        win_space = max(0.0, 1.0 - draw_prob)
-        total = adj_a + adj_b
-        if total <= 0:
-            adj_a = adj_b = 0.5
-            total = 1.0
+    def scoreline_upsets(self, items: list[Any]) -> list[UpsetResponse | PredictionInputError]:
+        """Batch ``scoreline_upset`` in input order; invalid items come back as errors instead of raising.
+
+        Items are validated one by one as ``UpsetRequest``.
+        """
+        payloads, errors = _validate_batch(_UPSET_ITEM, items)
+        ids_a, ids_b, resolve_errors = self._resolve_pairs([None if p is None else (p.team_a, p.team_b) for p in payloads])
+        errors.update(resolve_errors)
+        neutral = np.array([p is None or p.neutral_site for p in payloads], dtype=bool)
+        pct_a, _, pct_b, _, base, _ = self._gather_outcomes(ids_a, ids_b, neutral)
+        score_a = np.array([0 if p is None else p.score_a for p in payloads], dtype=np.int64)
+        score_b = np.array([0 if p is None else p.score_b for p in payloads], dtype=np.int64)
+        adjusted = self._adjusted_upset_scores(base, score_a, score_b, pct_a >= pct_b)
+
+        teams = self.dataset.teams
+        return [
+            errors[idx] if idx in errors else self._upset_response(
+                teams[ids_a[idx]],
+                teams[ids_b[idx]],
+                payload.score_a,
+                payload.score_b,
+                int(base[idx]),
+                int(adjusted[idx]),
+            )
+            for idx, payload in enumerate(payloads)
+        ]
 
-        win_a = (adj_a / total) * win_space
-        win_b = (adj_b / total) * win_space
+    def scoreline_upset_grid(self, payload: UpsetGridRequest) -> UpsetGridResponse:
+        """Upset score for every scoreline from 0-0 to max_goals-max_goals, one base prediction."""
+        prediction = self.predict_matchup(
+            MatchPredictionRequest(
+                team_a=payload.team_a,
+                team_b=payload.team_b,
+                neutral_site=payload.neutral_site,
+            )
+        )
+        goals = np.arange(payload.max_goals + 1)
+        grid = self._adjusted_upset_scores(
+            np.array(prediction.upset_score),
+            goals[:, np.newaxis],
+            goals[np.newaxis, :],
+            np.array(prediction.predicted_winner == prediction.team_a),
+        )
+        return UpsetGridResponse(
+            team_a=prediction.team_a,
+            team_b=prediction.team_b,
+            neutral_site=payload.neutral_site,
+            predicted_winner=prediction.predicted_winner,
+            baseline_upset_score=prediction.upset_score,
+            max_goals=payload.max_goals,
+            upset_scores=grid.tolist(),
+        )
 
-        pct_a, pct_draw, pct_b = self._to_percentages(win_a, draw_prob, win_b)
+    def _prediction_response(
+        self,
+        id_a: int,
+        id_b: int,
+        neutral_site: bool,
+        pct_a: int,
+        pct_draw: int,
+        pct_b: int,
+        confidence_code: int,
+        upset_score: int,
+        source_code: int,
+    ) -> MatchPredictionResponse:
+        table = self.matchup_table(neutral_site)
+        team_a = self.dataset.teams[id_a]
+        team_b = self.dataset.teams[id_b]
+        probability_source = table.sources[source_code]
         predicted_winner = team_a if pct_a >= pct_b else team_b
-        confidence = self._confidence_label(pct_a, pct_b, pct_draw)
-        upset_score = self._upset_score(pct_a, pct_b)
         favorite_team, underdog_team = self._favorite_and_underdog(team_a, team_b, pct_a, pct_b)
-        elo_gap = self._elo_gap(team_a, team_b)
+        elo_gap = self._elo_gap(id_a, id_b)
         base_line, method_line = self._base_probability_lines(
             probability_source=probability_source,
             favorite_team=favorite_team,
@@ -64,7 +256,7 @@ class PredictionService:
         explanation = [
             base_line,
             method_line,
-            f"{'Neutral venue keeps baseline balance.' if payload.neutral_site else f'{team_a} receives a small home advantage boost.'}",
+            f"{'Neutral venue keeps baseline balance.' if neutral_site else f'{team_a} receives a small home advantage boost.'}",
             f"Draw probability is adjusted by matchup parity (current draw estimate: {pct_draw}%).",
         ]
 
@@ -76,37 +268,23 @@ class PredictionService:
             team_b_win_prob=pct_b,
             predicted_winner=predicted_winner,
             upset_score=upset_score,
-            confidence=confidence,
+            confidence=CONFIDENCE_LABELS[confidence_code],
             explanation=explanation,
-            neutral_site=payload.neutral_site,
+            neutral_site=neutral_site,
             model_source=probability_source,
         )
 
-    def scoreline_upset(self, payload: UpsetRequest) -> UpsetResponse:
-        prediction = self.predict_matchup(
-            MatchPredictionRequest(
-                team_a=payload.team_a,
-                team_b=payload.team_b,
-                neutral_site=payload.neutral_site,
-            )
-        )
-        goal_diff = abs(payload.score_a - payload.score_b)
-        base = prediction.upset_score
-        if payload.score_a == payload.score_b:
-            adjusted = min(100, base + 8)
+    @staticmethod
+    def _upset_response(team_a: str, team_b: str, score_a: int, score_b: int, base: int, adjusted: int) -> UpsetResponse:
+        if score_a == score_b:
             projected = "Draw"
         else:
-            picked_winner = prediction.team_a if payload.score_a > payload.score_b else prediction.team_b
-            winner_matches = picked_winner == prediction.predicted_winner
-            adjusted = base - min(20, goal_diff * 4) if winner_matches else min(100, base + 18 + goal_diff * 3)
-            projected = picked_winner
-
-        adjusted = max(0, min(100, int(round(adjusted))))
+            projected = team_a if score_a > score_b else team_b
         return UpsetResponse(
-            team_a=prediction.team_a,
-            team_b=prediction.team_b,
-            score_a=payload.score_a,
-            score_b=payload.score_b,
+            team_a=team_a,
+            team_b=team_b,
+            score_a=score_a,
+            score_b=score_b,
             upset_score=adjusted,
             projected_result=projected,
             explanation=[
@@ -116,36 +294,136 @@ class PredictionService:
             ],
         )
 
-    def _resolve_team_name(self, candidate: str) -> str:
-        normalized = normalize_text(candidate)
-        for team in self.dataset.teams:
-            if normalize_text(team) == normalized:
-                return team
-        raise PredictionInputError(f"Unsupported team: {candidate}")
-
-    def _lookup_pair_probabilities(self, team_a: str, team_b: str) -> tuple[float, float, str]:
-        elo_a = self.dataset.team_elo.get(team_a)
-        elo_b = self.dataset.team_elo.get(team_b)
-        if elo_a is not None and elo_b is not None:
-            prob_a = 1.0 / (1.0 + 10 ** ((elo_b - elo_a) / 400.0))
+    @staticmethod
+    def _adjusted_upset_scores(
+        base: np.ndarray, score_a: np.ndarray, score_b: np.ndarray, team_a_favored: np.ndarray
+    ) -> np.ndarray:
+        """Shift baseline upset scores for submitted scorelines (all arguments broadcast).
+
+        Draws add 8, a win for the predicted winner subtracts 4 per goal of margin
+        (at most 20), and a win for the other side adds 18 plus 3 per goal.
+        """
+        goal_diff = np.abs(score_a - score_b)
+        expected = base - np.minimum(20, goal_diff * 4)
+        contrarian = np.minimum(100, base + 18 + goal_diff * 3)
+        adjusted = np.where(
+            score_a == score_b,
+            np.minimum(100, base + 8),
+            np.where((score_a > score_b) == team_a_favored, expected, contrarian),
+        )
+        return np.clip(adjusted, 0, 100)
+
+    def _resolve_pairs(
+        self, pairs: list[tuple[str, str] | None]
+    ) -> tuple[np.ndarray, np.ndarray, dict[int, PredictionInputError]]:
+        """Resolve each distinct name once; failed rows get id 0 and an entry in the error map.
+
+        ``None`` rows (already rejected by the caller) are skipped with id 0.
+        """
+        resolved: dict[str, int | PredictionInputError] = {}
+        ids = np.zeros((len(pairs), 2), dtype=np.intp)
+        errors: dict[int, PredictionInputError] = {}
+        for idx, names in enumerate(pairs):
+            if names is None:
+                continue
+            for side, name in enumerate(names):
+                if name not in resolved:
+                    try:
+                        resolved[name] = self._resolve_team_id(name)
+                    except PredictionInputError as exc:
+                        resolved[name] = exc
+                team = resolved[name]
+                if isinstance(team, PredictionInputError):
+                    errors.setdefault(idx, team)
+                else:
+                    ids[idx, side] = team
+            if idx not in errors and ids[idx, 0] == ids[idx, 1]:
+                errors[idx] = PredictionInputError("team_a and team_b must be different.")
+        return ids[:, 0], ids[:, 1], errors
+
+    def _gather_outcomes(self, ids_a: np.ndarray, ids_b: np.ndarray, neutral: np.ndarray) -> tuple[np.ndarray, ...]:
+        """(pct_a, pct_draw, pct_b, confidence, upset, source) for each row, picking the venue table per row."""
+        neutral_table, home_table = self._tables[True], self._tables[False]
+        return tuple(
+            np.where(neutral, getattr(neutral_table, name)[ids_a, ids_b], getattr(home_table, name)[ids_a, ids_b])
+            for name in _OUTCOME_FIELDS
+        )
+
+    def _resolve_team_id(self, candidate: str) -> int:
+        team_id = self.dataset.registry.id_of(candidate)
+        if team_id is None:
+            raise PredictionInputError(f"Unsupported team: {candidate}")
+        return team_id
+
+    def _lookup_pair_probabilities(self, id_a: int, id_b: int) -> tuple[float, float, str]:
+        elo_a = float(self.dataset.elo[id_a])
+        elo_b = float(self.dataset.elo[id_b])
+        if not (math.isnan(elo_a) or math.isnan(elo_b)):
+            prob_a = elo_win_probability(elo_a, elo_b)
             prob_b = 1.0 - prob_a
             return prob_a, prob_b, self.dataset.source_file
 
-        direct = self.dataset.probabilities.get((team_a, team_b))
-        if direct is not None:
-            return direct[0], direct[1], self.dataset.fallback_source_file
-
-        reversed_pair = self.dataset.probabilities.get((team_b, team_a))
-        if reversed_pair is not None:
-            prob_b, prob_a = reversed_pair
+        prob_a, prob_b = (float(value) for value in self.dataset.pair_probabilities[id_a, id_b])
+        if not math.isnan(prob_a):
             return prob_a, prob_b, self.dataset.fallback_source_file
 
-        strength_a = self.dataset.team_strength.get(team_a, 70.0)
-        strength_b = self.dataset.team_strength.get(team_b, 70.0)
-        diff = strength_a - strength_b
+        diff = float(self.dataset.strength[id_a]) - float(self.dataset.strength[id_b])
         prob_a = 1.0 / (1.0 + math.exp(-diff / 4.5))
         prob_b = 1.0 - prob_a
-        return prob_a, prob_b, "fc26_combined.csv team-strength fallback"
+        return prob_a, prob_b, STRENGTH_FALLBACK_SOURCE
+
+    def _build_tables(self) -> dict[bool, MatchupTable]:
+        size = len(self.dataset.teams)
+        sources = (self.dataset.source_file, self.dataset.fallback_source_file, STRENGTH_FALLBACK_SOURCE)
+        raw_a = np.full((size, size), 0.5)
+        raw_b = np.full((size, size), 0.5)
+        source = np.zeros((size, size), dtype=np.uint8)
+        off_diagonal = ~np.eye(size, dtype=bool)
+        # Base priors stay on the scalar path so every pair keeps the exact
+        # floating-point result of the per-request computation.
+        for id_a in range(size):
+            for id_b in range(size):
+                if id_a != id_b:
+                    prob_a, prob_b, name = self._lookup_pair_probabilities(id_a, id_b)
+                    raw_a[id_a, id_b], raw_b[id_a, id_b] = prob_a, prob_b
+                    source[id_a, id_b] = sources.index(name)
+
+        tables: dict[bool, MatchupTable] = {}
+        for neutral_site in (True, False):
+            pct_a, pct_draw, pct_b = self.outcome_percentages(raw_a, raw_b, neutral_site)
+            tables[neutral_site] = MatchupTable(
+                team_a_pct=pct_a * off_diagonal,
+                draw_pct=pct_draw * off_diagonal,
+                team_b_pct=pct_b * off_diagonal,
+                confidence=self._confidence_code(pct_a, pct_b, pct_draw),
+                upset_score=self._upset_score(pct_a, pct_b),
+                source=source,
+                sources=sources,
+            )
+        return tables
+
+    def outcome_percentages(
+        self, prob_a: np.ndarray, prob_b: np.ndarray, neutral_site: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Win/draw/loss percentages for raw two-way priors, via home adjustment and draw derivation."""
+        adj_a, adj_b = self._apply_home_adjustment(prob_a, prob_b, neutral_site)
+        draw_prob = self._derive_draw_probability(adj_a, adj_b, neutral_site)
+        win_space = np.maximum(0.0, 1.0 - draw_prob)
+        total = adj_a + adj_b
+        degenerate = total <= 0
+        adj_a = np.where(degenerate, 0.5, adj_a)
+        adj_b = np.where(degenerate, 0.5, adj_b)
+        total = np.where(degenerate, 1.0, total)
+        return self._to_percentages((adj_a / total) * win_space, draw_prob, (adj_b / total) * win_space)
+
+    def _table_version(self) -> str:
+        digest = hashlib.sha256("\n".join(self.dataset.teams).encode("utf-8"))
+        for neutral_site in (True, False):
+            table = self._tables[neutral_site]
+            for values in (table.team_a_pct, table.draw_pct, table.team_b_pct, table.confidence, table.upset_score, table.source):
+                digest.update(np.ascontiguousarray(values).tobytes())
+            digest.update("\n".join(table.sources).encode("utf-8"))
+        return digest.hexdigest()[:16]
 
     def _base_probability_lines(
         self,
@@ -183,51 +461,50 @@ class PredictionService:
         underdog_team = team_b if favorite_team == team_a else team_a
         return favorite_team, underdog_team
 
-    def _elo_gap(self, team_a: str, team_b: str) -> float | None:
-        elo_a = self.dataset.team_elo.get(team_a)
-        elo_b = self.dataset.team_elo.get(team_b)
-        if elo_a is None or elo_b is None:
-            return None
-        return abs(elo_a - elo_b)
+    def _elo_gap(self, id_a: int, id_b: int) -> float | None:
+        gap = abs(float(self.dataset.elo[id_a]) - float(self.dataset.elo[id_b]))
+        return None if math.isnan(gap) else gap
 
-    def _apply_home_adjustment(self, prob_a: float, prob_b: float, neutral_site: bool) -> tuple[float, float]:
+    def _apply_home_adjustment(
+        self, prob_a: np.ndarray, prob_b: np.ndarray, neutral_site: bool
+    ) -> tuple[np.ndarray, np.ndarray]:
         if neutral_site:
             return prob_a, prob_b
 
         boosted_a = prob_a + self.home_advantage
-        lowered_b = max(0.01, prob_b - self.home_advantage)
+        lowered_b = np.maximum(0.01, prob_b - self.home_advantage)
         total = boosted_a + lowered_b
         return boosted_a / total, lowered_b / total
 
     @staticmethod
-    def _derive_draw_probability(prob_a: float, prob_b: float, neutral_site: bool) -> float:
-        parity = 1.0 - abs(prob_a - prob_b)
+    def _derive_draw_probability(prob_a: np.ndarray, prob_b: np.ndarray, neutral_site: bool) -> np.ndarray:
+        parity = 1.0 - np.abs(prob_a - prob_b)
         base = 0.11 if neutral_site else 0.08
         draw_prob = base + (0.16 * parity)
-        return max(0.04, min(0.28, draw_prob))
+        return np.clip(draw_prob, 0.04, 0.28)
 
     @staticmethod
-    def _to_percentages(prob_a: float, prob_draw: float, prob_b: float) -> tuple[int, int, int]:
-        values = [prob_a, prob_draw, prob_b]
-        rounded = [int(round(value * 100)) for value in values]
-        delta = 100 - sum(rounded)
-        if delta != 0:
-            max_idx = max(range(3), key=lambda idx: values[idx])
-            rounded[max_idx] += delta
+    def _to_percentages(
+        prob_a: np.ndarray, prob_draw: np.ndarray, prob_b: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # np.rint rounds half to even, matching Python's round().
+        values = np.stack([prob_a, prob_draw, prob_b])
+        rounded = np.rint(values * 100).astype(np.int16)
+        delta = 100 - rounded.sum(axis=0)
+        max_idx = np.argmax(values, axis=0)
+        np.put_along_axis(rounded, max_idx[np.newaxis], np.take_along_axis(rounded, max_idx[np.newaxis], 0) + delta, 0)
         return rounded[0], rounded[1], rounded[2]
 
     @staticmethod
-    def _confidence_label(prob_a_pct: int, prob_b_pct: int, draw_pct: int) -> str:
-        margin = abs(prob_a_pct - prob_b_pct)
-        winner_prob = max(prob_a_pct, prob_b_pct)
-        if winner_prob >= 68 and draw_pct <= 18 and margin >= 18:
-            return "High"
-        if winner_prob >= 55 and margin >= 8:
-            return "Medium"
-        return "Low"
+    def _confidence_code(prob_a_pct: np.ndarray, prob_b_pct: np.ndarray, draw_pct: np.ndarray) -> np.ndarray:
+        margin = np.abs(prob_a_pct - prob_b_pct)
+        winner_prob = np.maximum(prob_a_pct, prob_b_pct)
+        high = (winner_prob >= 68) & (draw_pct <= 18) & (margin >= 18)
+        medium = (winner_prob >= 55) & (margin >= 8)
+        return np.select([high, medium], [2, 1], default=0).astype(np.uint8)
 
     @staticmethod
-    def _upset_score(prob_a_pct: int, prob_b_pct: int) -> int:
-        favorite_prob = max(prob_a_pct, prob_b_pct)
+    def _upset_score(prob_a_pct: np.ndarray, prob_b_pct: np.ndarray) -> np.ndarray:
+        favorite_prob = np.maximum(prob_a_pct, prob_b_pct)
         score = (100 - favorite_prob) * 1.65
-        return max(0, min(100, int(round(score))))
+        return np.clip(np.rint(score), 0, 100).astype(np.int16)
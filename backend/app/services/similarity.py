@@ -0,0 +1,107 @@
+"""Nearest-neighbour search over FC26 player stat vectors."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from ..schemas.player import SimilarPlayerRow, SimilarPlayersResponse
+from .data_loader import POSITION_GROUPS, STAT_COLUMNS, normalize_text, position_group
+
+
+class SimilarityInputError(ValueError):
+    """Raised when a similarity query uses an unknown filter."""
+
+
+@dataclass
+class SimilarPlayerIndex:
+    """Cosine similarity over standardized stat vectors.
+
+    ``vectors`` holds one z-scored, L2-normalized float32 row per player, so a
+    query is a single matrix-vector product followed by ``argpartition``.
+    """
+
+    names: list[str]
+    nations: list[str]
+    positions: list[str]
+    overall: np.ndarray
+    vectors: np.ndarray
+    _by_name: dict[str, int] = field(init=False, repr=False)
+    _nation_keys: np.ndarray = field(init=False, repr=False)
+    _groups: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._by_name = {}
+        for idx, name in enumerate(self.names):
+            self._by_name.setdefault(name.lower(), idx)
+        self._nation_keys = np.array([normalize_text(nation) for nation in self.nations], dtype=object)
+        self._groups = np.array([position_group(position) for position in self.positions], dtype=object)
+
+    @classmethod
+    def from_frame(cls, players: pd.DataFrame) -> SimilarPlayerIndex:
+        stat_cols = [c for c in STAT_COLUMNS if c in players.columns]
+        stats = players[stat_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        stats = np.where(np.isnan(stats), np.nanmean(stats, axis=0), stats)
+
+        std = stats.std(axis=0)
+        z = (stats - stats.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        norms = np.linalg.norm(z, axis=1, keepdims=True)
+        vectors = (z / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+        return cls(
+            names=players["name"].astype(str).tolist(),
+            nations=players["nation"].fillna("").astype(str).tolist(),
+            positions=players["best_position"].fillna("").astype(str).tolist(),
+            overall=pd.to_numeric(players["overall_rating"], errors="coerce").to_numpy(dtype=float),
+            vectors=vectors,
+        )
+
+    def similar(
+        self,
+        name: str,
+        k: int = 10,
+        nation: str | None = None,
+        position_group: str | None = None,
+    ) -> SimilarPlayersResponse | None:
+        idx = self._by_name.get(name.strip().lower())
+        if idx is None:
+            return None
+        group_key = position_group.strip().upper() if position_group else None
+        if group_key is not None and group_key not in POSITION_GROUPS:
+            raise SimilarityInputError(f"Unsupported position group: {position_group}")
+
+        scores = self.vectors @ self.vectors[idx]
+        mask = np.ones(len(scores), dtype=bool)
+        mask[idx] = False
+        if nation:
+            mask &= self._nation_keys == normalize_text(nation)
+        if group_key is not None:
+            mask &= self._groups == group_key
+
+        candidates = np.flatnonzero(mask)
+        k = min(max(0, int(k)), candidates.size)
+        if k == 0:
+            top: np.ndarray = candidates[:0]
+        else:
+            candidate_scores = scores[candidates]
+            part = np.argpartition(-candidate_scores, k - 1)[:k]
+            top = candidates[part[np.argsort(-candidate_scores[part], kind="stable")]]
+
+        rows = [
+            SimilarPlayerRow(
+                name=self.names[j],
+                nation=self.nations[j],
+                best_position=self.positions[j],
+                overall_rating=None if np.isnan(self.overall[j]) else float(self.overall[j]),
+                similarity=round(float(scores[j]), 4),
+            )
+            for j in top
+        ]
+        return SimilarPlayersResponse(
+            player=self.names[idx],
+            nation=self.nations[idx],
+            best_position=self.positions[idx],
+            players=rows,
+        )
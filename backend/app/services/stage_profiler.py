@@ -0,0 +1,109 @@
+"""Wall-clock and traced-memory profile of named pipeline stages.
+
+``StageProfiler.stage(name)`` times a block and, with ``trace_memory``, records
+the peak memory that ``tracemalloc`` saw while it ran above the level at entry
+(numpy and pandas buffers included; native XGBoost allocations are not).
+Tracing slows allocation-heavy code severalfold, so it is off unless asked for.
+Stages nest, and each records the peak of its own window, inner stages included.
+The profile is a flat list in start order with ``/``-joined paths, ready for
+``eval_report.json``.
+
+Like ``csv_cache`` this only uses the standard library, so ``model_predictor.py``
+can import it when executed as a script.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+_MB = 1024.0 * 1024.0
+
+
+class StageProfiler:
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.stages: list[dict[str, Any]] = []
+        self._stack: list[dict[str, Any]] = []
+        self._started_tracing = False
+        self._created = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, **info: Any) -> Iterator[dict[str, Any]]:
+        """Profile the ``with`` block as ``name``; ``info`` and keys set on the yielded row are recorded too."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        path = self._path(name)
+        row: dict[str, Any] = {"stage": path, "depth": len(self._stack), "seconds": None, "peak_mb": None, **info}
+        self.stages.append(row)
+        frame = {"row": row, "base": 0, "peak": 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # reset_peak below clears the parent's window, so carry its peak so far.
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            frame["base"] = frame["peak"] = current
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield row
+        finally:
+            row["seconds"] = round(time.perf_counter() - start, 4)
+            self._stack.pop()
+            if self.trace_memory:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                row["peak_mb"] = round((peak - frame["base"]) / _MB, 2)
+                if self._stack:
+                    self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            if not self._stack and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def record(self, name: str, seconds: float, **info: Any) -> None:
+        """Add a stage timed elsewhere (e.g. on a worker thread) under the current stage, without memory."""
+        path = self._path(name)
+        self.stages.append({"stage": path, "depth": len(self._stack), "seconds": round(seconds, 4), "peak_mb": None, **info})
+
+    def _path(self, name: str) -> str:
+        return f"{self._stack[-1]['row']['stage']}/{name}" if self._stack else name
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "trace_memory": self.trace_memory,
+            "total_s": round(time.perf_counter() - self._created, 4),
+            "stages": self.stages,
+        }
+
+
+def format_profile(profile: dict[str, Any], max_rows: int = 40) -> str:
+    """Indented stage table; long runs of same-named sibling stages (candidate fits) are summarized."""
+    lines = [f"{'stage':<44} {'seconds':>9} {'peak_mb':>9}"]
+    stages = profile.get("stages", [])
+    i = 0
+    while i < len(stages) and len(lines) <= max_rows:
+        row = stages[i]
+        parent, _, leaf = row["stage"].rpartition("/")
+        group = leaf.split(":", 1)[0]
+        j = i
+        while (
+            j + 1 < len(stages)
+            and stages[j + 1]["stage"].rpartition("/")[0] == parent
+            and stages[j + 1]["stage"].rpartition("/")[2].split(":", 1)[0] == group
+            and ":" in leaf
+        ):
+            j += 1
+        indent = "  " * int(row.get("depth", 0))
+        if j > i:
+            runs = [float(s["seconds"] or 0.0) for s in stages[i : j + 1]]
+            label = f"{indent}{group} x{len(runs)} (max {max(runs):.3f}s)"
+            lines.append(f"{label:<44} {sum(runs):>9.3f} {'-':>9}")
+        else:
+            peak = "-" if row.get("peak_mb") is None else f"{row['peak_mb']:.2f}"
+            lines.append(f"{indent + leaf:<44} {float(row['seconds'] or 0.0):>9.3f} {peak:>9}")
+        i = j + 1
+    lines.append(f"{'total':<44} {float(profile.get('total_s') or 0.0):>9.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,125 @@
+"""Canonical 2026 team registry shared by every service.
+
+Each supported team gets a dense integer id (its position in the sorted name
+list). Names, FIFA codes, snake_case slugs and known aliases all collapse to the
+same key, so resolving free text to an id is one dict lookup and per-team data
+can live in arrays indexed by that id.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+TEAM_TO_CODE = {
+    "Algeria": "ALG",
+    "Argentina": "ARG",
+    "Australia": "AUS",
+    "Austria": "AUT",
+    "Belgium": "BEL",
+    "Brazil": "BRA",
+    "Canada": "CAN",
+    "Cape Verde": "CPV",
+    "Colombia": "COL",
+    "Croatia": "CRO",
+    "Curaçao": "CUW",
+    "Ecuador": "ECU",
+    "Egypt": "EGY",
+    "England": "ENG",
+    "France": "FRA",
+    "Germany": "GER",
+    "Ghana": "GHA",
+    "Haiti": "HAI",
+    "Iran": "IRN",
+    "Ivory Coast": "CIV",
+    "Japan": "JPN",
+    "Jordan": "JOR",
+    "Mexico": "MEX",
+    "Morocco": "MAR",
+    "Netherlands": "NED",
+    "New Zealand": "NZL",
+    "Norway": "NOR",
+    "Panama": "PAN",
+    "Paraguay": "PAR",
+    "Portugal": "POR",
+    "Qatar": "QAT",
+    "Saudi Arabia": "KSA",
+    "Scotland": "SCO",
+    "Senegal": "SEN",
+    "South Africa": "RSA",
+    "South Korea": "KOR",
+    "Spain": "ESP",
+    "Switzerland": "SUI",
+    "Tunisia": "TUN",
+    "United States": "USA",
+    "Uruguay": "URU",
+    "Uzbekistan": "UZB",
+}
+
+CODE_TO_TEAM = {value: key for key, value in TEAM_TO_CODE.items()}
+
+# Spellings seen across the roster, Elo and match-history sources. Slug forms
+# from model_predictor.ALIAS_MAP are covered because underscores become spaces.
+TEAM_ALIASES = {
+    "Côte d’Ivoire": "Ivory Coast",
+    "Cote d'Ivoire": "Ivory Coast",
+    "Cote dIvoire": "Ivory Coast",
+    "Curacao": "Curaçao",
+    "Cura_ao": "Curaçao",
+    "Korea Republic": "South Korea",
+    "Republic of Korea": "South Korea",
+    "Korea South": "South Korea",
+    "USA": "United States",
+    "U.S.A.": "United States",
+    "United States of America": "United States",
+    "SaudiArabia": "Saudi Arabia",
+    "The Netherlands": "Netherlands",
+    "Holland": "Netherlands",
+}
+
+
+def team_key(value: object) -> str:
+    """Fold accents, case and punctuation so every spelling of a team compares equal."""
+    raw = unicodedata.normalize("NFKD", str(value or ""))
+    ascii_value = raw.encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", ascii_value).split())
+
+
+@dataclass(frozen=True)
+class TeamRegistry:
+    names: tuple[str, ...]
+    codes: tuple[str, ...]
+    _ids: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        ids: dict[str, int] = {}
+        for team_id, (name, code) in enumerate(zip(self.names, self.codes)):
+            ids[team_key(name)] = team_id
+            ids[team_key(code)] = team_id
+        for alias, name in TEAM_ALIASES.items():
+            if name in self.names:
+                ids.setdefault(team_key(alias), self.names.index(name))
+        object.__setattr__(self, "_ids", ids)
+
+    @classmethod
+    def from_codes(cls, team_to_code: dict[str, str]) -> TeamRegistry:
+        names = tuple(sorted(team_to_code))
+        return cls(names=names, codes=tuple(team_to_code[name] for name in names))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id_of(self, value: object) -> int | None:
+        """Return the team id for a name, FIFA code, slug or alias (None if unknown)."""
+        return self._ids.get(team_key(value))
+
+    def resolve(self, value: object) -> str | None:
+        team_id = self.id_of(value)
+        return None if team_id is None else self.names[team_id]
+
+
+@lru_cache(maxsize=1)
+def team_registry() -> TeamRegistry:
+    return TeamRegistry.from_codes(TEAM_TO_CODE)
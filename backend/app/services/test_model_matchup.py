@@ -12,8 +12,9 @@ try:
     from app.services.model_predictor import (
         GOALS_ALL_PATH,
         MATCHES_ALL_PATH,
-        build_engineered_dataset,
         load_artifacts_for_inference,
+        load_engineered_dataset,
+        load_training_dataset,
         predict_upset_probability,
     )
 except ModuleNotFoundError:
@@ -25,14 +26,16 @@ except ModuleNotFoundError:
     from app.services.model_predictor import (
         GOALS_ALL_PATH,
         MATCHES_ALL_PATH,
-        build_engineered_dataset,
         load_artifacts_for_inference,
+        load_engineered_dataset,
+        load_training_dataset,
         predict_upset_probability,
     )
 
 
 DEFAULT_ARTIFACT_DIR = Path("artifacts")
 DEFAULT_TARGET_COL = "y_upset_avoid_loss"
+DATASET_COLUMNS = ["match_id", "match_date", "match_dt", "home_team_name", "away_team_name", "elo_diff"]
 
 
 def _pair_mask(df: pd.DataFrame, country_a: str, country_b: str) -> pd.Series:
@@ -71,6 +74,7 @@ def run_matchup_test(
     goals_path: Path,
     artifact_dir: Path,
     threshold: float,
+    dataset_path: Path | None = None,
 ) -> None:
     xgb_model, calibrator, feature_info = load_artifacts_for_inference(artifact_dir)
 
@@ -78,11 +82,18 @@ def run_matchup_test(
     feature_cols = list(feature_info.get("feature_columns", []))
     fit_medians = pd.Series(feature_info.get("fit_medians", {}), dtype=float)
 
-    engineered, _, _, _, _ = build_engineered_dataset(
-        matches_path=matches_path,
-        goals_path=goals_path,
-        use_goals_features=use_goals_features,
-    )
+    if dataset_path is not None:
+        # Saved training_dataset artifact: read only what this report uses.
+        engineered = load_training_dataset(
+            dataset_path,
+            columns=[*feature_cols, *DATASET_COLUMNS, DEFAULT_TARGET_COL, "y_upset"],
+        )
+    else:
+        engineered, _, _, _, _ = load_engineered_dataset(
+            matches_path=matches_path,
+            goals_path=goals_path,
+            use_goals_features=use_goals_features,
+        )
 
     target_col = DEFAULT_TARGET_COL if DEFAULT_TARGET_COL in engineered.columns else "y_upset"
     if target_col not in engineered.columns:
@@ -185,6 +196,12 @@ def main() -> None:
         default=0.60,
         help="Classification threshold for upset alert label.",
     )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=None,
+        help="Use a saved training_dataset.npz/.csv artifact instead of rebuilding features from the CSVs.",
+    )
     args = parser.parse_args()
 
     run_matchup_test(
@@ -194,6 +211,7 @@ def main() -> None:
         goals_path=args.goals_path,
         artifact_dir=args.artifact_dir,
         threshold=args.threshold,
+        dataset_path=args.dataset,
     )
 
 
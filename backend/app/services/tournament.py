@@ -0,0 +1,863 @@
+"""Vectorized Monte Carlo simulation of the 48-team 2026 World Cup format.
+
+Twelve groups of four play a single round robin; the top two of each group plus
+the eight best third-placed teams reach a 32-team knockout bracket. Every stage
+is simulated for a whole batch of tournaments at once with arrays shaped
+``(rows, sims)``, so the Python-level work per batch is a handful of loops over
+groups, matches and rounds.
+
+Finished matches can be fixed. A group's simulated states depend only on its
+chunk seed and its own fixed results, so the simulator caches them and a new
+result re-simulates just that group plus the knockout stage downstream of it.
+
+Group-stage odds alone are also computed exactly: each group has only 3**6 = 729
+result combinations, which ``exact_group_odds`` enumerates and weights directly.
+Likewise, for a fixed bracket ``bracket_advancement`` gives exact per-round odds
+by dynamic programming over the bracket tree.
+
+Simplifications:
+- Matches are simulated as win/draw/loss only. Teams level on points in a group
+  are separated by head-to-head points among them, then at random; goal
+  difference and goals scored are not modelled. Third-placed teams and seeds
+  across groups are ordered by points with random tie-breaks.
+- The round of 32 is seeded 1-32 (group winners, then runners-up, then best
+  thirds, each tier ordered by points) into a standard bracket. FIFA's fixed
+  slot table is not used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import math
+import multiprocessing
+import sys
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..schemas.tournament import (
+    BracketResponse,
+    BracketTeamOdds,
+    FixedResult,
+    GroupStageOdds,
+    GroupStageOddsResponse,
+    TeamTournamentEstimate,
+    TeamTournamentOdds,
+    TournamentSimulationProgress,
+    TournamentSimulationResponse,
+)
+from .csv_cache import read_csv_cached
+from .data_loader import SERVICE_DATA_ROOT, load_matchup_dataset
+from .predictor import PredictionService, elo_win_probability
+from .team_registry import team_key, team_registry
+
+logger = logging.getLogger(__name__)
+
+GROUPS_CSV = SERVICE_DATA_ROOT / "group_stage_probabilities.csv"
+ROUNDS = ["round_of_32", "round_of_16", "quarterfinal", "semifinal", "final", "champion"]
+# Columns of the per-team count arrays, named as in TeamTournamentOdds.
+STAGE_FIELDS = ["prob_first", "prob_top2", *(f"prob_{name}" for name in ROUNDS)]
+# (home, away) slots of the six round-robin fixtures inside a group.
+GROUP_FIXTURES = [(0, 1), (2, 3), (0, 2), (3, 1), (0, 3), (1, 2)]
+FIXTURE_INDEX = {slots: match for match, slots in enumerate(GROUP_FIXTURES)}
+QUALIFYING_THIRDS = 8
+# Also the progress granularity of streamed runs.
+CHUNK_SIZE = 10_000
+# One entry is a (group, chunk) state, about 80 KB at the default chunk size,
+# so the default cap holds about 48 MB per process.
+GROUP_CACHE_ENTRIES = 600
+
+
+class TournamentInputError(ValueError):
+    """Raised when entered results do not fit the tournament field."""
+
+
+@dataclass(frozen=True)
+class TournamentField:
+    """The 48 entrants with their pairwise outcome probabilities.
+
+    ``win[i, j]`` and ``draw[i, j]`` are group-stage probabilities for i vs j at a
+    neutral venue; ``knockout[i, j]`` is P(i advances) in a knockout tie and
+    satisfies ``knockout[i, j] + knockout[j, i] == 1``.
+    """
+
+    teams: list[str]
+    group_names: list[str]
+    groups: np.ndarray
+    win: np.ndarray
+    draw: np.ndarray
+    knockout: np.ndarray
+    placeholders: frozenset[str] = frozenset()
+    # Known teams without an Elo rating, rated at the field mean like placeholders.
+    unrated: frozenset[str] = frozenset()
+    _index: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_index", {team_key(team): idx for idx, team in enumerate(self.teams)})
+
+    def index_of(self, name: str) -> int | None:
+        """Entrant index for a team name, FIFA code or alias (None if not in the field)."""
+        return self._index.get(team_key(team_registry().resolve(name) or name))
+
+    def with_knockout(self, knockout: np.ndarray) -> TournamentField:
+        return TournamentField(
+            teams=self.teams,
+            group_names=self.group_names,
+            groups=self.groups,
+            win=self.win,
+            draw=self.draw,
+            knockout=knockout,
+            placeholders=self.placeholders,
+            unrated=self.unrated,
+        )
+
+
+@dataclass(frozen=True)
+class FixedResults:
+    """Entered results resolved against a field.
+
+    ``groups[g]`` holds sorted (fixture, outcome) pairs for group g, with outcome
+    0/1/2 = home win/draw/away win in ``GROUP_FIXTURES`` orientation, so it doubles
+    as that group's cache key. ``knockout`` holds (winner, loser) entrant pairs.
+    """
+
+    groups: tuple[tuple[tuple[int, int], ...], ...]
+    knockout: tuple[tuple[int, int], ...] = ()
+
+    def __len__(self) -> int:
+        return sum(len(fixed) for fixed in self.groups) + len(self.knockout)
+
+
+def resolve_results(tournament: TournamentField, results: list[FixedResult]) -> FixedResults:
+    """Map entered scorelines onto group fixtures and knockout ties.
+
+    A result between group-mates is their group fixture unless it says
+    ``stage="knockout"``, sets a penalty ``winner``, or the group fixture is
+    already fixed by an earlier result. Any other pair is a knockout tie, fixed
+    for whenever the two teams meet.
+    """
+    group_count = len(tournament.group_names)
+    group_of = np.empty(len(tournament.teams), dtype=np.intp)
+    slot_of = np.empty(len(tournament.teams), dtype=np.intp)
+    group_of[tournament.groups.ravel()] = np.repeat(np.arange(group_count), 4)
+    slot_of[tournament.groups.ravel()] = np.tile(np.arange(4), group_count)
+
+    groups: list[dict[int, int]] = [{} for _ in range(group_count)]
+    knockout: dict[frozenset[int], tuple[int, int]] = {}
+    for result in results:
+        idx_a, idx_b = tournament.index_of(result.team_a), tournament.index_of(result.team_b)
+        for raw, idx in ((result.team_a, idx_a), (result.team_b, idx_b)):
+            if idx is None:
+                raise TournamentInputError(f"Team '{raw}' is not in the tournament field.")
+        if idx_a == idx_b:
+            raise TournamentInputError(f"Result for {tournament.teams[idx_a]} lists the same team twice.")
+        label = f"{tournament.teams[idx_a]} vs {tournament.teams[idx_b]}"
+
+        same_group = group_of[idx_a] == group_of[idx_b]
+        if result.stage == "group" and not same_group:
+            raise TournamentInputError(f"{label} is not a group fixture.")
+        if same_group and result.stage != "knockout":
+            group = int(group_of[idx_a])
+            slots = (int(slot_of[idx_a]), int(slot_of[idx_b]))
+            if slots in FIXTURE_INDEX:
+                match, home_goals, away_goals = FIXTURE_INDEX[slots], result.score_a, result.score_b
+            else:
+                match, home_goals, away_goals = FIXTURE_INDEX[slots[::-1]], result.score_b, result.score_a
+            if result.stage == "group" and result.winner:
+                raise TournamentInputError(f"Group result {label} cannot have a penalty winner.")
+            if result.stage == "group" and match in groups[group]:
+                raise TournamentInputError(f"Duplicate result for {label}.")
+            if result.stage == "group" or (not result.winner and match not in groups[group]):
+                groups[group][match] = 0 if home_goals > away_goals else 1 if home_goals == away_goals else 2
+                continue
+
+        pair = frozenset((idx_a, idx_b))
+        if pair in knockout:
+            raise TournamentInputError(f"Duplicate result for {label}.")
+        if result.score_a != result.score_b:
+            winner = idx_a if result.score_a > result.score_b else idx_b
+        else:
+            winner = tournament.index_of(result.winner) if result.winner else None
+            if winner not in pair:
+                raise TournamentInputError(f"Level knockout result {label} needs the winner on penalties.")
+        knockout[pair] = (winner, idx_b if winner == idx_a else idx_a)
+
+    return FixedResults(
+        groups=tuple(tuple(sorted(fixed.items())) for fixed in groups),
+        knockout=tuple(knockout.values()),
+    )
+
+
+def load_group_assignments(csv_path=GROUPS_CSV) -> dict[str, list[str]]:
+    """Group letter -> four entrant names, in file order."""
+    frame = read_csv_cached(csv_path, text=True, columns=["team", "group"])
+    groups: dict[str, list[str]] = {}
+    for team, group in zip(frame["team"].tolist(), frame["group"].tolist()):
+        groups.setdefault(str(group).strip(), []).append(str(team).strip())
+    for name, members in groups.items():
+        if len(members) != 4:
+            raise ValueError(f"Group {name} has {len(members)} teams; expected 4.")
+    return dict(sorted(groups.items()))
+
+
+def build_tournament_field(service: PredictionService, groups: dict[str, list[str]]) -> TournamentField:
+    """Assemble pair probabilities from the neutral-venue PredictionService tables.
+
+    Entrants the registry does not know (playoff placeholders) and known teams
+    without an Elo rating are rated at the mean Elo of the field and run through
+    the same win/draw derivation. The proxy pair file the matchup table falls back
+    to gives unrated teams near-zero odds, so it is not used here.
+    """
+    registry = service.dataset.registry
+    teams: list[str] = []
+    team_ids: list[int] = []
+    placeholders: set[str] = set()
+    for members in groups.values():
+        for raw in members:
+            team_id = registry.id_of(raw)
+            if team_id is None:
+                placeholders.add(raw)
+                teams.append(raw)
+                team_ids.append(-1)
+            else:
+                teams.append(registry.names[team_id])
+                team_ids.append(team_id)
+
+    ids = np.array(team_ids)
+    known = ids >= 0
+    elo = np.where(known, service.dataset.elo[np.where(known, ids, 0)], np.nan)
+    rated = ~np.isnan(elo)
+    unrated = frozenset(teams[idx] for idx in np.flatnonzero(known & ~rated))
+    elo = np.where(np.isnan(elo), np.nanmean(elo), elo)
+
+    table = service.matchup_table(neutral_site=True)
+    size = len(teams)
+    pct_a = np.zeros((size, size))
+    pct_draw = np.zeros((size, size))
+    pct_b = np.zeros((size, size))
+    both_rated = rated[:, None] & rated[None, :]
+    rows, cols = np.nonzero(both_rated)
+    pct_a[rows, cols] = table.team_a_pct[ids[rows], ids[cols]]
+    pct_draw[rows, cols] = table.draw_pct[ids[rows], ids[cols]]
+    pct_b[rows, cols] = table.team_b_pct[ids[rows], ids[cols]]
+
+    rows, cols = np.nonzero(~both_rated)
+    prior = elo_win_probability(elo[rows], elo[cols])
+    est_a, est_draw, est_b = service.outcome_percentages(prior, 1.0 - prior, neutral_site=True)
+    pct_a[rows, cols], pct_draw[rows, cols], pct_b[rows, cols] = est_a, est_draw, est_b
+
+    win = pct_a / 100.0
+    draw = pct_draw / 100.0
+    np.fill_diagonal(win, 0.0)
+    np.fill_diagonal(draw, 0.0)
+
+    # Knockout ties cannot be drawn: split the draw mass in proportion to the
+    # win probabilities, using the upper triangle so both directions agree.
+    decisive = pct_a + pct_b
+    knockout = np.divide(pct_a, decisive, out=np.full((size, size), 0.5), where=decisive > 0)
+    upper = np.triu(knockout, 1)
+    knockout = upper + (1.0 - upper.T) * np.tri(size, k=-1) + np.eye(size) * 0.5
+
+    group_names = list(groups)
+    return TournamentField(
+        teams=teams,
+        group_names=group_names,
+        groups=np.arange(size).reshape(len(group_names), 4),
+        win=win,
+        draw=draw,
+        knockout=knockout,
+        placeholders=frozenset(placeholders),
+        unrated=unrated,
+    )
+
+
+def _group_rank_keys(earned_home: np.ndarray, earned_away: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(points, ranking key), each (4, n), from the points each fixture gave its home and away side (6, n).
+
+    The key orders by points, then by head-to-head points: those taken in the
+    matches between teams level on points. Goals are not simulated, so teams
+    still level after that are split at random.
+    """
+    points = np.zeros((4,) + earned_home.shape[1:], dtype=earned_home.dtype)
+    for match, (home_slot, away_slot) in enumerate(GROUP_FIXTURES):
+        points[home_slot] += earned_home[match]
+        points[away_slot] += earned_away[match]
+    head_to_head = np.zeros_like(points)
+    for match, (home_slot, away_slot) in enumerate(GROUP_FIXTURES):
+        level = points[home_slot] == points[away_slot]
+        head_to_head[home_slot] += level * earned_home[match]
+        head_to_head[away_slot] += level * earned_away[match]
+    # Head-to-head points never exceed 9, so they only break ties on points.
+    return points, points * 16 + head_to_head
+
+
+def _scenario_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Every group scenario and each slot's share of first place and of the top two.
+
+    Returns (outcomes (729, 6), first (729, 4), top2 (729, 4)). Teams level on
+    points and head-to-head split the positions they cover evenly, the expected
+    result of the random tie-break the simulator uses.
+    """
+    outcomes = np.array(list(itertools.product(range(3), repeat=len(GROUP_FIXTURES))))
+    home_points, away_points = np.array([3, 1, 0]), np.array([0, 1, 3])
+    _, keys = _group_rank_keys(home_points[outcomes.T], away_points[outcomes.T])
+    keys = keys.T
+    higher = (keys[:, np.newaxis, :] > keys[:, :, np.newaxis]).sum(axis=2)
+    level = (keys[:, np.newaxis, :] == keys[:, :, np.newaxis]).sum(axis=2)
+    first = (higher == 0) / level
+    top2 = np.clip(2 - higher, 0, level) / level
+    return outcomes, first, top2
+
+
+SCENARIO_OUTCOMES, SCENARIO_FIRST, SCENARIO_TOP2 = _scenario_tables()
+
+
+def exact_group_odds(tournament: TournamentField, fixed: FixedResults | None = None) -> np.ndarray:
+    """Exact (prob_first, prob_top2) per entrant, shape (teams, 2), from all 729 scenarios per group.
+
+    Each scenario is weighted by the product of its six match probabilities;
+    fixed fixtures put all their weight on the entered outcome.
+    """
+    fixtures = np.array(GROUP_FIXTURES)
+    home = tournament.groups[:, fixtures[:, 0]]
+    away = tournament.groups[:, fixtures[:, 1]]
+    p_win, p_draw = tournament.win[home, away], tournament.draw[home, away]
+    outcome_probs = np.stack([p_win, p_draw, 1.0 - p_win - p_draw], axis=-1)
+    if fixed is not None:
+        for group, pairs in enumerate(fixed.groups):
+            for match, outcome in pairs:
+                outcome_probs[group, match] = np.eye(3)[outcome]
+
+    weights = outcome_probs[:, np.arange(len(GROUP_FIXTURES)), SCENARIO_OUTCOMES].prod(axis=-1)
+    odds = np.empty((len(tournament.teams), 2))
+    odds[tournament.groups.ravel(), 0] = (weights @ SCENARIO_FIRST).ravel()
+    odds[tournament.groups.ravel(), 1] = (weights @ SCENARIO_TOP2).ravel()
+    return odds
+
+
+def _new_seed() -> int:
+    return int(np.random.SeedSequence().entropy % (2**63))
+
+
+def wilson_interval(successes: np.ndarray, trials: int, z: float = 1.96) -> tuple[np.ndarray, np.ndarray]:
+    """Wilson score interval for ``successes / trials``; stays inside [0, 1] and is non-degenerate at 0 and 1."""
+    p = successes / trials
+    denom = 1.0 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1.0 - p) / trials + z**2 / (4 * trials**2)) / denom
+    return np.clip(center - half, 0.0, 1.0), np.clip(center + half, 0.0, 1.0)
+
+
+def _bracket_order(size: int) -> np.ndarray:
+    """Seed positions for a standard bracket, so seeds 1 and 2 can only meet in the final."""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for pair in ((s, total - s) for s in order) for seed in pair]
+    return np.array(order) - 1
+
+
+def bracket_advancement(knockout: np.ndarray) -> np.ndarray:
+    """Exact advancement odds for a fixed bracket whose pair matrix is in slot order.
+
+    Returns (slots, rounds + 1): column r is the chance of winning the first r
+    ties, so column 0 is all ones and the last column is the title. A team's
+    next opponent comes from the sibling block, which is independent of its own
+    path, so each round costs one (slots, slots) matrix-vector product.
+    """
+    size = knockout.shape[0]
+    slots = np.arange(size)
+    reach = [np.ones(size)]
+    block = 1
+    while block < size:
+        opponents = (slots[:, np.newaxis] // block) ^ 1 == slots[np.newaxis, :] // block
+        reach.append(reach[-1] * ((knockout * opponents) @ reach[-1]))
+        block *= 2
+    return np.stack(reach, axis=1)
+
+
+def _rank_positions(keys: np.ndarray) -> np.ndarray:
+    """Descending rank (0 = best) of each row of ``keys`` (rows, sims); exact ties go to the lower row."""
+    size = keys.shape[0]
+    earlier = np.tri(size, k=-1, dtype=bool)[:, :, np.newaxis]
+    beats = keys[np.newaxis, :, :] > keys[:, np.newaxis, :]
+    ties = (keys[np.newaxis, :, :] == keys[:, np.newaxis, :]) & earlier
+    return (beats | ties).sum(axis=1)
+
+
+def _simulate_group(
+    tournament: TournamentField,
+    group: int,
+    sims: int,
+    rng: np.random.Generator,
+    fixed: tuple[tuple[int, int], ...] = (),
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (standings, points), each (4, sims): team indices ordered 1st-4th and their points.
+
+    Fixed fixtures still consume their random draws, so the other matches of the
+    group see the same numbers with or without them.
+    """
+    members = tournament.groups[group]
+    fixtures = np.array(GROUP_FIXTURES)
+    home, away = members[fixtures[:, 0]], members[fixtures[:, 1]]
+    p_win = tournament.win[home, away][:, np.newaxis]
+    p_draw_cut = p_win + tournament.draw[home, away][:, np.newaxis]
+
+    uniforms = rng.random((len(fixtures) + 4, sims), dtype=np.float32)
+    match_draws = uniforms[: len(fixtures)]
+    home_win = match_draws < p_win
+    drawn = ~home_win & (match_draws < p_draw_cut)
+    away_win = ~home_win & ~drawn
+    for match, outcome in fixed:
+        home_win[match], drawn[match], away_win[match] = outcome == 0, outcome == 1, outcome == 2
+
+    earned_home = (3 * home_win + drawn).astype(np.int16)
+    earned_away = (3 * away_win + drawn).astype(np.int16)
+    points, keys = _group_rank_keys(earned_home, earned_away)
+    points = points.astype(np.int8)
+
+    position = _rank_positions(keys + uniforms[len(fixtures):])
+    # int8 holds any of the 48 entrant indices and keeps cached states small.
+    standings = np.empty((4, sims), dtype=np.int8)
+    np.put_along_axis(standings, position, np.broadcast_to(members[:, np.newaxis], position.shape), axis=0)
+    ordered_points = np.empty_like(points)
+    np.put_along_axis(ordered_points, position, points, axis=0)
+    return standings, ordered_points
+
+
+def _simulate_knockout(
+    tournament: TournamentField,
+    standings: np.ndarray,
+    points: np.ndarray,
+    rng: np.random.Generator,
+) -> list[np.ndarray]:
+    """Play the knockout stage from (groups, 4, sims) standings.
+
+    Returns the entrants of each round, R32 to the champion, as (slots, sims) arrays.
+    """
+    groups, _, sims = standings.shape
+    # Seed numbers: winners 0-11, runners-up 12-23, best thirds 24-31, each tier
+    # ordered by points with random tie-breaks. Eliminated thirds go to a spare slot.
+    third_rank = _rank_positions(points[:, 2] + rng.random((groups, sims), dtype=np.float32))
+    seed_numbers = np.concatenate(
+        [
+            _rank_positions(points[:, 0] + rng.random((groups, sims), dtype=np.float32)),
+            groups + _rank_positions(points[:, 1] + rng.random((groups, sims), dtype=np.float32)),
+            np.where(third_rank < QUALIFYING_THIRDS, 2 * groups + third_rank, -1),
+        ]
+    )
+    bracket_size = 2 * groups + QUALIFYING_THIRDS
+    slot_of_seed = np.append(np.argsort(_bracket_order(bracket_size)), bracket_size)
+    entrants = np.empty((bracket_size + 1, sims), dtype=np.intp)
+    np.put_along_axis(entrants, slot_of_seed[seed_numbers], standings[:, :3].transpose(1, 0, 2).reshape(-1, sims), axis=0)
+    entrants = entrants[:bracket_size]
+
+    rounds = [entrants]
+    while entrants.shape[0] > 1:
+        home, away = entrants[0::2], entrants[1::2]
+        home_wins = rng.random(home.shape, dtype=np.float32) < tournament.knockout[home, away]
+        entrants = np.where(home_wins, home, away)
+        rounds.append(entrants)
+    return rounds
+
+
+def _simulate_chunk(
+    tournament: TournamentField,
+    sims: int,
+    seed: np.random.SeedSequence,
+    fixed_groups: tuple[tuple[tuple[int, int], ...], ...],
+    cached: list[tuple[np.ndarray, np.ndarray] | None],
+) -> tuple[np.ndarray, list[tuple[np.ndarray, np.ndarray]]]:
+    """Count per-team finishes for one chunk: columns are first, top-two, then ROUNDS.
+
+    Each group draws from its own child stream, so a group's outcomes depend only
+    on the chunk seed and its own fixed results; groups with a ``cached`` state
+    are not re-simulated. Returns the counts and every group's state.
+    """
+    streams = seed.spawn(len(tournament.group_names) + 1)
+    states = [
+        state if state is not None else _simulate_group(
+            tournament, group, sims, np.random.default_rng(streams[group]), fixed_groups[group]
+        )
+        for group, state in enumerate(cached)
+    ]
+    standings = np.stack([standing for standing, _ in states])
+    points = np.stack([pts for _, pts in states])
+    rounds = _simulate_knockout(tournament, standings, points, np.random.default_rng(streams[-1]))
+
+    size = len(tournament.teams)
+    stages = [standings[:, 0], standings[:, :2], *rounds]
+    counts = np.stack([np.bincount(stage.ravel(), minlength=size) for stage in stages], axis=1)
+    return counts, states
+
+
+@dataclass
+class TournamentSimulator:
+    """Chunked tournament simulation with a cache of per-group states.
+
+    With ``workers > 1`` chunks run on one process pool shared by every run and
+    created here, not per request. Its workers are spawned rather than forked,
+    since runs are started from threads of a multithreaded server. Call
+    ``close`` to shut the pool down.
+    """
+
+    tournament: TournamentField
+    chunk_size: int = CHUNK_SIZE
+    cache_entries: int = GROUP_CACHE_ENTRIES
+    workers: int = 1
+    _knockout_fields: dict[str, TournamentField] = field(init=False, repr=False)
+    _group_states: OrderedDict[tuple, tuple[np.ndarray, np.ndarray]] = field(init=False, repr=False)
+    _cache_lock: threading.Lock = field(init=False, repr=False)
+    _pool: ProcessPoolExecutor | None = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._knockout_fields = {}
+        self._group_states = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def field_for(self, knockout_source: str = "prediction", model_service=None) -> TournamentField:
+        """Return the field, swapping in DarkScore knockout odds when requested."""
+        if knockout_source == "prediction":
+            return self.tournament
+        cached = self._knockout_fields.get(knockout_source)
+        if cached is None:
+            knockout = model_service.knockout_win_matrix(self.tournament.teams)
+            cached = self._knockout_fields[knockout_source] = self.tournament.with_knockout(knockout)
+        return cached
+
+    def simulate(
+        self,
+        simulations: int,
+        seed: int | None = None,
+        tournament: TournamentField | None = None,
+        fixed: FixedResults | None = None,
+    ) -> tuple[np.ndarray, int]:
+        """Run ``simulations`` tournaments and return (per-team counts, seed used).
+
+        The run is split into fixed-size chunks seeded from ``SeedSequence(seed)``,
+        so results depend only on (simulations, seed, fixed), never on ``workers``.
+        Group states are cached per (seed, chunk, group, that group's fixed
+        results); group odds are shared by every field this simulator hands out,
+        only knockout odds differ.
+        """
+        seed = _new_seed() if seed is None else seed
+        counts = None
+        for _, counts in self.iter_simulate(simulations, seed, tournament, fixed):
+            pass
+        return counts, seed
+
+    def iter_simulate(
+        self,
+        simulations: int,
+        seed: int,
+        tournament: TournamentField | None = None,
+        fixed: FixedResults | None = None,
+        stop: threading.Event | None = None,
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield (tournaments done, cumulative counts) after each chunk, in chunk order.
+
+        On the shared pool a run keeps at most ``workers`` chunks in flight, so
+        concurrent runs interleave. Closing the generator early, or setting
+        ``stop`` (checked between chunks), cancels its chunks not yet started.
+        """
+        tournament = tournament or self.tournament
+        group_count = len(tournament.group_names)
+        fixed_groups = fixed.groups if fixed is not None else ((),) * group_count
+        chunks = math.ceil(simulations / self.chunk_size)
+        sizes = [min(self.chunk_size, simulations - idx * self.chunk_size) for idx in range(chunks)]
+        seeds = np.random.SeedSequence(seed).spawn(chunks)
+        keys = [
+            [(seed, idx, size, group, fixed_groups[group]) for group in range(group_count)]
+            for idx, size in enumerate(sizes)
+        ]
+        cached = [[self._cached_state(key) for key in chunk_keys] for chunk_keys in keys]
+
+        pool = self._pool if chunks > 1 else None
+        pending: deque[Future] = deque()
+        submitted = 0
+        total = np.zeros((len(tournament.teams), len(STAGE_FIELDS)), dtype=np.int64)
+        done = 0
+        try:
+            for idx in range(chunks):
+                if pool is None:
+                    counts, states = _simulate_chunk(tournament, sizes[idx], seeds[idx], fixed_groups, cached[idx])
+                else:
+                    while submitted < chunks and len(pending) < self.workers:
+                        pending.append(
+                            pool.submit(
+                                _simulate_chunk,
+                                tournament,
+                                sizes[submitted],
+                                seeds[submitted],
+                                fixed_groups,
+                                cached[submitted],
+                            )
+                        )
+                        submitted += 1
+                    counts, states = pending.popleft().result()
+                for key, hit, state in zip(keys[idx], cached[idx], states):
+                    if hit is None:
+                        self._store_state(key, state)
+                total += counts
+                done += sizes[idx]
+                yield done, total.copy()
+                if stop is not None and stop.is_set():
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _cached_state(self, key: tuple) -> tuple[np.ndarray, np.ndarray] | None:
+        with self._cache_lock:
+            state = self._group_states.get(key)
+            if state is not None:
+                self._group_states.move_to_end(key)
+            return state
+
+    def _store_state(self, key: tuple, state: tuple[np.ndarray, np.ndarray]) -> None:
+        with self._cache_lock:
+            self._group_states[key] = state
+            while len(self._group_states) > self.cache_entries:
+                self._group_states.popitem(last=False)
+
+    def _conditioned_field(
+        self, knockout_source: str, model_service, results: list[FixedResult] | None
+    ) -> tuple[TournamentField, FixedResults]:
+        """The field for ``knockout_source`` with entered knockout results forced."""
+        tournament = self.field_for(knockout_source, model_service)
+        fixed = resolve_results(tournament, results or [])
+        if fixed.knockout:
+            knockout = tournament.knockout.copy()
+            for winner, loser in fixed.knockout:
+                knockout[winner, loser], knockout[loser, winner] = 1.0, 0.0
+            tournament = tournament.with_knockout(knockout)
+        return tournament, fixed
+
+    def odds(
+        self,
+        simulations: int,
+        seed: int | None = None,
+        knockout_source: str = "prediction",
+        model_service=None,
+        results: list[FixedResult] | None = None,
+    ) -> TournamentSimulationResponse:
+        tournament, fixed = self._conditioned_field(knockout_source, model_service, results)
+        counts, seed = self.simulate(simulations, seed=seed, tournament=tournament, fixed=fixed)
+        return self._response(tournament, counts / simulations, simulations, seed, knockout_source, len(fixed))
+
+    def odds_progress(
+        self,
+        simulations: int,
+        seed: int | None = None,
+        knockout_source: str = "prediction",
+        model_service=None,
+        results: list[FixedResult] | None = None,
+        stop: threading.Event | None = None,
+    ) -> Iterator[TournamentSimulationProgress]:
+        """Running estimates of ``odds`` with 95% intervals, one per completed chunk.
+
+        Input is validated before the iterator is returned. The last estimate
+        equals ``odds`` for the same arguments and seed. Setting ``stop`` ends
+        the run after the chunk in progress.
+        """
+        tournament, fixed = self._conditioned_field(knockout_source, model_service, results)
+        seed = _new_seed() if seed is None else seed
+        return self._progress_events(tournament, fixed, simulations, seed, knockout_source, stop)
+
+    def _progress_events(
+        self,
+        tournament: TournamentField,
+        fixed: FixedResults,
+        simulations: int,
+        seed: int,
+        knockout_source: str,
+        stop: threading.Event | None = None,
+    ) -> Iterator[TournamentSimulationProgress]:
+        with closing(self.iter_simulate(simulations, seed, tournament, fixed, stop)) as chunks:
+            for done, counts in chunks:
+                low, high = wilson_interval(counts, done)
+                rows = self._team_rows(tournament, counts / done)
+                teams = [
+                    TeamTournamentEstimate(
+                        **row.model_dump(),
+                        ci95={
+                            name: (round(float(low[idx, col]), 4), round(float(high[idx, col]), 4))
+                            for col, name in enumerate(STAGE_FIELDS)
+                        },
+                    )
+                    for idx, row in rows
+                ]
+                teams.sort(key=lambda row: (-row.prob_champion, row.team))
+                yield TournamentSimulationProgress(
+                    completed=done,
+                    simulations=simulations,
+                    seed=seed,
+                    knockout_source=knockout_source,
+                    fixed_results=len(fixed),
+                    teams=teams,
+                )
+
+    def bracket_odds(
+        self, teams: list[str], knockout_source: str = "prediction", model_service=None
+    ) -> BracketResponse:
+        """Exact per-round odds for entrants listed in bracket order (slot 0 meets slot 1, ...)."""
+        size = len(teams)
+        if size < 2 or size & (size - 1) or size > 2 * len(self.tournament.group_names) + QUALIFYING_THIRDS:
+            raise TournamentInputError(f"A bracket needs 2, 4, 8, 16 or 32 teams; got {size}.")
+        entrants = [self.tournament.index_of(team) for team in teams]
+        for raw, idx in zip(teams, entrants):
+            if idx is None:
+                raise TournamentInputError(f"Team '{raw}' is not in the tournament field.")
+        if len(set(entrants)) != size:
+            raise TournamentInputError("Each team can appear in the bracket only once.")
+
+        tournament = self.field_for(knockout_source, model_service)
+        reach = bracket_advancement(tournament.knockout[np.ix_(entrants, entrants)])
+        rounds = ROUNDS[len(ROUNDS) - reach.shape[1]:]
+        return BracketResponse(
+            knockout_source=knockout_source,
+            rounds=rounds,
+            teams=[
+                BracketTeamOdds(
+                    team=tournament.teams[idx],
+                    slot=slot,
+                    placeholder=tournament.teams[idx] in tournament.placeholders,
+                    **{f"prob_{name}": round(float(reach[slot, step]), 4) for step, name in enumerate(rounds)},
+                )
+                for slot, idx in enumerate(entrants)
+            ],
+        )
+
+    def group_odds(self, results: list[FixedResult] | None = None) -> GroupStageOddsResponse:
+        """Exact group-stage odds, optionally conditioned on finished group fixtures.
+
+        Knockout results are accepted, so clients can send one results list to
+        every endpoint, but they do not affect group odds and are not counted.
+        """
+        fixed = resolve_results(self.tournament, results or [])
+        odds = exact_group_odds(self.tournament, fixed)
+        group_of = np.repeat(self.tournament.group_names, 4)
+        teams = [
+            GroupStageOdds(
+                team=team,
+                group=str(group_of[idx]),
+                placeholder=team in self.tournament.placeholders,
+                prob_first=round(float(odds[idx, 0]), 4),
+                prob_top2=round(float(odds[idx, 1]), 4),
+            )
+            for idx, team in enumerate(self.tournament.teams)
+        ]
+        teams.sort(key=lambda row: (row.group, -row.prob_first, row.team))
+        return GroupStageOddsResponse(fixed_results=len(fixed) - len(fixed.knockout), teams=teams)
+
+    @staticmethod
+    def _team_rows(tournament: TournamentField, probabilities: np.ndarray) -> list[tuple[int, TeamTournamentOdds]]:
+        group_of = np.repeat(tournament.group_names, 4)
+        return [
+            (
+                idx,
+                TeamTournamentOdds(
+                    team=team,
+                    group=str(group_of[idx]),
+                    placeholder=team in tournament.placeholders,
+                    **{name: round(float(probabilities[idx, col]), 4) for col, name in enumerate(STAGE_FIELDS)},
+                ),
+            )
+            for idx, team in enumerate(tournament.teams)
+        ]
+
+    @classmethod
+    def _response(
+        cls,
+        tournament: TournamentField,
+        probabilities: np.ndarray,
+        simulations: int,
+        seed: int,
+        knockout_source: str,
+        fixed_results: int = 0,
+    ) -> TournamentSimulationResponse:
+        teams = [row for _, row in cls._team_rows(tournament, probabilities)]
+        teams.sort(key=lambda row: (-row.prob_champion, row.team))
+        return TournamentSimulationResponse(
+            simulations=simulations,
+            seed=seed,
+            knockout_source=knockout_source,
+            fixed_results=fixed_results,
+            teams=teams,
+        )
+
+
+def load_tournament_simulator(
+    service: PredictionService, workers: int = 1, cache_entries: int = GROUP_CACHE_ENTRIES
+) -> TournamentSimulator | None:
+    try:
+        groups = load_group_assignments()
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Tournament simulator disabled: %s", exc)
+        return None
+    tournament = build_tournament_field(service, groups)
+    logger.info(
+        "Loaded tournament field: groups=%s teams=%s placeholders=%s source=%s",
+        len(tournament.group_names),
+        len(tournament.teams),
+        len(tournament.placeholders),
+        GROUPS_CSV.name,
+    )
+    if tournament.unrated:
+        logger.warning("No Elo rating, rated at the field mean: %s", ", ".join(sorted(tournament.unrated)))
+    return TournamentSimulator(tournament=tournament, workers=workers, cache_entries=cache_entries)
+
+
+def write_group_odds(simulator: TournamentSimulator, csv_path=GROUPS_CSV) -> Path:
+    """Rewrite the group CSV's prob_first/prob_top2 columns with exact odds from the current model."""
+    tournament = simulator.tournament
+    odds = exact_group_odds(tournament).round(4)
+    # Keep the file's team order: it fixes each team's slot in GROUP_FIXTURES.
+    frame = pd.DataFrame(
+        {
+            "team": [raw for members in load_group_assignments(csv_path).values() for raw in members],
+            "prob_first": odds[:, 0],
+            "prob_top2": odds[:, 1],
+            "group": np.repeat(tournament.group_names, 4),
+        }
+    )
+    newline = "\r\n" if b"\r\n" in Path(csv_path).read_bytes() else "\n"
+    frame.to_csv(csv_path, index=False, lineterminator=newline)
+    return Path(csv_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print or regenerate exact group-stage odds.")
+    parser.add_argument("--write", action="store_true", help=f"Overwrite {GROUPS_CSV.name} with the exact odds.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    simulator = load_tournament_simulator(PredictionService(dataset=load_matchup_dataset()))
+    if simulator is None:
+        sys.exit(1)
+    if args.write:
+        print(write_group_odds(simulator))
+        return
+    for row in simulator.group_odds().teams:
+        print(f"{row.group}  {row.team:<24} first={row.prob_first:.4f} top2={row.prob_top2:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from backend.app.schemas.tournament import FixedResult
+from backend.app.services.tournament import (
+    FIXTURE_INDEX,
+    TournamentField,
+    TournamentInputError,
+    resolve_results,
+)
+
+TEAMS = ["Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot", "Golf", "Hotel"]
+
+
+@pytest.fixture()
+def tournament() -> TournamentField:
+    size = len(TEAMS)
+    return TournamentField(
+        teams=TEAMS,
+        group_names=["A", "B"],
+        groups=np.arange(size).reshape(2, 4),
+        win=np.full((size, size), 0.4),
+        draw=np.full((size, size), 0.2),
+        knockout=np.full((size, size), 0.5),
+    )
+
+
+def test_group_mates_meeting_twice(tournament):
+    fixed = resolve_results(
+        tournament,
+        [
+            FixedResult(team_a="Alpha", team_b="Bravo", score_a=0, score_b=1),
+            FixedResult(team_a="Bravo", team_b="Alpha", score_a=2, score_b=3),
+        ],
+    )
+    assert fixed.groups[0] == ((FIXTURE_INDEX[(0, 1)], 2),)
+    assert fixed.knockout == ((0, 1),)
+
+
+def test_penalty_winner_is_knockout(tournament):
+    fixed = resolve_results(
+        tournament,
+        [FixedResult(team_a="Alpha", team_b="Bravo", score_a=1, score_b=1, winner="Bravo")],
+    )
+    assert fixed.groups == ((), ())
+    assert fixed.knockout == ((1, 0),)
+
+
+def test_explicit_stage(tournament):
+    fixed = resolve_results(
+        tournament,
+        [
+            FixedResult(team_a="Alpha", team_b="Bravo", score_a=2, score_b=0, stage="knockout"),
+            FixedResult(team_a="Alpha", team_b="Bravo", score_a=1, score_b=1, stage="group"),
+        ],
+    )
+    assert fixed.groups[0] == ((FIXTURE_INDEX[(0, 1)], 1),)
+    assert fixed.knockout == ((0, 1),)
+    with pytest.raises(TournamentInputError):
+        resolve_results(tournament, [FixedResult(team_a="Alpha", team_b="Echo", score_a=1, score_b=0, stage="group")])
+
+
+def test_third_meeting_is_duplicate(tournament):
+    result = FixedResult(team_a="Alpha", team_b="Bravo", score_a=1, score_b=0)
+    with pytest.raises(TournamentInputError, match="Duplicate"):
+        resolve_results(tournament, [result, result, result])
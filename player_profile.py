@@ -1,8 +1,14 @@
 import pandas as pd
 import sys
 import os
+from pathlib import Path
 
-CSV_PATH = "/Users/arjunramakrishnan/IdeaProjects/Underdog_WorldCup/backend/app/services/Cleaned_Data/fc26_players_clean_filled.csv"  # update path if needed
+from backend.app.services.player_table import load_player_table
+
+CSV_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "backend/app/services/Cleaned_Data/fc26_players_clean_filled.csv",
+)  # update path if needed
 
 POS_GROUPS = {
     "1": ("GK",  ["GK"]),
@@ -24,28 +30,8 @@ def load_data():
     if not os.path.exists(CSV_PATH):
         print(f"\n  ✗ Could not find '{CSV_PATH}'. Update CSV_PATH in the script.\n")
         sys.exit(1)
-    df = pd.read_csv(CSV_PATH)
-    df = df[df["name"].notna() & df["overall_rating"].notna()]
-
-    # Fill nulls using position-group medians so every player has full stats
-    stat_cols = [
-        "acceleration", "sprint_speed", "dribbling", "finishing",
-        "short_passing", "long_passing", "reactions", "heading_accuracy",
-        "ball_control", "agility", "balance", "shot_power", "jumping",
-        "total_goalkeeping", "total_defending", "total_power",
-        "total_mentality", "total_attacking", "total_skill", "total_movement",
-    ]
-    stat_cols = [c for c in stat_cols if c in df.columns]
-
-    pos_to_group = {p: label for label, positions in POS_GROUPS.values() for p in positions}
-    df["_pos_group"] = df["best_position"].map(pos_to_group).fillna("MID")
-
-    for col in stat_cols:
-        group_medians = df.groupby("_pos_group")[col].transform("median")
-        df[col] = df[col].fillna(group_medians).fillna(df[col].median())
-
-    df.drop(columns=["_pos_group"], inplace=True)
-    return df
+    # Imputed artifact is built once per source hash by backend/app/services/player_table.py
+    return load_player_table(Path(CSV_PATH))
 
 def divider(char="─", width=52):
     print(char * width)